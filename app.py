@@ -1,53 +1,311 @@
 import os
 import sys
-from flask import Flask, render_template, request, jsonify
+import json
+import asyncio
+import threading
+import contextlib
+from flask import Flask, render_template
 from flask_cors import CORS
+from asgiref.wsgi import WsgiToAsgi
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Mount, Route
 
 # Ensure the app directory is in the path for imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__))))
 
-from app.agents.agent_coordinator_adk import AgentCoordinatorADK
-from app.agents.rag_agent_adk import RAGAgentADK
+from app.core.jobs import JobManager, QueueFullError, create_job_store, current_job_id
+from app.core.metrics import REGISTRY, render_metrics
+from app.core.response_cache import bypass_response_cache
+
+# Seconds of silence after which an SSE keep-alive comment is sent (keeps proxies from closing the stream)
+SSE_HEARTBEAT_SECONDS = float(os.environ.get("SSE_HEARTBEAT_SECONDS", "15"))
+
+# Largest resident list accepted by /api/eligibility in one request
+ELIGIBILITY_MAX_BATCH = int(os.environ.get("ELIGIBILITY_MAX_BATCH", "10000"))
+
+# Build the agents on a background thread as soon as the server starts (set to 0 to build on first request)
+AGENT_WARMUP = os.environ.get("AGENT_WARMUP", "1") == "1"
 
 app = Flask(__name__)
 CORS(app)
 
-# Initialize Agents
-coordinator = AgentCoordinatorADK()
-rag_agent = RAGAgentADK()
+# --- Agents ---
+# The agent modules pull in google-adk, google-genai and fastmcp, and building the agents
+# fetches the Gemini key. Both are deferred so the server binds and answers /healthz
+# immediately; agents are built by the warm-up thread or on the first request.
+_agents_ready = threading.Event()
+_warmup_state = {"status": "cold", "error": None}
+
+def load_agents():
+    """Returns (coordinator, rag_agent); the first call imports and builds them."""
+    from app.core.agent_registry import get_agent
+    from app.agents.agent_coordinator_adk import AgentCoordinatorADK
+    from app.agents.rag_agent_adk import RAGAgentADK
+    agents = get_agent(AgentCoordinatorADK), get_agent(RAGAgentADK)
+    _agents_ready.set()
+    _warmup_state["status"] = "warm"
+    return agents
+
+async def get_agents():
+    if _agents_ready.is_set():
+        return load_agents()
+    # Keep the event loop free for other requests (and /healthz) while the agents build
+    return await asyncio.to_thread(load_agents)
+
+def warm_up():
+    _warmup_state["status"] = "warming"
+    try:
+        load_agents()
+    except Exception as e:
+        _warmup_state.update(status="error", error=str(e))
+        print(f"Agent warm-up failed: {e}", file=sys.stderr)
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
-@app.route('/api/run_workflow', methods=['POST'])
-def run_workflow():
-    data = request.json
+async def read_json(request):
+    """The request's JSON object; {} for a missing or invalid body, or one that is not an object."""
+    try:
+        data = await request.json()
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+async def healthz(request):
+    # Liveness only: never waits for the agents
+    return JSONResponse({"status": "ok", "agents": _warmup_state["status"], "error": _warmup_state["error"]})
+
+async def metrics(request):
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+# --- Async API (served natively on the event loop, no thread per in-flight workflow) ---
+def cache_bypass_requested(request):
+    """`X-Bypass-Cache: 1` (or `?bypass_cache=1`, for EventSource) skips the response cache."""
+    return request.headers.get('x-bypass-cache') == '1' or request.query_params.get('bypass_cache') == '1'
+
+def validate_workflow_request(data):
     image_path = data.get('image_path')
-    
     if not image_path or not os.path.exists(image_path):
-        return jsonify({"status": "error", "message": f"Image path '{image_path}' not found."}), 400
-    
+        return JSONResponse({"status": "error", "message": f"Image path '{image_path}' not found."}, status_code=400)
+    if data.get('max_concurrency') is not None:
+        try:
+            data['max_concurrency'] = int(data['max_concurrency'])
+        except (TypeError, ValueError):
+            data['max_concurrency'] = 0
+        if data['max_concurrency'] < 1:
+            return JSONResponse({"status": "error", "message": "max_concurrency must be a positive integer."},
+                                status_code=400)
+    return None
+
+async def execute_workflow(data):
+    coordinator, _ = await get_agents()
+    with bypass_response_cache(data.get('bypass_cache')):
+        if data.get('mode') == 'parallel':
+            options = {}
+            if data.get('max_concurrency') is not None:
+                options['max_concurrency'] = data['max_concurrency']
+            return await coordinator.run_parallel_workflow_async(
+                data['image_path'],
+                residents=data.get('residents'),
+                question=data.get('question'),
+                **options
+            )
+        return await coordinator.run_full_workflow_async(data['image_path'])
+
+async def run_workflow(request):
+    data = await read_json(request)
+    data['bypass_cache'] = cache_bypass_requested(request)
+    error = validate_workflow_request(data)
+    if error:
+        return error
+
     try:
-        output = coordinator.run_full_workflow(image_path)
-        return jsonify({"status": "success", "output": output})
+        output = await execute_workflow(data)
+        return JSONResponse({"status": "success", "output": output})
     except Exception as e:
-        return jsonify({"status": "error", "message": str(e)}), 500
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=500)
+
+# --- Job API: submit a workflow, then poll for its result or stream its events ---
+async def run_workflow_job(data):
+    """Job runner: executes the workflow and publishes its agent events to the job's subscribers."""
+    from app.core.genai_adk_base import forward_agent_events
+    job_id = current_job_id.get()
+    return await forward_agent_events(execute_workflow(data), lambda event: job_manager.publish(job_id, event))
+
+job_manager = JobManager(run_workflow_job, create_job_store())
+REGISTRY.gauge("jobs_in_progress", "Workflow jobs by state.",
+               lambda: {(state,): job_manager.stats()[state] for state in ("queued", "running")}, ["state"])
+
+async def submit_job(request):
+    data = await read_json(request)
+    data['bypass_cache'] = cache_bypass_requested(request)
+    error = validate_workflow_request(data)
+    if error:
+        return error
+
+    job, error = submit_workflow_job(data)
+    if error:
+        return error
+    return JSONResponse({"status": "accepted", "job": job}, status_code=202,
+                        headers={"Location": f"/api/jobs/{job['job_id']}"})
+
+def submit_workflow_job(data):
+    """Returns (job, None), or (None, a 429 response) when the job queue is full."""
+    try:
+        return job_manager.submit(data), None
+    except QueueFullError as e:
+        return None, JSONResponse({"status": "error", "message": str(e)}, status_code=429,
+                                  headers={"Retry-After": "5"})
+
+async def get_job(request):
+    job = job_manager.get(request.path_params['job_id'])
+    if job is None:
+        return JSONResponse({"status": "error", "message": "Job not found."}, status_code=404)
+    return JSONResponse({"status": "success", "job": job})
+
+async def stream_job(request):
+    job_id = request.path_params['job_id']
+    if job_manager.get(job_id) is None:
+        return JSONResponse({"status": "error", "message": "Job not found."}, status_code=404)
+    return sse_response(job_manager.events(job_id, heartbeat=SSE_HEARTBEAT_SECONDS))
 
-@app.route('/api/rag_query', methods=['POST'])
-def rag_query():
-    data = request.json
+async def cancel_job(request):
+    job = job_manager.cancel(request.path_params['job_id'])
+    if job is None:
+        return JSONResponse({"status": "error", "message": "Job not found."}, status_code=404)
+    return JSONResponse({"status": "success", "job": job})
+
+async def rag_query(request):
+    data = await read_json(request)
     query = data.get('query')
-    
+
     if not query:
-        return jsonify({"status": "error", "message": "No query provided."}), 400
-    
+        return JSONResponse({"status": "error", "message": "No query provided."}, status_code=400)
+
     try:
-        response = rag_agent.answer_question(query)
-        return jsonify({"status": "success", "response": response})
+        _, rag_agent = await get_agents()
+        response = await rag_agent.answer_question_async(query, use_cache=not cache_bypass_requested(request))
+        return JSONResponse({"status": "success", "response": response})
     except Exception as e:
-        return jsonify({"status": "error", "message": str(e)}), 500
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=500)
+
+# --- Bulk eligibility: the rules engine decides; the LLM only writes justifications in explain mode ---
+async def eligibility(request):
+    data = await read_json(request)
+    residents = data.get('residents')
+    mode = data.get('mode', 'rules')
+    if not isinstance(residents, list) or not residents or not all(isinstance(name, str) for name in residents):
+        return JSONResponse({"status": "error", "message": "Provide 'residents' as a non-empty list of names."},
+                            status_code=400)
+    if len(residents) > ELIGIBILITY_MAX_BATCH:
+        return JSONResponse({"status": "error", "message": f"At most {ELIGIBILITY_MAX_BATCH} residents per request."},
+                            status_code=413)
+    if mode not in ('rules', 'explain'):
+        return JSONResponse({"status": "error", "message": "Mode must be 'rules' or 'explain'."}, status_code=400)
+
+    try:
+        if mode == 'rules':
+            # No agent (or Gemini key) needed; the first call's imports stay off the event loop
+            from app.tools.eligibility_rules import evaluate_eligibility
+            results = await asyncio.to_thread(evaluate_eligibility, residents)
+        else:
+            from app.core.agent_registry import get_agent
+            from app.agents.investigation_agent_adk import InvestigationAgentADK
+            investigator = await asyncio.to_thread(get_agent, InvestigationAgentADK)
+            results = await investigator.verify_eligibility_batch_async(residents, mode=mode)
+        summary = {
+            "residents": len(results),
+            "not_found": sum(not result["found"] for result in results),
+            "rebate_eligible": sum(result["rebate_eligible"] for result in results),
+            "relief_eligible": sum(result["relief_eligible"] for result in results),
+        }
+        return JSONResponse({"status": "success", "summary": summary, "results": results})
+    except Exception as e:
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=500)
+
+# --- Streaming API: Server-Sent Events of agent activity (EventSource only supports GET) ---
+def sse_response(events, on_close=None):
+    """Serves an async iterator of events as Server-Sent Events (heartbeats become keep-alive comments)."""
+    async def body():
+        try:
+            async for event in events:
+                if event["type"] == "heartbeat":
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            if on_close is not None:
+                on_close()
+
+    return StreamingResponse(body(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+async def stream_workflow(request):
+    """Submits the workflow as a job (same worker cap and 429 backpressure) and streams its events."""
+    data = dict(request.query_params)
+    data['bypass_cache'] = cache_bypass_requested(request)
+    error = validate_workflow_request(data)
+    if error:
+        return error
+    if 'residents' in data:
+        data['residents'] = [name.strip() for name in data['residents'].split(',') if name.strip()]
+    job, error = submit_workflow_job(data)
+    if error:
+        return error
+
+    async def events():
+        yield {"type": "job", "job": job}
+        async for event in job_manager.events(job['job_id'], heartbeat=SSE_HEARTBEAT_SECONDS):
+            yield event
+
+    # The job belongs to this stream: closing it cancels the workflow
+    return sse_response(events(), on_close=lambda: job_manager.cancel(job['job_id']))
+
+async def stream_rag_query(request):
+    query = request.query_params.get('query')
+    if not query:
+        return JSONResponse({"status": "error", "message": "No query provided."}, status_code=400)
+
+    from app.core.genai_adk_base import stream_agent_events
+
+    async def answer():
+        _, rag_agent = await get_agents()
+        return await rag_agent.answer_question_async(query, use_cache=not cache_bypass_requested(request))
+    return sse_response(stream_agent_events(answer(), heartbeat=SSE_HEARTBEAT_SECONDS))
+
+@contextlib.asynccontextmanager
+async def lifespan(starlette_app):
+    if AGENT_WARMUP:
+        threading.Thread(target=warm_up, name="agent-warmup", daemon=True).start()
+    await job_manager.start()
+    yield
+    await job_manager.stop()
+
+# ASGI entry point: async API routes first, everything else (UI, static) falls through to Flask
+asgi_app = Starlette(
+    routes=[
+        Route('/healthz', healthz, methods=['GET']),
+        Route('/metrics', metrics, methods=['GET']),
+        Route('/api/run_workflow', run_workflow, methods=['POST']),
+        Route('/api/rag_query', rag_query, methods=['POST']),
+        Route('/api/eligibility', eligibility, methods=['POST']),
+        Route('/api/stream/workflow', stream_workflow, methods=['GET']),
+        Route('/api/stream/rag_query', stream_rag_query, methods=['GET']),
+        Route('/api/jobs', submit_job, methods=['POST']),
+        Route('/api/jobs/{job_id}', get_job, methods=['GET']),
+        Route('/api/jobs/{job_id}/events', stream_job, methods=['GET']),
+        Route('/api/jobs/{job_id}', cancel_job, methods=['DELETE']),
+        Mount('/', app=WsgiToAsgi(app)),
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])],
+    lifespan=lifespan,
+)
 
 if __name__ == '__main__':
-    # Default Flask port
-    app.run(host='0.0.0.0', port=8080, debug=True)
+    import uvicorn
+    # Cloud Run default port
+    uvicorn.run(asgi_app, host='0.0.0.0', port=int(os.environ.get('PORT', 8080)))
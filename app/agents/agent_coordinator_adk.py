@@ -1,10 +1,17 @@
 import os
+import time
 import shutil
-from app.core.genai_adk_base import create_adk_agent, run_adk_agent
-from app.agents.ocr_agent_adk import ocr_tool
-from app.agents.investigation_agent_adk import investigation_tool
-from app.agents.mitigation_agent_adk import mitigation_tool
-from app.agents.rag_agent_adk import rag_tool
+import asyncio
+from app.core.genai_adk_base import create_adk_agent, run_adk_agent_async, run_sync
+from app.core.agent_registry import get_agent
+from app.agents.ocr_agent_adk import ocr_tool, OCRAgentADK
+from app.agents.investigation_agent_adk import investigation_tool, InvestigationAgentADK
+from app.agents.mitigation_agent_adk import mitigation_tool, MitigationAgentADK
+from app.agents.rag_agent_adk import rag_tool, RAGAgentADK
+
+DEFAULT_RESIDENTS = ["John Doe", "Jane Smith", "Ryan Sessions"]
+DEFAULT_RAG_QUESTION = "Summarize the incident types and affected locations in the digitized records."
+INVESTIGATION_CONCURRENCY = int(os.environ.get("INVESTIGATION_CONCURRENCY", "4"))
 
 COORDINATOR_INSTRUCTION = """
 You are the SLED Disaster Response Coordinator. Your job is to orchestrate a multi-agent workflow to handle disaster records.
@@ -31,12 +38,76 @@ class AgentCoordinatorADK:
     def __init__(self):
         self.agent = create_coordinator_agent()
 
-    def run_full_workflow(self, input_image_path):
+    async def run_full_workflow_async(self, input_image_path):
         """
         Runs the full coordinated workflow starting with an image.
         """
         prompt = f"Please process the disaster record at {input_image_path}, check eligibility for residents, and generate a mitigation report."
-        return run_adk_agent(self.agent, prompt)
+        return await run_adk_agent_async(self.agent, prompt)
+
+    def run_full_workflow(self, input_image_path):
+        return run_sync(self.run_full_workflow_async(input_image_path))
+
+    async def run_parallel_workflow_async(self, input_image_path, residents=None, question=None,
+                                          max_concurrency=INVESTIGATION_CONCURRENCY):
+        """
+        Deterministic workflow mode that skips LLM orchestration:
+        OCR first, then investigation of every resident (at most max_concurrency at once)
+        alongside the RAG question, then mitigation. End-to-end latency is roughly
+        OCR + the slowest fan-out branch + mitigation instead of the sum of all calls.
+        """
+        residents = residents or DEFAULT_RESIDENTS
+        question = question or DEFAULT_RAG_QUESTION
+        timings = {}
+        workflow_start = time.perf_counter()
+
+        start = time.perf_counter()
+        ocr_result = await get_agent(OCRAgentADK).digitize_document_async(input_image_path)
+        timings["ocr"] = round(time.perf_counter() - start, 3)
+        if "error" in ocr_result:
+            timings["total"] = round(time.perf_counter() - workflow_start, 3)
+            return {"error": ocr_result["error"], "timings": timings}
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        investigation_timings = {}
+
+        async def investigate(resident_name):
+            async with semaphore:
+                start = time.perf_counter()
+                result = await get_agent(InvestigationAgentADK).verify_eligibility_async(resident_name)
+                investigation_timings[resident_name] = round(time.perf_counter() - start, 3)
+                return result
+
+        async def answer_question():
+            start = time.perf_counter()
+            answer = await get_agent(RAGAgentADK).answer_question_async(question)
+            timings["rag"] = round(time.perf_counter() - start, 3)
+            return answer
+
+        start = time.perf_counter()
+        *eligibility, rag_answer = await asyncio.gather(
+            *(investigate(name) for name in residents),
+            answer_question()
+        )
+        timings["investigation"] = investigation_timings
+        timings["fan_out"] = round(time.perf_counter() - start, 3)
+
+        start = time.perf_counter()
+        report = await get_agent(MitigationAgentADK).generate_report_async()
+        timings["mitigation"] = round(time.perf_counter() - start, 3)
+        timings["total"] = round(time.perf_counter() - workflow_start, 3)
+
+        return {
+            "ocr": ocr_result["response"],
+            "eligibility": dict(zip(residents, eligibility)),
+            "rag": {"question": question, "answer": rag_answer},
+            "mitigation": report,
+            "timings": timings,
+        }
+
+    def run_parallel_workflow(self, input_image_path, residents=None, question=None,
+                              max_concurrency=INVESTIGATION_CONCURRENCY):
+        return run_sync(self.run_parallel_workflow_async(input_image_path, residents, question, max_concurrency))
 
 if __name__ == "__main__":
     # Setup test environment
@@ -49,7 +120,7 @@ if __name__ == "__main__":
         shutil.copy(artifact_image, test_image)
     
     if os.path.exists(test_image):
-        coordinator = AgentCoordinatorADK()
+        coordinator = get_agent(AgentCoordinatorADK)
         print("Starting ADK Coordinated Workflow...")
         result = coordinator.run_full_workflow(test_image)
         print(f"\nFINAL OUTPUT:\n{result}")
@@ -1,24 +1,59 @@
-from app.core.genai_adk_base import create_adk_agent, run_adk_agent
-from app.tools.mcp_server import lookup_resident_record, get_disaster_zones
+import os
+import json
+import asyncio
+from app.core.genai_adk_base import create_adk_agent, run_adk_agent_async, run_sync
+from app.core.agent_registry import get_agent
+from app.core.mcp_client import call_mcp_tool
+from app.tools.mcp_server import (lookup_resident_record, lookup_residents, find_residents_by_address,
+                                  get_disaster_zones, check_address_in_zones)
+from app.tools.eligibility_rules import evaluate_eligibility
+from app.tools.resident_store import get_resident_store
 
-def resident_lookup(resident_name: str):
+# rules:   the rules engine decides and a templated justification is returned (no LLM call)
+# explain: the rules engine decides and the LLM only writes the justification
+# agent:   the LLM gathers the data with its tools and decides (original tool-calling loop)
+ELIGIBILITY_MODES = ("rules", "explain", "agent")
+ELIGIBILITY_MODE = os.environ.get("ELIGIBILITY_MODE", "rules")
+ELIGIBILITY_LLM_CONCURRENCY = int(os.environ.get("ELIGIBILITY_LLM_CONCURRENCY", "4"))
+
+async def resident_lookup(resident_name: str):
     """Looks up a resident's record to check for disaster relief eligibility."""
-    return lookup_resident_record.fn(resident_name)
+    return await call_mcp_tool(lookup_resident_record, resident_name=resident_name)
+
+async def residents_lookup(names: list[str], match: str = "exact"):
+    """Looks up many residents at once; match may be "exact", "fuzzy" (closest names) or "prefix"."""
+    return await call_mcp_tool(lookup_residents, names=names, match=match)
 
-def disaster_zones():
+async def residents_at_address(address: str):
+    """Finds every resident whose address contains the given street, town or neighborhood."""
+    return await call_mcp_tool(find_residents_by_address, address=address)
+
+async def disaster_zones():
     """Returns a list of areas currently designated as disaster zones."""
-    return get_disaster_zones.fn()
+    return await call_mcp_tool(get_disaster_zones)
+
+async def address_in_disaster_zone(address: str):
+    """Checks which disaster zones (if any) contain an address."""
+    return await call_mcp_tool(check_address_in_zones, address=address)
 
 INVESTIGATION_INSTRUCTION = """
 You are an Investigation Agent specializing in disaster relief eligibility.
 Your task is to determine if a resident is eligible for a tax rebate or disaster relief.
 
 Rules:
-1. Must be in a designated disaster zone (use disaster_zones tool).
+1. Must be in a designated disaster zone (use address_in_disaster_zone with the resident's address, or the disaster_zones tool).
 2. Must have 'tax_rebate_eligible' as True for rebate.
 3. Must be 'disaster_affected' for relief funds.
 
 Use the provided tools to gather data and provide a clear decision with justification.
+When checking several residents (or a whole street), use residents_lookup or residents_at_address once instead of one resident_lookup per person.
+Concise Response (2-3 sentences).
+"""
+
+EXPLAIN_INSTRUCTION = """
+You are an Investigation Agent specializing in disaster relief eligibility.
+You are given a resident's record and the eligibility decision already made by the eligibility rules.
+Explain the decision with a clear justification. Do not change the decision.
 Concise Response (2-3 sentences).
 """
 
@@ -27,20 +62,57 @@ def create_investigation_agent():
         name="investigation_agent",
         description="Verifies eligibility for disaster relief.",
         instructions=INVESTIGATION_INSTRUCTION,
-        tools=[resident_lookup, disaster_zones]
+        tools=[resident_lookup, residents_lookup, residents_at_address, disaster_zones, address_in_disaster_zone]
     )
 
-def investigation_tool(resident_name: str) -> str:
+def create_explainer_agent():
+    return create_adk_agent(
+        name="eligibility_explainer",
+        description="Writes the justification for a rules-engine eligibility decision.",
+        instructions=EXPLAIN_INSTRUCTION,
+    )
+
+async def investigation_tool(resident_name: str) -> str:
     """Verify disaster relief eligibility for a resident."""
-    agent = InvestigationAgentADK()
-    return agent.verify_eligibility(resident_name)
+    return await get_agent(InvestigationAgentADK).verify_eligibility_async(resident_name)
 
 class InvestigationAgentADK:
     def __init__(self):
+        get_resident_store()  # Raises now if RESIDENTS_PATH is set but cannot be loaded
         self.agent = create_investigation_agent()
+        self.explainer = create_explainer_agent()
+
+    async def verify_eligibility_async(self, resident_name, mode=None):
+        mode = mode or ELIGIBILITY_MODE
+        if mode == "agent":
+            return await run_adk_agent_async(self.agent, f"Verify eligibility for {resident_name}")
+        [decision] = await self.verify_eligibility_batch_async([resident_name], mode=mode)
+        return decision["justification"]
+
+    async def verify_eligibility_batch_async(self, resident_names, mode=None, max_concurrency=ELIGIBILITY_LLM_CONCURRENCY):
+        """
+        Decides eligibility for every resident with one rules-engine evaluation.
+        In explain mode the justifications are then written by the LLM, at most
+        max_concurrency at a time; the decisions themselves never change.
+        """
+        mode = mode or ELIGIBILITY_MODE
+        if mode not in ("rules", "explain"):
+            raise ValueError(f"Unsupported batch eligibility mode '{mode}'. Expected 'rules' or 'explain'.")
+        decisions = evaluate_eligibility(resident_names)
+        if mode == "explain":
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+            async def explain(decision):
+                async with semaphore:
+                    text = await run_adk_agent_async(self.explainer, f"Eligibility decision:\n{json.dumps(decision)}")
+                if text:
+                    decision["justification"] = text
+
+            await asyncio.gather(*(explain(decision) for decision in decisions))
+        return decisions
 
-    def verify_eligibility(self, resident_name):
-        return run_adk_agent(self.agent, f"Verify eligibility for {resident_name}")
+    def verify_eligibility(self, resident_name, mode=None):
+        return run_sync(self.verify_eligibility_async(resident_name, mode=mode))
 
 if __name__ == "__main__":
     agent = InvestigationAgentADK()
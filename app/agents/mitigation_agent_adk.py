@@ -1,21 +1,41 @@
-import json
-import os
-from app.core.genai_adk_base import create_adk_agent, run_adk_agent
-
-def read_disaster_summary():
-    """Reads the cumulative disaster records from the ingestion summary file."""
-    summary_path = "output/ingestion_summary.json"
-    if not os.path.exists(summary_path):
-        return "No digestion records found."
-    with open(summary_path, "r") as f:
-        return json.load(f)
+from app.core.genai_adk_base import create_adk_agent, run_sync
+from app.core.agent_registry import get_agent
+from app.core.response_cache import run_cached_agent
+from app.tools.trend_stats import get_trend_stats
+from app.tools.record_store import get_record_store
+from app.core.mcp_client import call_mcp_tool
+from app.tools.mcp_server import count_records
+
+def _current_trend_stats():
+    stats = get_trend_stats()
+    # Records saved by other processes (batch ingestion, MCP workers) only reach us through the ingestion log
+    stats.refresh()
+    return stats
+
+async def read_disaster_summary(incident_type: str = "", location: str = "", top: int = 5):
+    """
+    Returns trend statistics over all disaster records: totals, the top incident types,
+    locations, severities and incident/location pairs, and monthly counts.
+    Pass incident_type and/or location to drill down into matching records.
+    """
+    # The first call loads the stats and reads any records saved since; keep that off the event loop
+    stats = await get_record_store().run(_current_trend_stats)
+    summary = stats.summary(incident_type=incident_type, location=location, top=top)
+    if not summary["total_records"]:
+        return "No records match the given filters." if incident_type or location else "No digestion records found."
+    return summary
+
+async def count_incidents(group_by: str = "incident_type,location_context"):
+    """Counts records by comma-separated fields (incident_type, location_context, severity, year, month, day)."""
+    return await call_mcp_tool(count_records, group_by=group_by)
 
 MITIGATION_INSTRUCTION = """
 You are a Mitigation Reporting Agent. Your task is to analyze digitized disaster records and propose future mitigation steps.
 
-1. Use the read_disaster_summary tool to get the current records.
-2. Analyze trends in incident types and locations.
-3. Propose 3 specific mitigation steps.
+1. Use the read_disaster_summary tool to get trend statistics for the current records (drill down by incident type or location if needed).
+2. For other breakdowns (e.g. by severity or by day), use count_incidents.
+3. Analyze trends in incident types and locations.
+4. Propose 3 specific mitigation steps.
 
 Concise Response (MAXIMUM THREE SENTENCES).
 """
@@ -25,20 +45,24 @@ def create_mitigation_agent():
         name="mitigation_agent",
         description="Analyzes trends and proposes mitigation steps.",
         instructions=MITIGATION_INSTRUCTION,
-        tools=[read_disaster_summary]
+        tools=[read_disaster_summary, count_incidents]
     )
 
-def mitigation_tool() -> str:
+async def mitigation_tool() -> str:
     """Generate a mitigation report based on current disaster records."""
-    agent = MitigationAgentADK()
-    return agent.generate_report()
+    return await get_agent(MitigationAgentADK).generate_report_async()
 
 class MitigationAgentADK:
     def __init__(self):
         self.agent = create_mitigation_agent()
 
-    def generate_report(self):
-        return run_adk_agent(self.agent, "Generate a mitigation report based on current records.")
+    async def generate_report_async(self, use_cache=True):
+        # Cached until a new record is saved (or the entry expires)
+        return await run_cached_agent(self.agent, "Generate a mitigation report based on current records.",
+                                      use_cache=use_cache)
+
+    def generate_report(self, use_cache=True):
+        return run_sync(self.generate_report_async(use_cache=use_cache))
 
 if __name__ == "__main__":
     agent = MitigationAgentADK()
@@ -1,31 +1,42 @@
 import os
 import json
+import asyncio
+import hashlib
+import threading
 from google.genai import types as genai_types
-from app.core.genai_adk_base import create_adk_agent, run_adk_agent
+from app.core.genai_adk_base import create_adk_agent, run_adk_agent_async, run_sync, DEFAULT_MODEL
+from app.core.agent_registry import get_agent
+from app.core.disk_cache import DiskLRUCache
+from app.agents.ocr_preprocess import PREPARE_ERRORS, hash_file, prepare_image_parts, preprocess_settings
+from app.tools.search_index import get_document_index
+from app.tools.vector_index import VECTOR_INDEX_ENABLED, get_vector_index
+from app.tools.metadata_index import get_metadata_index
+from app.tools.trend_stats import get_trend_stats
+from app.tools.ingestion_log import get_ingestion_log
+from app.tools.record_store import get_record_store
 
-def save_digitized_record(doc_data: str):
+def _index_record(doc_id, path, data):
+    get_document_index().add_document(path, data)
+    if VECTOR_INDEX_ENABLED:
+        get_vector_index().add_document(path, data)
+    get_metadata_index().add_document(path, data)
+    get_trend_stats().add_document(path, data)
+
+    # Record the ingestion (single atomic append, de-duplicated by readers)
+    get_ingestion_log().append(doc_id, path)
+
+async def save_digitized_record(doc_data: str):
     """
     Saves the digitized document data to the output directory.
     The doc_data should be a JSON string representing the document.
     """
-    os.makedirs("output", exist_ok=True)
     try:
         data = json.loads(doc_data)
         doc_id = data.get("document_id", "unknown_doc")
-        path = f"output/{doc_id}.json"
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2)
-        
-        # Update summary
-        summary_path = "output/ingestion_summary.json"
-        summary = []
-        if os.path.exists(summary_path):
-            with open(summary_path, "r") as f:
-                summary = json.load(f)
-        summary.append({"document_id": doc_id, "path": path})
-        with open(summary_path, "w") as f:
-            json.dump(summary, f, indent=2)
-            
+        # Atomic write and index updates run on the record store's I/O threads
+        store = get_record_store()
+        path = await store.write_async(doc_id, data)
+        await store.run(_index_record, doc_id, path, data)
         return f"Successfully saved document {doc_id} to {path}."
     except Exception as e:
         return f"Error saving digitized record: {e}"
@@ -46,6 +57,32 @@ After creating the JSON, call the save_digitized_record tool with the JSON strin
 Provide a concise response confirming the digitization.
 """
 
+DIGITIZE_PROMPT = "Digitize this document record into JSON."
+
+# --- OCR result cache ---
+OCR_CACHE_ENABLED = os.environ.get("OCR_CACHE_ENABLED", "1") != "0"
+OCR_CACHE_DIR = os.environ.get("OCR_CACHE_DIR", "output/.ocr_cache")
+OCR_CACHE_MAX_BYTES = int(os.environ.get("OCR_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+_ocr_cache = None
+_ocr_cache_lock = threading.Lock()
+
+def get_ocr_cache():
+    global _ocr_cache
+    if _ocr_cache is None:
+        with _ocr_cache_lock:
+            if _ocr_cache is None:
+                _ocr_cache = DiskLRUCache(OCR_CACHE_DIR, OCR_CACHE_MAX_BYTES)
+    return _ocr_cache
+
+def ocr_cache_key(image_digest):
+    """Identical scans digitized with the same prompt, instructions, model and preprocessing share a key."""
+    digest = hashlib.sha256()
+    digest.update(image_digest.encode("utf-8"))
+    for component in (DIGITIZE_PROMPT, OCR_INSTRUCTION, DEFAULT_MODEL, preprocess_settings()):
+        digest.update(b"\0" + component.encode("utf-8"))
+    return digest.hexdigest()
+
 def create_ocr_agent():
     return create_adk_agent(
         name="ocr_agent",
@@ -54,39 +91,85 @@ def create_ocr_agent():
         tools=[save_digitized_record]
     )
 
-def ocr_tool(image_path: str) -> str:
+async def ocr_tool(image_path: str) -> str:
     """Digitizes a document from an image path and returns the result."""
-    agent = OCRAgentADK()
-    return agent.digitize_document(image_path)["response"]
+    result = await get_agent(OCRAgentADK).digitize_document_async(image_path)
+    return result.get("response", result.get("error"))
 
 class OCRAgentADK:
     def __init__(self):
         self.agent = create_ocr_agent()
 
-    def digitize_document(self, image_path):
+    async def digitize_document_async(self, image_path, raise_errors=False, use_cache=OCR_CACHE_ENABLED):
         if not os.path.exists(image_path):
             return {"error": f"Image not found at {image_path}"}
         
-        with open(image_path, "rb") as f:
-            image_bytes = f.read()
+        cache_key = None
+        if use_cache:
+            cache_key = ocr_cache_key(await asyncio.to_thread(hash_file, image_path))
+            cached = get_ocr_cache().get(cache_key)
+            if cached is not None:
+                # Re-ingest if the saved record was removed since it was cached
+                if not os.path.exists(get_record_store().path_for(cached['document_id'])):
+                    await save_digitized_record(json.dumps(cached["record"]))
+                return dict(cached, cached=True)
         
-        # Determine mime type simple check
-        mime_type = "image/png"
-        if image_path.lower().endswith(".jpg") or image_path.lower().endswith(".jpeg"):
-            mime_type = "image/jpeg"
-
-        # Create multimodal part
-        part = genai_types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
-        prompt = [
-            genai_types.Part.from_text(text="Digitize this document record into JSON."),
-            part
-        ]
+        # Sniff, downscale and split pages off the event loop (CPU-bound decode)
+        try:
+            pages = await asyncio.to_thread(prepare_image_parts, image_path)
+        except PREPARE_ERRORS as e:
+            return {"error": str(e)}
+
+        # Create multimodal parts (one per page)
+        prompt = [genai_types.Part.from_text(text=DIGITIZE_PROMPT)]
+        prompt.extend(genai_types.Part.from_bytes(data=data, mime_type=mime_type) for data, mime_type in pages)
         
         # Wrap in Content for ADK
         content = genai_types.Content(role="user", parts=prompt)
         
-        response = run_adk_agent(self.agent, content)
-        return {"response": response, "document_id": "Extracted from image"}
+        saved_records = []
+
+        def capture_saved_record(event):
+            for call in event.get_function_calls():
+                if call.name == "save_digitized_record" and call.args:
+                    try:
+                        saved_records.append(json.loads(call.args.get("doc_data", "")))
+                    except ValueError:
+                        pass
+
+        response = await run_adk_agent_async(self.agent, content, raise_errors=raise_errors, on_event=capture_saved_record)
+        if not saved_records:
+            return {"response": response, "document_id": "Extracted from image"}
+
+        record = saved_records[-1]
+        result = {"response": response, "document_id": record.get("document_id", "unknown_doc"), "record": record}
+        if use_cache:
+            get_ocr_cache().set(cache_key, result)
+        return dict(result, cached=False)
+
+    def invalidate_cache(self, image_path=None):
+        """Drops the cached result for one scan, or the whole OCR cache if no path is given."""
+        if image_path is None:
+            get_ocr_cache().clear()
+            return True
+        return get_ocr_cache().delete(ocr_cache_key(hash_file(image_path)))
+
+    def cache_stats(self):
+        return get_ocr_cache().stats()
+
+    def digitize_document(self, image_path):
+        return run_sync(self.digitize_document_async(image_path))
+
+    async def digitize_batch_async(self, source, **options):
+        """
+        Digitizes a directory of scans or a list of image paths with bounded
+        concurrency, rate limiting, retries and checkpointing (see ocr_batch).
+        """
+        from app.agents.ocr_batch import BatchIngestionPipeline
+        return await BatchIngestionPipeline(ocr_agent=self, **options).run(source)
+
+    def digitize_batch(self, source, **options):
+        return run_sync(self.digitize_batch_async(source, **options))
 
 if __name__ == "__main__":
     agent = OCRAgentADK()
@@ -0,0 +1,241 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from app.core.agent_registry import get_agent
+from app.core.genai_adk_base import run_sync
+from app.agents.ocr_agent_adk import OCRAgentADK
+from app.tools.zone_index import get_zone_index
+
+SUPPORTED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".tif", ".tiff", ".pdf")
+CHECKPOINT_PATH = "output/.batch_checkpoint.jsonl"
+
+# --- Configuration ---
+DEFAULT_CONCURRENCY = int(os.environ.get("OCR_BATCH_CONCURRENCY", "4"))
+DEFAULT_RATE_PER_SECOND = float(os.environ.get("OCR_BATCH_RATE", "2"))
+DEFAULT_MAX_RETRIES = int(os.environ.get("OCR_BATCH_MAX_RETRIES", "3"))
+RETRY_BASE_DELAY_SECONDS = 1.0
+RETRY_MAX_DELAY_SECONDS = 30.0
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+def iter_input_files(source):
+    """
+    Producer: streams image paths from a directory (without listing it up front)
+    or from an iterable of paths.
+    """
+    if isinstance(source, str) and os.path.isdir(source):
+        for entry in os.scandir(source):
+            if entry.is_file() and entry.name.lower().endswith(SUPPORTED_EXTENSIONS):
+                yield entry.path
+    elif isinstance(source, str):
+        yield source
+    else:
+        yield from source
+
+class RecordNotSavedError(RuntimeError):
+    """The model finished without calling save_digitized_record."""
+
+def is_transient_error(error):
+    """Rate limits, server errors, network hiccups and runs that saved no record are worth retrying."""
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError, RecordNotSavedError)):
+        return True
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return code in TRANSIENT_STATUS_CODES
+
+class RateLimiter:
+    """Token bucket shared by all workers: at most `rate` model calls per second."""
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.rate:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class Checkpoint:
+    """Append-only record of completed files so an interrupted batch can resume."""
+    def __init__(self, path=CHECKPOINT_PATH):
+        self.path = path
+        self.completed = set()
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        self.completed.add(json.loads(line)["path"])
+                    except (ValueError, KeyError):
+                        continue
+
+    def __contains__(self, image_path):
+        return os.path.abspath(image_path) in self.completed
+
+    def mark_done(self, image_path, document_id=None):
+        path = os.path.abspath(image_path)
+        self.completed.add(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"path": path, "document_id": document_id, "completed_at": time.time()}) + "\n")
+
+def summarize_latencies(samples):
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def percentile(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "p50": round(percentile(0.50), 3),
+        "p95": round(percentile(0.95), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+class BatchIngestionPipeline:
+    """
+    Streams files from a producer into a bounded queue consumed by a pool of
+    async workers. Model calls go through a shared rate limiter and are retried
+    with exponential backoff on transient errors.
+    """
+    def __init__(self, ocr_agent=None, concurrency=DEFAULT_CONCURRENCY, rate_per_second=DEFAULT_RATE_PER_SECOND,
+                 max_retries=DEFAULT_MAX_RETRIES, checkpoint_path=CHECKPOINT_PATH, resume=True):
+        self.ocr_agent = ocr_agent or get_agent(OCRAgentADK)
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = RateLimiter(rate_per_second, burst=self.concurrency)
+        self.max_retries = max_retries
+        self.checkpoint = Checkpoint(checkpoint_path) if resume else None
+        self.stage_latencies = {"queue_wait": [], "rate_limit_wait": [], "digitize": [], "total": []}
+        self.results = []
+
+    async def _digitize_with_retry(self, image_path):
+        attempt = 0
+        while True:
+            wait_start = time.perf_counter()
+            await self.rate_limiter.acquire()
+            self.stage_latencies["rate_limit_wait"].append(time.perf_counter() - wait_start)
+            try:
+                result = await self.ocr_agent.digitize_document_async(image_path, raise_errors=True)
+                if "error" not in result and not result.get("record"):
+                    raise RecordNotSavedError(f"No record was saved for {image_path}.")
+                return result
+            except Exception as e:
+                attempt += 1
+                if attempt > self.max_retries or not is_transient_error(e):
+                    raise
+                delay = min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+                delay *= random.uniform(0.5, 1.5)
+                print(f"Transient error on {image_path} ({e}); retry {attempt}/{self.max_retries} in {delay:.1f}s",
+                      file=sys.stderr)
+                await asyncio.sleep(delay)
+
+    async def _worker(self, queue):
+        while True:
+            item = await queue.get()
+            if item is None:
+                queue.task_done()
+                return
+            image_path, enqueued_at = item
+            start = time.perf_counter()
+            self.stage_latencies["queue_wait"].append(start - enqueued_at)
+            try:
+                digitize_start = time.perf_counter()
+                result = await self._digitize_with_retry(image_path)
+                self.stage_latencies["digitize"].append(time.perf_counter() - digitize_start)
+                if "error" in result:
+                    self.results.append({"path": image_path, "status": "failed", "error": result["error"]})
+                else:
+                    if self.checkpoint is not None:
+                        self.checkpoint.mark_done(image_path, result.get("document_id"))
+                    self.results.append({"path": image_path, "status": "completed", "response": result["response"],
+                                         "record": result.get("record")})
+            except Exception as e:
+                self.results.append({"path": image_path, "status": "failed", "error": str(e)})
+            finally:
+                self.stage_latencies["total"].append(time.perf_counter() - start)
+                queue.task_done()
+
+    async def run(self, source):
+        """Digitizes every file from source. Returns per-file results plus throughput stats."""
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(self.concurrency)]
+        skipped = 0
+        batch_start = time.perf_counter()
+        try:
+            for image_path in iter_input_files(source):
+                if self.checkpoint is not None and image_path in self.checkpoint:
+                    skipped += 1
+                    continue
+                await queue.put((image_path, time.perf_counter()))
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+        elapsed = time.perf_counter() - batch_start
+
+        # Check the whole batch against the disaster zones in one vectorized pass
+        completed_results = [r for r in self.results if r["status"] == "completed"]
+        for result, zones in zip(completed_results,
+                                 get_zone_index().classify_records([r.pop("record") for r in completed_results])):
+            result["disaster_zones"] = zones
+
+        completed = len(completed_results)
+        return {
+            "results": self.results,
+            "stats": {
+                "completed": completed,
+                "failed": len(self.results) - completed,
+                "skipped": skipped,
+                "in_disaster_zone": sum(1 for r in completed_results if r["disaster_zones"]),
+                "elapsed_seconds": round(elapsed, 3),
+                "docs_per_second": round(completed / elapsed, 3) if elapsed > 0 else 0.0,
+                "stage_latency_seconds": {
+                    stage: summarize_latencies(samples) for stage, samples in self.stage_latencies.items()
+                },
+            },
+        }
+
+async def digitize_batch_async(source, **options):
+    return await BatchIngestionPipeline(**options).run(source)
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-digitize scanned disaster records.")
+    parser.add_argument("source", nargs="+", help="Directory of scans or individual image paths.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE_PER_SECOND, help="Max model calls per second (0 = unlimited).")
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES)
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH)
+    parser.add_argument("--no-resume", action="store_true", help="Ignore and do not write the checkpoint.")
+    args = parser.parse_args()
+
+    source = args.source[0] if len(args.source) == 1 else args.source
+    report = run_sync(digitize_batch_async(
+        source,
+        concurrency=args.concurrency,
+        rate_per_second=args.rate,
+        max_retries=args.max_retries,
+        checkpoint_path=args.checkpoint,
+        resume=not args.no_resume,
+    ))
+    for result in report["results"]:
+        print(f"[{result['status']}] {result['path']}")
+    print(json.dumps(report["stats"], indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import io
+import os
+import hashlib
+import threading
+
+try:
+    from PIL import Image, ImageSequence
+except ImportError:  # Preprocessing degrades to pass-through without Pillow
+    Image = None
+
+try:
+    from pypdf import PdfReader, PdfWriter
+    from pypdf.errors import PyPdfError
+except ImportError:  # PDFs are sent whole without pypdf
+    PdfReader = None
+
+# --- Configuration ---
+# ~2000px on the long edge keeps form text legible for OCR while cutting payload size
+OCR_MAX_DIMENSION = int(os.environ.get("OCR_MAX_DIMENSION", "2000"))
+OCR_JPEG_QUALITY = int(os.environ.get("OCR_JPEG_QUALITY", "85"))
+OCR_MAX_INPUT_BYTES = int(os.environ.get("OCR_MAX_INPUT_BYTES", str(50 * 1024 * 1024)))
+OCR_MAX_PAGES = int(os.environ.get("OCR_MAX_PAGES", "20"))
+# Upper bound on decoded pixel memory held by one worker at a time
+OCR_MAX_DECODE_BYTES = int(os.environ.get("OCR_MAX_DECODE_BYTES", str(256 * 1024 * 1024)))
+OCR_MAX_CONCURRENT_DECODES = int(os.environ.get("OCR_MAX_CONCURRENT_DECODES", "2"))
+
+READ_CHUNK_BYTES = 1024 * 1024
+
+# What prepare_image_parts raises for a scan it cannot use: our own checks (ValueError),
+# corrupt or truncated images (OSError, including PIL.UnidentifiedImageError), oversized
+# ones and unreadable PDFs
+PREPARE_ERRORS = (ValueError, OSError)
+if Image is not None:
+    PREPARE_ERRORS += (Image.DecompressionBombError,)
+if PdfReader is not None:
+    PREPARE_ERRORS += (PyPdfError,)
+
+MAGIC_NUMBERS = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+    (b"%PDF-", "application/pdf"),
+    (b"BM", "image/bmp"),
+]
+
+# Limits how many large scans are decoded at once across all workers
+_decode_slots = threading.BoundedSemaphore(OCR_MAX_CONCURRENT_DECODES)
+
+def sniff_mime_type(header):
+    """Detects the file type from its leading bytes; the extension is not trusted."""
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    for magic, mime_type in MAGIC_NUMBERS:
+        if header.startswith(magic):
+            return mime_type
+    return None
+
+def hash_file(path):
+    """sha256 of the file contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def preprocess_settings():
+    """Settings that change the bytes sent to the model (part of the OCR cache key)."""
+    return f"max_dim={OCR_MAX_DIMENSION};quality={OCR_JPEG_QUALITY};max_pages={OCR_MAX_PAGES}"
+
+def prepare_image_parts(path):
+    """
+    Returns [(bytes, mime_type)] ready for Part.from_bytes: one entry per page.
+    Scans larger than OCR_MAX_DIMENSION (or in formats other than PNG/JPEG/WebP)
+    are downscaled and re-encoded as JPEG; small scans are sent as-is.
+    Raises ValueError for files that are too large or not a supported image/PDF,
+    and one of PREPARE_ERRORS for files that cannot be decoded.
+    """
+    size = os.path.getsize(path)
+    if size > OCR_MAX_INPUT_BYTES:
+        raise ValueError(f"Scan is {size} bytes; the limit is {OCR_MAX_INPUT_BYTES}.")
+
+    with open(path, "rb") as f:
+        mime_type = sniff_mime_type(f.read(16))
+    if mime_type is None:
+        raise ValueError(f"Unsupported or unrecognized file type: {path}")
+
+    if mime_type == "application/pdf":
+        return split_pdf_pages(path)
+    if Image is None:
+        with open(path, "rb") as f:
+            return [(f.read(), mime_type)]
+
+    with _decode_slots:
+        return list(_downscale_pages(path, mime_type))
+
+def split_pdf_pages(path):
+    """Splits a multi-page PDF into single-page PDFs so each page is its own part."""
+    with open(path, "rb") as f:
+        if PdfReader is None:
+            return [(f.read(), "application/pdf")]
+        reader = PdfReader(f)
+        if len(reader.pages) <= 1:
+            f.seek(0)
+            return [(f.read(), "application/pdf")]
+        parts = []
+        for page in reader.pages[:OCR_MAX_PAGES]:
+            writer = PdfWriter()
+            writer.add_page(page)
+            buffer = io.BytesIO()
+            writer.write(buffer)
+            parts.append((buffer.getvalue(), "application/pdf"))
+        return parts
+
+def _downscale_pages(path, mime_type):
+    with Image.open(path) as image:
+        original_size = image.size
+        if mime_type == "image/jpeg":
+            # Let the JPEG decoder scale down by a power of two while decoding
+            image.draft("RGB", (OCR_MAX_DIMENSION, OCR_MAX_DIMENSION))
+        frames = ImageSequence.Iterator(image) if mime_type == "image/tiff" else [image]
+        for page_number, frame in enumerate(frames):
+            if page_number >= OCR_MAX_PAGES:
+                break
+            width, height = frame.size
+            if width * height * len(frame.getbands()) > OCR_MAX_DECODE_BYTES:
+                raise ValueError(f"Page {page_number + 1} of {path} ({width}x{height}) exceeds the decode memory cap.")
+
+            needs_resize = max(width, height) > OCR_MAX_DIMENSION
+            # frame.size is the drafted size; a drafted JPEG must be re-encoded even if it now fits
+            drafted = (width, height) != original_size
+            if not needs_resize and not drafted and page_number == 0 and getattr(image, "n_frames", 1) == 1 \
+                    and mime_type in ("image/png", "image/jpeg", "image/webp"):
+                # Already small and in a format the model accepts: send the original bytes
+                with open(path, "rb") as f:
+                    yield f.read(), mime_type
+                return
+
+            page = frame.convert("L" if frame.mode in ("1", "L", "I;16") else "RGB")
+            if needs_resize:
+                page.thumbnail((OCR_MAX_DIMENSION, OCR_MAX_DIMENSION), Image.LANCZOS)
+            buffer = io.BytesIO()
+            page.save(buffer, format="JPEG", quality=OCR_JPEG_QUALITY, optimize=True)
+            page.close()
+            yield buffer.getvalue(), "image/jpeg"
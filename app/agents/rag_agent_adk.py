@@ -1,17 +1,35 @@
-from app.core.genai_adk_base import create_adk_agent, run_adk_agent
-from app.tools.mcp_server import search_digitized_documents
-
-def search_docs(query: str):
-    """Searches digitized disaster records for specific information."""
-    return search_digitized_documents.fn(query)
+from app.core.genai_adk_base import create_adk_agent, run_sync
+from app.core.agent_registry import get_agent
+from app.core.response_cache import run_cached_agent
+from app.core.semantic_cache import SEMANTIC_CACHE_ENABLED, get_semantic_cache
+from app.core.mcp_client import call_mcp_tool
+from app.tools.mcp_server import search_digitized_documents, query_records, count_records
+
+async def search_docs(query: str, limit: int = 10):
+    """Searches digitized disaster records for specific information, best matches first."""
+    return await call_mcp_tool(search_digitized_documents, query=query, limit=limit)
+
+async def filter_records(incident_type: str = "", location: str = "", severity: str = "",
+                         date_from: str = "", date_to: str = "", limit: int = 50):
+    """Lists records matching exact filters (incident type, location, severity, YYYY-MM-DD date range)."""
+    return await call_mcp_tool(query_records, incident_type=incident_type, location=location, severity=severity,
+                               date_from=date_from, date_to=date_to, limit=limit)
+
+async def count_incidents(group_by: str = "incident_type,location_context", incident_type: str = "", location: str = "",
+                          severity: str = "", date_from: str = "", date_to: str = ""):
+    """Counts records by comma-separated fields (incident_type, location_context, severity, year, month, day)."""
+    return await call_mcp_tool(count_records, group_by=group_by, incident_type=incident_type, location=location,
+                               severity=severity, date_from=date_from, date_to=date_to)
 
 RAG_INSTRUCTION = """
 You are a RAG (Retrieval-Augmented Generation) Agent for SLED Disaster Response.
 Your goal is to answer questions about disaster incidents, affected locations, and residents by searching digitized records.
 
-1. Use the search_docs tool to find relevant information.
-2. If no information is found, state that clearly.
-3. Be concise and factual.
+1. For counts, totals or date ranges ("how many floods in Richmond?"), use count_incidents.
+2. To list records by incident type, location, severity or date, use filter_records.
+3. For free-text questions, use the search_docs tool to find relevant information.
+4. If no information is found, state that clearly.
+5. Be concise and factual.
 """
 
 def create_rag_agent():
@@ -19,20 +37,24 @@ def create_rag_agent():
         name="rag_agent",
         description="Answers questions based on digitized disaster records.",
         instructions=RAG_INSTRUCTION,
-        tools=[search_docs]
+        tools=[search_docs, filter_records, count_incidents]
     )
 
-def rag_tool(question: str) -> str:
+async def rag_tool(question: str) -> str:
     """Answer questions based on digitized disaster records."""
-    agent = RAGAgentADK()
-    return agent.answer_question(question)
+    return await get_agent(RAGAgentADK).answer_question_async(question)
 
 class RAGAgentADK:
     def __init__(self):
         self.agent = create_rag_agent()
 
-    def answer_question(self, question):
-        return run_adk_agent(self.agent, question)
+    async def answer_question_async(self, question, use_cache=True):
+        # Rewordings of an earlier question reuse its answer until the corpus changes
+        semantic_cache = get_semantic_cache(self.agent.name) if SEMANTIC_CACHE_ENABLED else None
+        return await run_cached_agent(self.agent, question, use_cache=use_cache, semantic_cache=semantic_cache)
+
+    def answer_question(self, question, use_cache=True):
+        return run_sync(self.answer_question_async(question, use_cache=use_cache))
 
 if __name__ == "__main__":
     agent = RAGAgentADK()
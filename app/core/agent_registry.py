@@ -0,0 +1,31 @@
+import threading
+
+# Agent instances shared by app.py, the coordinator and the tool wrappers
+_AGENTS = {}
+_AGENT_LOCKS = {}
+_REGISTRY_LOCK = threading.Lock()
+
+def get_agent(agent_cls):
+    """
+    Returns the shared instance of an *AgentADK class, constructing it on first use.
+    Construction is guarded by a per-class lock so concurrent first calls build
+    the agent only once without blocking lookups of other agents.
+    """
+    agent = _AGENTS.get(agent_cls)
+    if agent is not None:
+        return agent
+
+    with _REGISTRY_LOCK:
+        lock = _AGENT_LOCKS.setdefault(agent_cls, threading.Lock())
+
+    with lock:
+        agent = _AGENTS.get(agent_cls)
+        if agent is None:
+            agent = agent_cls()
+            _AGENTS[agent_cls] = agent
+    return agent
+
+def reset_agents():
+    """Drops all cached agent instances (e.g. after rotating the API key)."""
+    with _REGISTRY_LOCK:
+        _AGENTS.clear()
@@ -0,0 +1,103 @@
+import os
+import sys
+import json
+import threading
+from collections import OrderedDict
+
+class DiskLRUCache:
+    """
+    Size-bounded on-disk cache of JSON values, one file per key.
+    Recency is tracked in memory and mirrored in file mtimes so the LRU order
+    survives restarts. Once the total size exceeds max_bytes, least recently
+    used entries are deleted.
+    """
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> size in bytes, least recently used first
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._load()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load(self):
+        if not os.path.isdir(self.directory):
+            return
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                files.append((stat.st_mtime_ns, entry.name[:-len(".json")], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def get(self, key):
+        """Returns the cached value or None, marking the entry as recently used."""
+        path = self._path(key)
+        with self._lock:
+            if key not in self._entries:
+                self._stats["misses"] += 1
+                return None
+            try:
+                with open(path, "r") as f:
+                    value = json.load(f)
+                os.utime(path)
+            except (OSError, ValueError):
+                self._total_bytes -= self._entries.pop(key)
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def set(self, key, value):
+        payload = json.dumps(value).encode("utf-8")
+        path = self._path(key)
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(payload)
+            self._total_bytes += len(payload)
+            self._evict()
+
+    def delete(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def _remove(self, key):
+        self._total_bytes -= self._entries.pop(key)
+        try:
+            os.remove(self._path(key))
+        except OSError as e:
+            print(f"Disk cache: failed to remove {key}: {e}", file=sys.stderr)
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self._stats["evictions"] += 1
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["entries"] = len(self._entries)
+            snapshot["bytes"] = self._total_bytes
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_rate"] = round(snapshot["hits"] / lookups, 3) if lookups else 0.0
+        return snapshot
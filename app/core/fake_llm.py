@@ -0,0 +1,121 @@
+import os
+import re
+import json
+import asyncio
+import itertools
+from typing import Any, AsyncGenerator
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types as genai_types
+
+# --- Configuration ---
+FAKE_LLM_LATENCY = float(os.environ.get("FAKE_LLM_LATENCY", "0.05"))
+FAKE_LLM_PROMPT_TOKENS = int(os.environ.get("FAKE_LLM_PROMPT_TOKENS", "400"))
+FAKE_LLM_OUTPUT_TOKENS = int(os.environ.get("FAKE_LLM_OUTPUT_TOKENS", "60"))
+
+_document_counter = itertools.count(1)
+
+def _fake_ocr_record(prompt):
+    doc_number = next(_document_counter)
+    return {"doc_data": json.dumps({
+        "document_id": f"fake-{doc_number:06d}",
+        "resident_name": ["John Doe", "Jane Smith", "Ryan Sessions"][doc_number % 3],
+        "incident_type": ["Flood", "Fire", "Storm"][doc_number % 3],
+        "location_context": ["Richmond", "Palisades", "Virginia"][doc_number % 3],
+        "severity": ["High", "Medium", "Low"][doc_number % 3],
+        "date_of_incident": f"2026-09-{doc_number % 28 + 1:02d}",
+        "summary": "Synthetic record produced by the offline fake model.",
+    })}
+
+def _image_path(prompt):
+    match = re.search(r"record at (\S+?),", prompt)
+    return {"image_path": match.group(1) if match else "test_docs/form_1.png"}
+
+def _resident_name(prompt):
+    return {"resident_name": prompt.replace("Verify eligibility for", "").strip()}
+
+# Default scripts for the repo's agents so the whole app can run offline.
+# Each step is either a final text answer or a list of (tool name, args) calls issued
+# in one model turn; args may be a callable that receives the user prompt text.
+DEFAULT_SCRIPTS = {
+    "supervisor_coordinator": [
+        [("ocr_tool", _image_path)],
+        [("investigation_tool", {"resident_name": name}) for name in ("John Doe", "Jane Smith", "Ryan Sessions")],
+        [("rag_tool", {"question": "Which locations were affected?"})],
+        [("mitigation_tool", {})],
+        "Digitized the record, verified eligibility for 3 residents and generated a mitigation report.",
+    ],
+    "ocr_agent": [
+        [("save_digitized_record", _fake_ocr_record)],
+        "Document digitized and saved.",
+    ],
+    "investigation_agent": [
+        [("resident_lookup", _resident_name), ("disaster_zones", {})],
+        "The resident is in a designated disaster zone and meets the eligibility rules on record.",
+    ],
+    "eligibility_explainer": [
+        "The rules on record decide this resident's eligibility; the decision above lists each condition checked.",
+    ],
+    "rag_agent": [
+        [("search_docs", lambda prompt: {"query": prompt})],
+        "Based on the digitized records, the affected areas are listed above.",
+    ],
+    "mitigation_agent": [
+        [("read_disaster_summary", {})],
+        "Floods dominate recent records. Reinforce drainage, pre-position pumps and expand flood alerts.",
+    ],
+}
+
+class FakeLlm(BaseLlm):
+    """
+    Offline stand-in for Gemini. Replays a script of tool calls and text answers
+    with configurable latency and reported token usage, so agents, tool wrappers
+    and the coordinator can be exercised and benchmarked without network access.
+    """
+    model: str = "fake-llm"
+    script: list = []
+    latency: float = FAKE_LLM_LATENCY
+    prompt_tokens: int = FAKE_LLM_PROMPT_TOKENS
+    output_tokens: int = FAKE_LLM_OUTPUT_TOKENS
+
+    async def generate_content_async(self, llm_request, stream: bool = False) -> AsyncGenerator[LlmResponse, Any]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        prompt, step_index = _current_turn(llm_request.contents)
+        step = self.script[step_index] if step_index < len(self.script) else "OK"
+
+        if isinstance(step, str):
+            if stream:
+                # Stream the answer word by word as partial chunks, like Gemini in SSE mode
+                for word in re.findall(r"\S+\s*", step):
+                    yield LlmResponse(content=genai_types.Content(role="model", parts=[
+                        genai_types.Part.from_text(text=word)]), partial=True)
+            parts = [genai_types.Part.from_text(text=step)]
+        else:
+            parts = [
+                genai_types.Part.from_function_call(name=name, args=args(prompt) if callable(args) else dict(args))
+                for name, args in step
+            ]
+        yield LlmResponse(
+            content=genai_types.Content(role="model", parts=parts),
+            usage_metadata=genai_types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=self.prompt_tokens,
+                candidates_token_count=self.output_tokens,
+                total_token_count=self.prompt_tokens + self.output_tokens,
+            ),
+        )
+
+def _current_turn(contents):
+    """Returns (latest user prompt text, number of model turns since that prompt)."""
+    model_turns = 0
+    for content in reversed(contents or []):
+        parts = content.parts or []
+        if content.role == "model":
+            model_turns += 1
+        elif any(part.text for part in parts) and not any(part.function_response for part in parts):
+            return "".join(part.text for part in parts if part.text), model_turns
+    return "", model_turns
+
+def get_fake_model(agent_name, script=None, **options):
+    """Builds a FakeLlm for an agent, using its default script unless one is given."""
+    return FakeLlm(script=script if script is not None else DEFAULT_SCRIPTS.get(agent_name, []), **options)
@@ -1,12 +1,17 @@
 import os
 import uuid
 import sys
-import subprocess
-from google.adk import Agent, Runner
-from google.adk.sessions.in_memory_session_service import InMemorySessionService
-from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
+import asyncio
+import inspect
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from google.adk import Agent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.genai import types as genai_types
+from app.core.runner_pool import get_runner_pool
+from app.core.mcp_client import close_mcp_client_pool
+from app.core.secrets_provider import get_secret
+from app.core.metrics import AgentRunMetrics, instrument_tool, start_span
 
 # Load .env manually to avoid library conflicts with ADK gRPC
 def load_env_simple(path=".env"):
@@ -25,98 +30,235 @@ load_env_simple()
 load_env_simple("../../.env") 
 os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "0"
 
-# Global cache for secrets to avoid repeated gcloud calls
-_SECRET_CACHE = {}
-
-def get_secret_gcloud(secret_id):
-    """
-    Fetch secret using gcloud CLI and cache results.
-    """
-    if secret_id in _SECRET_CACHE:
-        return _SECRET_CACHE[secret_id]
-
-    target_name = os.environ.get(secret_id, secret_id)
-    project_id = os.environ.get("GOOGLE_CLOUD_PROJECT")
-    
-    # We assume it's just a secret name if not a full path
-    secret_name = target_name.split('/')[-1] if '/' in target_name else target_name
-    
-    try:
-        cmd = ["gcloud", "secrets", "versions", "access", "latest", f"--secret={secret_name}", f"--project={project_id}"]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        secret_val = result.stdout.strip()
-        _SECRET_CACHE[secret_id] = secret_val
-        return secret_val
-    except Exception as e:
-        print(f"Error fetching secret via gcloud: {e}", file=sys.stderr)
-        return None
-
 # --- Configuration ---
 DEFAULT_MODEL = "gemini-2.5-flash"
 
+def use_fake_model():
+    """ADK_MODEL_BACKEND=fake swaps Gemini for the scripted offline model (tests/benchmarks)."""
+    return os.environ.get("ADK_MODEL_BACKEND", "gemini").lower() == "fake"
+
 def create_adk_agent(name, description, instructions, tools=None):
     """
     Helper to create a google-adk Agent with standardized config.
     """
-    api_key = get_secret_gcloud("SECRET_GEMINI")
-    if not api_key:
-        raise ValueError("Failed to retrieve Gemini API Key via gcloud.")
-    
-    os.environ["GOOGLE_API_KEY"] = api_key
+    if use_fake_model():
+        from app.core.fake_llm import get_fake_model
+        model = get_fake_model(name)
+    else:
+        api_key = get_secret("SECRET_GEMINI")
+        if not api_key:
+            raise ValueError("Failed to retrieve Gemini API Key from the secrets provider.")
+
+        if os.environ.get("GOOGLE_API_KEY") != api_key:
+            os.environ["GOOGLE_API_KEY"] = api_key
+        model = DEFAULT_MODEL
     
     return Agent(
-        model=DEFAULT_MODEL,
+        model=model,
         name=name,
         description=description,
         instruction=instructions,
-        tools=tools or []
+        # Plain function tools are wrapped to record per-agent call counts, errors and latency
+        tools=[instrument_tool(tool, name) if inspect.isfunction(tool) else tool for tool in tools or []]
     )
 
-def run_adk_agent(agent, prompt, user_id="user_123", session_id=None):
+def run_sync(coro):
     """
-    Helper to run an ADK agent using the Runner directly with InMemory services.
-    Ensures auto_create_session=True and wraps prompt in Content object.
+    Runs a coroutine to completion from synchronous code.
+    If the caller is already inside an event loop (e.g. a sync tool invoked by ADK),
+    the coroutine runs on a helper thread with its own loop instead.
     """
-    if not session_id:
-        session_id = str(uuid.uuid4())
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_closing_mcp_sessions(coro))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, _closing_mcp_sessions(coro)).result()
 
-    runner = Runner(
-        agent=agent,
-        app_name="sled_disaster_response",
-        session_service=InMemorySessionService(),
-        memory_service=InMemoryMemoryService(),
-        artifact_service=InMemoryArtifactService(),
-        auto_create_session=True
-    )
-    
-    # Handle multimodal or simple text prompt
+async def _closing_mcp_sessions(coro):
+    """Runs coro, then closes the MCP sessions it opened: they are bound to this loop, which is about to end."""
+    try:
+        return await coro
+    finally:
+        await close_mcp_client_pool()
+
+def build_content(prompt):
+    """Wraps a text prompt, list of Parts or Content object into a user Content."""
     if isinstance(prompt, str):
-        content = genai_types.Content(
+        return genai_types.Content(
             role="user",
             parts=[genai_types.Part.from_text(text=prompt)]
         )
-    else:
-        # Assume it's already a Content object or list of Parts
-        content = prompt if hasattr(prompt, "role") else genai_types.Content(role="user", parts=prompt)
-    
-    response_text = ""
+    # Assume it's already a Content object or list of Parts
+    return prompt if hasattr(prompt, "role") else genai_types.Content(role="user", parts=prompt)
+
+def event_text(event):
+    """Extracts text from the various ADK event structures."""
+    text = ""
+    if hasattr(event, "content"):
+        if hasattr(event.content, "text") and event.content.text:
+            text += event.content.text
+        elif hasattr(event.content, "parts") and event.content.parts:
+            for part in event.content.parts:
+                if hasattr(part, "text") and part.text:
+                    text += part.text
+    elif hasattr(event, "text") and event.text:
+        text += event.text
+    elif hasattr(event, "message"):
+        if hasattr(event.message, "content"):
+            if hasattr(event.message.content, "text"):
+                text += event.message.content.text
+    return text
+
+# --- Event streaming ---
+# Set by stream_agent_events for the duration of a streamed run. Context variables are
+# inherited by the tasks ADK and asyncio.gather create, so sub-agents started from a
+# coordinator's tools report into the same stream.
+_event_sink = contextvars.ContextVar("adk_event_sink", default=None)
+
+def emit_event(event_type, **fields):
+    """Sends an event to the active stream, if any."""
+    sink = _event_sink.get()
+    if sink is not None:
+        sink({"type": event_type, **fields})
+
+def _loop_sink(loop, callback):
+    """Event sink that hands events to callback on loop, also when emitted from helper threads."""
+    def sink(event):
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            callback(event)
+        else:
+            loop.call_soon_threadsafe(callback, event)
+    return sink
+
+async def forward_agent_events(coro, callback):
+    """
+    Runs a coroutine with its agent events (as in stream_agent_events) passed to
+    callback on this loop as they happen, and returns its result.
+    """
+    token = _event_sink.set(_loop_sink(asyncio.get_running_loop(), callback))
     try:
-        for event in runner.run(user_id=user_id, session_id=session_id, new_message=content):
-            # Extract text from various event structures
-            if hasattr(event, "content"):
-                if hasattr(event.content, "text") and event.content.text:
-                    response_text += event.content.text
-                elif hasattr(event.content, "parts"):
-                    for part in event.content.parts:
-                        if hasattr(part, "text") and part.text:
-                            response_text += part.text
-            elif hasattr(event, "text") and event.text:
-                response_text += event.text
-            elif hasattr(event, "message"):
-                 if hasattr(event.message, "content"):
-                     if hasattr(event.message.content, "text"):
-                         response_text += event.message.content.text
-    except Exception as e:
-        print(f"ADK Execution Error: {e}", file=sys.stderr)
-            
+        return await coro
+    finally:
+        _event_sink.reset(token)
+
+def stream_event_fields(event):
+    """Translates one ADK event into stream events: (type, fields) pairs."""
+    agent = getattr(event, "author", None)
+    for call in event.get_function_calls():
+        yield "tool_start", {"agent": agent, "tool": call.name, "args": call.args or {}}
+    for response in event.get_function_responses():
+        yield "tool_end", {"agent": agent, "tool": response.name}
+
+async def run_adk_agent_async(agent, prompt, user_id="user_123", session_id=None, raise_errors=False, on_event=None):
+    """
+    Runs an ADK agent on the runner's async event stream using a pooled Runner.
+    Passing a session_id opts into session reuse: the session is kept alive (subject
+    to the pool's LRU/TTL eviction) so later calls continue the same conversation.
+    Without a session_id an ephemeral session is used and dropped after the run.
+    Errors are logged and swallowed unless raise_errors is set.
+    on_event, if given, is called with every raw ADK event (e.g. to inspect tool calls).
+    Inside stream_agent_events the model output is streamed token by token and
+    agent/tool/text events are emitted as they happen.
+    """
+    keep_session = bool(session_id)
+    if not session_id:
+        session_id = str(uuid.uuid4())
+
+    pool = get_runner_pool()
+    runner = pool.get_runner(agent)
+    await pool.acquire_session(user_id, session_id, keep=keep_session)
+
+    streaming = _event_sink.get() is not None
+    run_config = RunConfig(streaming_mode=StreamingMode.SSE) if streaming else None
+    content = build_content(prompt)
+    response_text = ""
+    streamed_partial = False
+    run_metrics = AgentRunMetrics(agent.name)
+    error = None
+    emit_event("agent_start", agent=agent.name)
+    with start_span(f"agent {agent.name}", agent=agent.name):
+        try:
+            async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=content,
+                                                run_config=run_config):
+                if on_event:
+                    on_event(event)
+                run_metrics.record_event(event)
+                text = event_text(event)
+                if getattr(event, "partial", False):
+                    # Streamed chunk; the complete text follows in a final, non-partial event
+                    if text:
+                        emit_event("text", agent=event.author, text=text)
+                        streamed_partial = True
+                    continue
+                if text and not streamed_partial:
+                    emit_event("text", agent=event.author, text=text)
+                streamed_partial = False
+                for event_type, fields in (stream_event_fields(event) if streaming else ()):
+                    emit_event(event_type, **fields)
+                response_text += text
+        except Exception as e:
+            error = e
+            emit_event("error", agent=agent.name, message=str(e))
+            if raise_errors:
+                raise
+            print(f"ADK Execution Error: {e}", file=sys.stderr)
+        finally:
+            run_metrics.finish(error)
+            await pool.release_session(user_id, session_id, keep=keep_session)
+    emit_event("agent_end", agent=agent.name)
+
     return response_text
+
+async def stream_agent_events(coro, heartbeat=None):
+    """
+    Runs a coroutine that drives one or more agents and yields their events as they
+    happen: agent_start/agent_end, text (model tokens), tool_start/tool_end and error.
+    The last event is {"type": "result", "output": ...}, or "error" if the coroutine raised.
+    With heartbeat set, {"type": "heartbeat"} is yielded after that many idle seconds.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    done = object()
+    sink = _loop_sink(loop, queue.put_nowait)
+
+    async def run():
+        try:
+            output = await coro
+            queue.put_nowait({"type": "result", "output": output})
+        except Exception as e:
+            queue.put_nowait({"type": "error", "message": str(e)})
+        finally:
+            # Scheduled so events still in flight from helper threads are queued first
+            loop.call_soon(queue.put_nowait, done)
+
+    context = contextvars.copy_context()
+    context.run(_event_sink.set, sink)
+    task = asyncio.create_task(run(), context=context)
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield {"type": "heartbeat"}
+                continue
+            if event is done:
+                break
+            yield event
+    finally:
+        if not task.done():
+            task.cancel()
+
+def stream_adk_agent(agent, prompt, user_id="user_123", session_id=None):
+    """Streaming variant of run_adk_agent_async: an async iterator of agent events."""
+    return stream_agent_events(run_adk_agent_async(agent, prompt, user_id=user_id, session_id=session_id))
+
+def run_adk_agent(agent, prompt, user_id="user_123", session_id=None):
+    """
+    Synchronous wrapper over run_adk_agent_async.
+    """
+    return run_sync(run_adk_agent_async(agent, prompt, user_id=user_id, session_id=session_id))
@@ -0,0 +1,323 @@
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import threading
+import contextvars
+
+# --- Configuration ---
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+JOB_QUEUE_SIZE = int(os.environ.get("JOB_QUEUE_SIZE", "20"))
+JOB_STORE = os.environ.get("JOB_STORE", "memory")
+JOB_DB_PATH = os.environ.get("JOB_DB_PATH", "output/.jobs.sqlite3")
+# Finished jobs older than this are dropped from the store
+JOB_RETENTION_SECONDS = float(os.environ.get("JOB_RETENTION_SECONDS", str(24 * 3600)))
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+# Id of the job the current task is running (set by JobManager for its runner)
+current_job_id = contextvars.ContextVar("current_job_id", default=None)
+_END = object()
+
+class QueueFullError(Exception):
+    """Raised by JobManager.submit when the queue is at capacity."""
+
+def final_event(job):
+    """The closing event of a job's stream: its result, or why it did not produce one."""
+    if job is None:
+        return {"type": "error", "message": "Job not found."}
+    if job["status"] == SUCCEEDED:
+        return {"type": "result", "output": job["result"]}
+    if job["status"] == CANCELLED:
+        return {"type": "error", "message": "Job was cancelled."}
+    return {"type": "error", "message": job["error"] or "Job failed."}
+
+def new_job(params):
+    return {
+        "job_id": uuid.uuid4().hex,
+        "status": QUEUED,
+        "params": params,
+        "result": None,
+        "error": None,
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+    }
+
+class InMemoryJobStore:
+    """Job records in a dict; lost on restart."""
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, job):
+        with self._lock:
+            self._jobs[job["job_id"]] = dict(job)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def fail_unfinished(self, error):
+        with self._lock:
+            for job in self._jobs.values():
+                if job["status"] not in FINISHED_STATES:
+                    job.update(status=FAILED, error=error, finished_at=time.time())
+
+    def prune(self, finished_before):
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job["status"] in FINISHED_STATES and job["finished_at"] < finished_before]
+            for job_id in expired:
+                del self._jobs[job_id]
+            return len(expired)
+
+class SQLiteJobStore:
+    """Job records in a SQLite table, so status and results survive restarts."""
+    COLUMNS = ("job_id", "status", "params", "result", "error", "created_at", "started_at", "finished_at")
+    JSON_COLUMNS = ("params", "result")
+
+    def __init__(self, path=JOB_DB_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, status TEXT NOT NULL, params TEXT, "
+            "result TEXT, error TEXT, created_at REAL, started_at REAL, finished_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status_finished ON jobs (status, finished_at)")
+        self._lock = threading.Lock()
+
+    def _encode(self, fields):
+        return {k: json.dumps(v) if k in self.JSON_COLUMNS and v is not None else v for k, v in fields.items()}
+
+    def create(self, job):
+        row = self._encode(job)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO jobs ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                [row[c] for c in self.COLUMNS],
+            )
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(self.COLUMNS, row))
+        for column in self.JSON_COLUMNS:
+            if job[column] is not None:
+                job[column] = json.loads(job[column])
+        return job
+
+    def update(self, job_id, **fields):
+        fields = {k: v for k, v in self._encode(fields).items() if k in self.COLUMNS and k != "job_id"}
+        if not fields:
+            return
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET {', '.join(f'{k} = ?' for k in fields)} WHERE job_id = ?",
+                [*fields.values(), job_id],
+            )
+
+    def fail_unfinished(self, error):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE status IN (?, ?)",
+                (FAILED, error, time.time(), QUEUED, RUNNING),
+            )
+
+    def prune(self, finished_before):
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?, ?) AND finished_at < ?", (*FINISHED_STATES, finished_before)
+            )
+            return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+JOB_STORES = {
+    "memory": InMemoryJobStore,
+    "sqlite": SQLiteJobStore,
+}
+
+class JobManager:
+    """
+    Runs submitted jobs on a fixed number of asyncio workers.
+    Jobs wait in a bounded queue; submit raises QueueFullError once it is full so
+    callers can push back (HTTP 429) instead of piling up work.
+    `runner` is an async callable taking the job params and returning a JSON-serializable result.
+    While a job is queued or running, events published for it (e.g. agent activity)
+    are kept and streamed to subscribers, followed by the job's result or error.
+    """
+    def __init__(self, runner, store=None, workers=JOB_WORKERS, queue_size=JOB_QUEUE_SIZE,
+                 retention=JOB_RETENTION_SECONDS):
+        self.runner = runner
+        self.store = store if store is not None else InMemoryJobStore()
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.retention = retention
+        self._queue = None
+        self._worker_tasks = []
+        self._running = {}  # job_id -> asyncio.Task running the job
+        self._history = {}      # job_id -> events published so far (unfinished jobs only)
+        self._subscribers = {}  # job_id -> {asyncio.Queue}
+
+    async def start(self):
+        """Starts the workers on the running event loop (call once, e.g. from the ASGI lifespan)."""
+        # Jobs left queued/running by a previous process will never finish
+        self.store.fail_unfinished("Interrupted by a server restart.")
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._worker_tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self):
+        for task in [*self._worker_tasks, *self._running.values()]:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self.store.fail_unfinished("Server shut down before the job finished.")
+        for job_id in list(self._history):
+            self._finish(job_id)
+
+    def submit(self, params):
+        """Queues a job and returns its record. Raises QueueFullError when the queue is at capacity."""
+        if self._queue is None:
+            raise RuntimeError("JobManager.start() has not been called.")
+        if self._queue.full():
+            raise QueueFullError(f"Job queue is full ({self.queue_size} waiting).")
+        if self.retention:
+            self.store.prune(time.time() - self.retention)
+        job = new_job(params)
+        self.store.create(job)
+        self._history[job["job_id"]] = []
+        self._queue.put_nowait(job["job_id"])
+        return job
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def cancel(self, job_id):
+        """Cancels a queued or running job. Returns the updated record, or None if the job is unknown."""
+        job = self.store.get(job_id)
+        if job is None or job["status"] in FINISHED_STATES:
+            return job
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        # Queued jobs are skipped by the worker that dequeues them
+        self.store.update(job_id, status=CANCELLED, finished_at=time.time())
+        if task is None:
+            self._finish(job_id)
+        return self.store.get(job_id)
+
+    def publish(self, job_id, event):
+        """Records an event for an unfinished job and sends it to its subscribers."""
+        history = self._history.get(job_id)
+        if history is None:
+            return
+        history.append(event)
+        for queue in self._subscribers.get(job_id, ()):
+            queue.put_nowait(event)
+
+    async def events(self, job_id, heartbeat=None):
+        """
+        Streams a job's events: those published so far, then live ones, then a final
+        result/error event. A finished job yields only the final event. With heartbeat
+        set, {"type": "heartbeat"} is yielded after that many idle seconds.
+        """
+        if job_id not in self._history:
+            yield final_event(self.store.get(job_id))
+            return
+        queue = asyncio.Queue()
+        for event in self._history[job_id]:
+            queue.put_nowait(event)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield {"type": "heartbeat"}
+                    continue
+                if event is _END:
+                    return
+                yield event
+        finally:
+            subscribers = self._subscribers.get(job_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[job_id]
+
+    def _finish(self, job_id):
+        """Ends the job's event stream with its final event."""
+        self._history.pop(job_id, None)
+        subscribers = self._subscribers.pop(job_id, ())
+        if subscribers:
+            event = final_event(self.store.get(job_id))
+            for queue in subscribers:
+                queue.put_nowait(event)
+                queue.put_nowait(_END)
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "running": len(self._running),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "queue_size": self.queue_size,
+        }
+
+    async def _worker(self, worker_id):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                print(f"Job worker {worker_id}: job {job_id} crashed: {e}", file=sys.stderr)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id):
+        job = self.store.get(job_id)
+        if job is None or job["status"] != QUEUED:
+            self._finish(job_id)
+            return
+        self.store.update(job_id, status=RUNNING, started_at=time.time())
+        current_job_id.set(job_id)  # Copied into the runner's task context
+        task = asyncio.create_task(self.runner(job["params"]))
+        self._running[job_id] = task
+        try:
+            result = await task
+            if self.store.get(job_id)["status"] == RUNNING:  # Not cancelled while finishing
+                self.store.update(job_id, status=SUCCEEDED, result=result, finished_at=time.time())
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise  # The worker itself is being stopped
+            self.store.update(job_id, status=CANCELLED, finished_at=time.time())
+        except Exception as e:
+            self.store.update(job_id, status=FAILED, error=str(e), finished_at=time.time())
+        finally:
+            self._running.pop(job_id, None)
+            self._finish(job_id)
+
+def create_job_store(kind=None):
+    kind = kind or JOB_STORE
+    if kind not in JOB_STORES:
+        raise ValueError(f"Unknown JOB_STORE '{kind}'. Expected one of {sorted(JOB_STORES)}.")
+    return JOB_STORES[kind]()
@@ -0,0 +1,102 @@
+import os
+import sys
+import json
+import asyncio
+import inspect
+import weakref
+
+# --- Configuration ---
+# Streamable HTTP endpoint of a separately deployed MCP server (e.g. http://127.0.0.1:8765/mcp).
+# Unset: tools are called in-process.
+MCP_SERVER_URL = os.environ.get("MCP_SERVER_URL", "")
+# Open MCP sessions kept per event loop; also the limit on concurrent calls through them
+MCP_CLIENT_POOL_SIZE = int(os.environ.get("MCP_CLIENT_POOL_SIZE", "8"))
+MCP_CLIENT_TIMEOUT = float(os.environ.get("MCP_CLIENT_TIMEOUT", "30"))
+
+def decode_tool_result(result):
+    """Python value of a CallToolResult: structured output when present, else the (JSON) text content."""
+    if result.data is not None:
+        return result.data
+    structured = result.structured_content
+    if isinstance(structured, dict) and set(structured) == {"result"}:
+        return structured["result"]
+    if structured is not None:
+        return structured
+    text = "".join(getattr(part, "text", "") for part in result.content or [])
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+class MCPClientPool:
+    """
+    Keep-alive MCP client sessions to one streamable HTTP server. Up to `size`
+    sessions are opened on demand and reused across calls (one HTTP connection
+    each), so a tool call costs one request instead of a connect + initialize
+    handshake. A session that fails mid-call is closed and replaced.
+    Sessions are bound to the event loop that opened them.
+    """
+    def __init__(self, url, size=MCP_CLIENT_POOL_SIZE, timeout=MCP_CLIENT_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self._idle = []
+        self._semaphore = asyncio.Semaphore(max(1, size))
+
+    async def _connect(self):
+        from fastmcp import Client
+        from fastmcp.client.transports import StreamableHttpTransport
+        client = Client(StreamableHttpTransport(self.url), timeout=self.timeout)
+        await client.__aenter__()
+        return client
+
+    async def _discard(self, client):
+        try:
+            await client.__aexit__(None, None, None)
+        except Exception as e:
+            print(f"MCP client: error closing session: {e}", file=sys.stderr)
+
+    async def call_tool(self, name, arguments):
+        async with self._semaphore:
+            client = self._idle.pop() if self._idle else await self._connect()
+            try:
+                result = await client.call_tool(name, arguments)
+            except Exception as e:
+                from fastmcp.exceptions import ToolError
+                if isinstance(e, ToolError):
+                    self._idle.append(client)  # The tool failed; the session is fine
+                else:
+                    await self._discard(client)
+                raise
+            self._idle.append(client)
+        return decode_tool_result(result)
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for client in idle:
+            await self._discard(client)
+
+# One pool per event loop (sessions cannot move between loops)
+_pools = weakref.WeakKeyDictionary()
+
+def get_mcp_client_pool(url=None):
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = MCPClientPool(url or MCP_SERVER_URL)
+    return pool
+
+async def close_mcp_client_pool():
+    """Closes the running loop's pool, if it opened one. Call before a short-lived loop ends."""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close()
+
+async def call_mcp_tool(tool, **arguments):
+    """
+    Calls an @mcp.tool() through the pooled MCP client when MCP_SERVER_URL is set,
+    else the function behind it in-process (awaiting it if it is async).
+    """
+    if MCP_SERVER_URL:
+        return await get_mcp_client_pool().call_tool(getattr(tool, "name", None) or tool.__name__, arguments)
+    result = getattr(tool, "fn", tool)(**arguments)
+    return await result if inspect.isawaitable(result) else result
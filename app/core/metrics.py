@@ -0,0 +1,237 @@
+import os
+import sys
+import time
+import bisect
+import inspect
+import functools
+import threading
+import contextlib
+
+# --- Configuration ---
+# Emit OpenTelemetry spans for agent runs and tool calls (needs opentelemetry-api; exporters are
+# configured by the deployment, e.g. through opentelemetry-instrument)
+OTEL_SPANS_ENABLED = os.environ.get("OTEL_SPANS_ENABLED", "0") == "1"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+class Counter:
+    """Monotonic counter with a fixed set of label names."""
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        return self._values.get(label_values, 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {value}"
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics) with a fixed set of label names."""
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *label_values):
+        series = self._series.get(label_values)
+        return series[2] if series else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((k, ([*v[0]], v[1], v[2])) for k, v in self._series.items())
+        for label_values, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), bucket_counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket{_format_labels(self.labels, label_values, [('le', bound)])} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, label_values)} {total}"
+            yield f"{self.name}_count{_format_labels(self.labels, label_values)} {count}"
+
+class Gauge:
+    """Value read from a callback at scrape time; the callback returns {label values tuple: value}."""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, callback, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.callback = callback
+
+    def samples(self):
+        try:
+            values = self.callback()
+        except Exception as e:
+            print(f"Metrics: gauge {self.name} failed: {e}", file=sys.stderr)
+            return
+        for label_values, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {value}"
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            # Re-registering a name returns the existing metric (modules may be reloaded)
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text, labels=()):
+        return self.register(Counter(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def gauge(self, name, help_text, callback, labels=()):
+        with self._lock:
+            # Gauges are replaced so the callback always points at the live object
+            self._metrics[name] = Gauge(name, help_text, callback, labels)
+            return self._metrics[name]
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+AGENT_RUNS = REGISTRY.counter("agent_runs_total", "Agent runs started.", ["agent"])
+AGENT_ERRORS = REGISTRY.counter("agent_errors_total", "Agent runs that raised an error.", ["agent"])
+AGENT_RUN_SECONDS = REGISTRY.histogram("agent_run_seconds", "Wall time of an agent run, including sub-agents.", ["agent"])
+AGENT_MODEL_CALLS = REGISTRY.counter("agent_model_calls_total", "Model round-trips (complete model responses).", ["agent"])
+AGENT_TOKENS = REGISTRY.counter("agent_tokens_total", "Tokens reported by the model's usage metadata.", ["agent", "direction"])
+TOOL_CALLS = REGISTRY.counter("tool_calls_total", "Tool invocations.", ["agent", "tool"])
+TOOL_ERRORS = REGISTRY.counter("tool_errors_total", "Tool invocations that raised an error.", ["agent", "tool"])
+TOOL_CALL_SECONDS = REGISTRY.histogram("tool_call_seconds", "Wall time of a tool invocation.", ["agent", "tool"])
+SECRET_FETCHES = REGISTRY.counter("secret_fetches_total", "Secret backend fetches (cache misses and refreshes).", ["secret", "outcome"])
+SECRET_FETCH_SECONDS = REGISTRY.histogram("secret_fetch_seconds", "Wall time of a secret backend fetch.", ["secret"])
+
+_tracer = None
+
+def get_tracer():
+    """OpenTelemetry tracer when OTEL_SPANS_ENABLED=1 and opentelemetry-api is installed, else None."""
+    global _tracer
+    if _tracer is None and OTEL_SPANS_ENABLED:
+        try:
+            from opentelemetry import trace
+            _tracer = trace.get_tracer("sled_disaster_response")
+        except ImportError:
+            print("Metrics: OTEL_SPANS_ENABLED is set but opentelemetry-api is not installed.", file=sys.stderr)
+            _tracer = False
+    return _tracer or None
+
+def start_span(name, **attributes):
+    """Context manager for an OpenTelemetry span; a no-op when tracing is off."""
+    tracer = get_tracer()
+    if tracer is None:
+        return contextlib.nullcontext()
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+class AgentRunMetrics:
+    """Accumulates one agent run's model round-trips and tokens from its ADK events."""
+    def __init__(self, agent_name):
+        self.agent = agent_name
+        self.started = time.perf_counter()
+        AGENT_RUNS.inc(agent_name)
+
+    def record_event(self, event):
+        if getattr(event, "partial", False) or event.author != self.agent:
+            return
+        content = getattr(event, "content", None)
+        if content is None or content.role != "model":
+            return
+        AGENT_MODEL_CALLS.inc(self.agent)
+        usage = getattr(event, "usage_metadata", None)
+        if usage is not None:
+            if usage.prompt_token_count:
+                AGENT_TOKENS.inc(self.agent, "input", amount=usage.prompt_token_count)
+            if usage.candidates_token_count:
+                AGENT_TOKENS.inc(self.agent, "output", amount=usage.candidates_token_count)
+
+    def finish(self, error=None):
+        AGENT_RUN_SECONDS.observe(time.perf_counter() - self.started, self.agent)
+        if error is not None:
+            AGENT_ERRORS.inc(self.agent)
+
+def instrument_tool(func, agent_name):
+    """
+    Wraps a tool function to record call counts, errors and wall time per (agent, tool).
+    functools.wraps keeps the name, docstring and signature ADK builds the declaration
+    from, and coroutine functions stay coroutine functions.
+    """
+    tool_name = func.__name__
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            TOOL_CALLS.inc(agent_name, tool_name)
+            try:
+                with start_span(f"tool {tool_name}", agent=agent_name, tool=tool_name):
+                    return await func(*args, **kwargs)
+            except Exception:
+                TOOL_ERRORS.inc(agent_name, tool_name)
+                raise
+            finally:
+                TOOL_CALL_SECONDS.observe(time.perf_counter() - started, agent_name, tool_name)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        TOOL_CALLS.inc(agent_name, tool_name)
+        try:
+            with start_span(f"tool {tool_name}", agent=agent_name, tool=tool_name):
+                return func(*args, **kwargs)
+        except Exception:
+            TOOL_ERRORS.inc(agent_name, tool_name)
+            raise
+        finally:
+            TOOL_CALL_SECONDS.observe(time.perf_counter() - started, agent_name, tool_name)
+    return wrapper
+
+def render_metrics():
+    return REGISTRY.render()
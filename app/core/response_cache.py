@@ -0,0 +1,137 @@
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import threading
+import contextlib
+import contextvars
+from collections import OrderedDict
+from app.core.metrics import REGISTRY
+
+# --- Configuration ---
+RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED", "1") == "1"
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", "600"))
+
+RESPONSE_CACHE_LOOKUPS = REGISTRY.counter(
+    "response_cache_lookups_total", "Prompt-level response cache lookups.", ["agent", "result"]
+)
+
+# Set for the duration of a request that asked to skip the cache; inherited by sub-agent runs
+_bypass = contextvars.ContextVar("response_cache_bypass", default=False)
+
+@contextlib.contextmanager
+def bypass_response_cache(enabled=True):
+    token = _bypass.set(bool(enabled))
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+def normalize_prompt(prompt):
+    """Case- and whitespace-insensitive form of a prompt."""
+    return re.sub(r"\s+", " ", prompt).strip().casefold()
+
+def agent_fingerprint(agent):
+    """Changes when the agent's name, model or instruction changes."""
+    model = getattr(agent.model, "model", agent.model)
+    instruction_hash = hashlib.sha256(str(agent.instruction).encode("utf-8")).hexdigest()
+    return f"{agent.name}:{model}:{instruction_hash}"
+
+def response_cache_key(agent, prompt, corpus_version):
+    payload = json.dumps([agent_fingerprint(agent), normalize_prompt(prompt), corpus_version])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """In-memory LRU of agent answers with a per-entry TTL."""
+    def __init__(self, max_entries=RESPONSE_CACHE_MAX_ENTRIES, ttl=RESPONSE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, expires_at), least recently used first
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats, entries=len(self._entries))
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_rate"] = round(snapshot["hits"] / lookups, 3) if lookups else 0.0
+        return snapshot
+
+# Shared cache, created lazily on first use
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache():
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
+
+async def run_cached_agent(agent, prompt, use_cache=True, semantic_cache=None):
+    """
+    run_adk_agent_async behind the response cache. Answers are keyed on the agent
+    (name, model, instruction), the normalized prompt and the corpus version, so any
+    newly saved record invalidates them. Failed or empty runs are not cached.
+    With a semantic_cache, exact misses also reuse answers to near-duplicate prompts.
+    """
+    from app.core.genai_adk_base import run_adk_agent_async, emit_event
+    from app.tools.ingestion_log import get_corpus_version
+
+    if not (use_cache and RESPONSE_CACHE_ENABLED) or _bypass.get():
+        return await run_adk_agent_async(agent, prompt)
+
+    cache = get_response_cache()
+    corpus_version = get_corpus_version()
+    key = response_cache_key(agent, prompt, corpus_version)
+    semantic_version = f"{agent_fingerprint(agent)}@{corpus_version}"
+    cached = cache.get(key)
+    if cached is None and semantic_cache is not None:
+        match = semantic_cache.lookup(prompt, semantic_version)
+        cached = match[0] if match else None
+    if cached is not None:
+        RESPONSE_CACHE_LOOKUPS.inc(agent.name, "hit")
+        emit_event("text", agent=agent.name, text=cached, cached=True)
+        return cached
+    RESPONSE_CACHE_LOOKUPS.inc(agent.name, "miss")
+
+    try:
+        response = await run_adk_agent_async(agent, prompt, raise_errors=True)
+    except Exception as e:
+        print(f"ADK Execution Error: {e}", file=sys.stderr)
+        return ""
+    if response:
+        cache.set(key, response)
+        if semantic_cache is not None:
+            semantic_cache.store(prompt, semantic_version, response)
+    return response
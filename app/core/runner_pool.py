@@ -0,0 +1,172 @@
+import os
+import sys
+import time
+import threading
+from collections import OrderedDict
+from google.adk import Runner
+from google.adk.sessions.in_memory_session_service import InMemorySessionService
+from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
+from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
+
+APP_NAME = "sled_disaster_response"
+
+# --- Configuration ---
+MAX_RUNNERS = int(os.environ.get("RUNNER_POOL_MAX_RUNNERS", "16"))
+MAX_SESSIONS = int(os.environ.get("RUNNER_POOL_MAX_SESSIONS", "256"))
+SESSION_TTL_SECONDS = float(os.environ.get("RUNNER_POOL_SESSION_TTL", "1800"))
+
+class RunnerPool:
+    """
+    Long-lived registry of ADK Runners keyed by agent name.
+    All runners share one set of InMemory services. Kept sessions are tracked so the
+    shared session service stays bounded (LRU + TTL eviction of idle sessions);
+    sessions are reference counted while runs use them and never evicted in flight.
+    """
+    def __init__(self, max_runners=MAX_RUNNERS, max_sessions=MAX_SESSIONS,
+                 session_ttl=SESSION_TTL_SECONDS, app_name=APP_NAME):
+        self.app_name = app_name
+        self.max_runners = max_runners
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+
+        self.session_service = InMemorySessionService()
+        self.memory_service = InMemoryMemoryService()
+        self.artifact_service = InMemoryArtifactService()
+
+        self._runners = OrderedDict()   # agent name -> Runner
+        self._sessions = OrderedDict()  # kept (user_id, session_id) -> last used timestamp
+        self._in_use = {}               # (user_id, session_id) -> runs currently using it
+        self._lock = threading.Lock()
+        self._stats = {
+            "runner_hits": 0,
+            "runner_misses": 0,
+            "runners_evicted": 0,
+            "session_hits": 0,
+            "session_misses": 0,
+            "sessions_evicted": 0,
+        }
+
+    def get_runner(self, agent):
+        """
+        Returns the cached Runner for this agent, building one on first use.
+        A different agent object registered under the same name replaces the old runner.
+        """
+        with self._lock:
+            runner = self._runners.get(agent.name)
+            if runner is not None and runner.agent is agent:
+                self._runners.move_to_end(agent.name)
+                self._stats["runner_hits"] += 1
+                return runner
+
+            self._stats["runner_misses"] += 1
+            runner = Runner(
+                agent=agent,
+                app_name=self.app_name,
+                session_service=self.session_service,
+                memory_service=self.memory_service,
+                artifact_service=self.artifact_service,
+                auto_create_session=True
+            )
+            self._runners[agent.name] = runner
+            self._runners.move_to_end(agent.name)
+            while len(self._runners) > self.max_runners:
+                self._runners.popitem(last=False)
+                self._stats["runners_evicted"] += 1
+            return runner
+
+    async def acquire_session(self, user_id, session_id, keep=False):
+        """
+        Marks a session as in use and evicts expired or least recently used idle
+        kept sessions. Sessions in use are never evicted, and ephemeral sessions
+        (keep=False) do not count toward max_sessions.
+        Returns True when the session was already live (i.e. it is being reused).
+        """
+        reused, evicted = self._checkout(user_id, session_id, keep)
+        for key in evicted:
+            await self._delete_session(*key)
+        return reused
+
+    async def release_session(self, user_id, session_id, keep=False):
+        """
+        Called after a run. Ephemeral sessions are deleted once no run is using
+        them; kept sessions get their last-used timestamp refreshed.
+        """
+        for key in self._checkin(user_id, session_id, keep):
+            await self._delete_session(*key)
+
+    def _checkout(self, user_id, session_id, keep):
+        key = (user_id, session_id)
+        now = time.monotonic()
+        with self._lock:
+            reused = key in self._sessions or key in self._in_use
+            self._stats["session_hits" if reused else "session_misses"] += 1
+            self._in_use[key] = self._in_use.get(key, 0) + 1
+            if keep:
+                self._sessions[key] = now
+                self._sessions.move_to_end(key)
+            evicted = self._evict_idle(now)
+        return reused, evicted
+
+    def _checkin(self, user_id, session_id, keep):
+        """Returns the sessions to delete from the session service."""
+        key = (user_id, session_id)
+        with self._lock:
+            remaining = self._in_use.get(key, 0) - 1
+            if remaining > 0:
+                self._in_use[key] = remaining
+            else:
+                self._in_use.pop(key, None)
+            if keep:
+                self._sessions[key] = time.monotonic()
+                self._sessions.move_to_end(key)
+            deleted = [key] if remaining <= 0 and key not in self._sessions else []
+            # Sessions that were in use when the cap was last enforced can be evicted now
+            return deleted + self._evict_idle(time.monotonic())
+
+    def _evict_idle(self, now):
+        """
+        Removes kept sessions idle for longer than the TTL, then the least recently
+        used idle ones while over max_sessions. Caller holds the lock.
+        """
+        evicted = []
+        over = len(self._sessions) - self.max_sessions
+        for key, last_used in list(self._sessions.items()):
+            if key in self._in_use:
+                continue
+            if over > 0 or now - last_used >= self.session_ttl:
+                del self._sessions[key]
+                evicted.append(key)
+                over -= 1
+            else:
+                break  # Ordered by last use: the rest are newer
+        self._stats["sessions_evicted"] += len(evicted)
+        return evicted
+
+    async def _delete_session(self, user_id, session_id):
+        try:
+            await self.session_service.delete_session(
+                app_name=self.app_name, user_id=user_id, session_id=session_id
+            )
+        except Exception as e:
+            print(f"Runner pool: failed to delete session {session_id}: {e}", file=sys.stderr)
+
+    def stats(self):
+        """Returns a snapshot of cache hit/miss counters and current sizes."""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["runners"] = len(self._runners)
+            snapshot["sessions"] = len(self._sessions)
+            snapshot["sessions_in_use"] = len(self._in_use)
+        return snapshot
+
+# Shared pool, created lazily on first use
+_runner_pool = None
+_runner_pool_lock = threading.Lock()
+
+def get_runner_pool():
+    global _runner_pool
+    if _runner_pool is None:
+        with _runner_pool_lock:
+            if _runner_pool is None:
+                _runner_pool = RunnerPool()
+    return _runner_pool
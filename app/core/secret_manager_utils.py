@@ -1,14 +1,26 @@
 import os
+import threading
 from google.cloud import secretmanager
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-def get_secret(secret_id, project_id=None):
+# One client for the whole process; it is thread-safe and keeps its gRPC channel open
+_client = None
+_client_lock = threading.Lock()
+
+def get_secret_manager_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = secretmanager.SecretManagerServiceClient()
+    return _client
+
+def resolve_secret_name(secret_id, project_id=None):
     """
-    Retrieve a secret from Google Cloud Secret Manager.
-    Supports both short IDs and full resource names.
+    Turns a secret reference into a full version resource name.
     If secret_id is just a key like 'SECRET_GEMINI', it looks up the environment
     variable 'SECRET_GEMINI' to get the actual secret resource ID or name.
     """
@@ -16,27 +28,34 @@ def get_secret(secret_id, project_id=None):
     env_ref = os.environ.get(secret_id)
     target_id = env_ref if env_ref else secret_id
 
-    client = secretmanager.SecretManagerServiceClient()
-
     if target_id.startswith("projects/"):
-        name = target_id
-    else:
+        return target_id if "/versions/" in target_id else f"{target_id}/versions/latest"
+
+    if not project_id:
+        project_id = os.environ.get("GOOGLE_CLOUD_PROJECT")
         if not project_id:
-            project_id = os.environ.get("GOOGLE_CLOUD_PROJECT")
-            if not project_id:
-                raise ValueError("GOOGLE_CLOUD_PROJECT environment variable is not set and no project_id provided.")
-        
-        # Check if target_id contains version info, if not default to latest
-        if "/versions/" in target_id:
-            name = f"projects/{project_id}/secrets/{target_id}" if not target_id.startswith("projects/") else target_id
-        else:
-            name = f"projects/{project_id}/secrets/{target_id}/versions/latest"
+            raise ValueError("GOOGLE_CLOUD_PROJECT environment variable is not set and no project_id provided.")
 
+    # Check if target_id contains version info, if not default to latest
+    if "/versions/" in target_id:
+        return f"projects/{project_id}/secrets/{target_id}"
+    return f"projects/{project_id}/secrets/{target_id}/versions/latest"
+
+def access_secret(secret_id, project_id=None):
+    """Fetches a secret payload with the shared client. Raises on failure."""
+    name = resolve_secret_name(secret_id, project_id)
+    response = get_secret_manager_client().access_secret_version(request={"name": name})
+    return response.payload.data.decode("UTF-8")
+
+def get_secret(secret_id, project_id=None):
+    """
+    Retrieve a secret from Google Cloud Secret Manager.
+    Supports both short IDs and full resource names.
+    """
     try:
-        response = client.access_secret_version(request={"name": name})
-        return response.payload.data.decode("UTF-8")
+        return access_secret(secret_id, project_id)
     except Exception as e:
-        print(f"Error retrieving secret from '{name}': {e}")
+        print(f"Error retrieving secret '{secret_id}': {e}")
         return None
 
 if __name__ == "__main__":
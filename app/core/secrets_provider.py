@@ -0,0 +1,146 @@
+import os
+import sys
+import json
+import time
+import threading
+from concurrent.futures import Future
+from app.core.metrics import SECRET_FETCHES, SECRET_FETCH_SECONDS
+
+# --- Configuration ---
+SECRETS_BACKEND = os.environ.get("SECRETS_BACKEND", "secretmanager")
+SECRETS_FILE = os.environ.get("SECRETS_FILE", ".secrets.local.json")
+SECRET_CACHE_TTL = float(os.environ.get("SECRET_CACHE_TTL", "3600"))
+# Entries this close to expiry are refreshed in the background while the cached value is served
+SECRET_REFRESH_AHEAD = float(os.environ.get("SECRET_REFRESH_AHEAD", "300"))
+
+class SecretManagerBackend:
+    """Google Secret Manager through the process-wide shared client."""
+    def fetch(self, secret_id):
+        from app.core.secret_manager_utils import access_secret
+        return access_secret(secret_id)
+
+class EnvBackend:
+    """Offline stand-in: the value of SECRET_GEMINI is read from SECRET_GEMINI_VALUE."""
+    def fetch(self, secret_id):
+        value = os.environ.get(f"{secret_id}_VALUE")
+        if value is None:
+            raise KeyError(f"Environment variable {secret_id}_VALUE is not set.")
+        return value
+
+class FileBackend:
+    """Offline stand-in: values come from a local JSON file of {secret_id: value}."""
+    def __init__(self, path=SECRETS_FILE):
+        self.path = path
+
+    def fetch(self, secret_id):
+        with open(self.path, "r") as f:
+            return json.load(f)[secret_id]
+
+BACKENDS = {
+    "secretmanager": SecretManagerBackend,
+    "env": EnvBackend,
+    "file": FileBackend,
+}
+
+class SecretsProvider:
+    """
+    TTL cache in front of a secrets backend.
+    - Concurrent misses for the same secret share a single backend fetch.
+    - Entries close to expiry are refreshed on a background thread; callers keep
+      getting the cached value meanwhile (and after a failed refresh).
+    """
+    def __init__(self, backend, ttl=SECRET_CACHE_TTL, refresh_ahead=SECRET_REFRESH_AHEAD):
+        self.backend = backend
+        self.ttl = ttl
+        self.refresh_ahead = min(refresh_ahead, ttl)
+        self._cache = {}     # secret_id -> (value, expires_at)
+        self._inflight = {}  # secret_id -> Future of the running fetch
+        self._lock = threading.Lock()
+
+    def get(self, secret_id):
+        """Returns the secret value, or None if it cannot be fetched."""
+        now = time.monotonic()
+        entry = self._cache.get(secret_id)
+        if entry is not None:
+            value, expires_at = entry
+            if now < expires_at:
+                if now >= expires_at - self.refresh_ahead:
+                    self._refresh_in_background(secret_id)
+                return value
+        try:
+            return self._fetch(secret_id)
+        except Exception as e:
+            print(f"Error fetching secret '{secret_id}': {e}", file=sys.stderr)
+            return None
+
+    def invalidate(self, secret_id=None):
+        with self._lock:
+            if secret_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(secret_id, None)
+
+    def _fetch(self, secret_id):
+        """Single-flight fetch: only one backend call per secret is in progress at a time."""
+        future, owner = self._claim(secret_id)
+        if owner:
+            self._run_fetch(secret_id, future)
+        return future.result()
+
+    def _refresh_in_background(self, secret_id):
+        future, owner = self._claim(secret_id)
+        if not owner:
+            return
+
+        def refresh():
+            try:
+                self._run_fetch(secret_id, future)
+            except Exception as e:
+                print(f"Background refresh of secret '{secret_id}' failed: {e}", file=sys.stderr)
+
+        threading.Thread(target=refresh, name=f"secret-refresh-{secret_id}", daemon=True).start()
+
+    def _claim(self, secret_id):
+        """Returns (future, owner); the owner is responsible for running the fetch."""
+        with self._lock:
+            future = self._inflight.get(secret_id)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._inflight[secret_id] = future
+            return future, True
+
+    def _run_fetch(self, secret_id, future):
+        started = time.perf_counter()
+        try:
+            value = self.backend.fetch(secret_id)
+            with self._lock:
+                self._cache[secret_id] = (value, time.monotonic() + self.ttl)
+            SECRET_FETCHES.inc(secret_id, "ok")
+            future.set_result(value)
+        except Exception as e:
+            SECRET_FETCHES.inc(secret_id, "error")
+            future.set_exception(e)
+            raise
+        finally:
+            SECRET_FETCH_SECONDS.observe(time.perf_counter() - started, secret_id)
+            with self._lock:
+                self._inflight.pop(secret_id, None)
+
+# Shared provider, created lazily on first use
+_secrets_provider = None
+_secrets_provider_lock = threading.Lock()
+
+def get_secrets_provider():
+    global _secrets_provider
+    if _secrets_provider is None:
+        with _secrets_provider_lock:
+            if _secrets_provider is None:
+                backend_name = os.environ.get("SECRETS_BACKEND", SECRETS_BACKEND)
+                if backend_name not in BACKENDS:
+                    raise ValueError(f"Unknown SECRETS_BACKEND '{backend_name}'. Expected one of {sorted(BACKENDS)}.")
+                _secrets_provider = SecretsProvider(BACKENDS[backend_name]())
+    return _secrets_provider
+
+def get_secret(secret_id):
+    return get_secrets_provider().get(secret_id)
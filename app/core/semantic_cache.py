@@ -0,0 +1,171 @@
+import os
+import re
+import time
+import threading
+import numpy as np
+from app.core.metrics import REGISTRY
+from app.core.text_embedding import EMBEDDING_DIM, STOPWORDS, embed_text
+from app.tools.zone_index import GAZETTEER
+
+# --- Configuration ---
+SEMANTIC_CACHE_ENABLED = os.environ.get("SEMANTIC_CACHE_ENABLED", "1") == "1"
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.environ.get("SEMANTIC_CACHE_MAX_ENTRIES", "1024"))
+# Cosine similarity needed to reuse an answer. The hashing embedding matches rewordings
+# (word order, stopwords, inflections, punctuation), not synonyms. Similarity alone cannot
+# tell "high" from "low severity", so a hit also needs the same key terms (see key_terms);
+# with those required, a loose threshold still catches rewordings like
+# "who was flooded in Richmond" / "Richmond flood victims" (0.57).
+SEMANTIC_CACHE_THRESHOLD = float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0.5"))
+SEMANTIC_CACHE_TTL = float(os.environ.get("SEMANTIC_CACHE_TTL", "600"))
+
+# Words that change what a question asks for, however similar the rest of it is
+QUALIFIER_TERMS = frozenset(
+    "before after since until between above below over under more less fewer most least top first last "
+    "latest earliest recent not no without only high medium low critical severe moderate minor".split()
+)
+# Incident types, matched by prefix so inflections agree ("floods", "flooded" -> "flood")
+INCIDENT_TERMS = ("wildfire", "fire", "flood", "storm", "hurricane", "tornado", "earthquake", "drought",
+                  "landslide", "mudslide", "blizzard", "heat")
+# What a question asks for. The embedding drops question words as stopwords, so without
+# these "who was flooded in Richmond" and "when was the flood in Richmond" look alike
+INTENT_TERMS = {
+    **dict.fromkeys(("many", "much", "count", "number", "total"), "count"),
+    **dict.fromkeys(("who", "whom", "whose", "resident", "residents", "victim", "victims", "people"), "who"),
+    **dict.fromkeys(("when", "date", "dates"), "when"),
+    "where": "where",
+    **dict.fromkeys(("why", "cause", "caused"), "why"),
+    **dict.fromkeys(("eligible", "eligibility", "qualify", "qualifies"), "eligibility"),
+    **dict.fromkeys(("summarize", "summary", "overview"), "summary"),
+}
+NUMBER_RE = re.compile(r"\d+(?:[-/:.]\d+)*")
+WORD_RE = re.compile(r"[A-Za-z]+")
+_PLACE_RE = re.compile(r"\b(" + "|".join(re.escape(place) for place in sorted(GAZETTEER, key=len, reverse=True)) + r")\b")
+
+def key_terms(text):
+    """
+    Terms two questions must share for one's answer to serve the other: numbers and
+    dates, qualifiers (before/after, severities, negation), incident types, what the
+    question asks for (a count, who, when, ...), known places, and other proper nouns
+    (capitalized words other than stopwords, so a name that starts the question counts).
+    """
+    text = str(text)
+    terms = set(NUMBER_RE.findall(text))
+    places = _PLACE_RE.findall(text.lower())
+    terms.update(f"place:{place}" for place in places)
+    place_words = {word for place in places for word in place.split()}
+    for word in WORD_RE.findall(text):
+        lower = word.lower()
+        incident = next((term for term in INCIDENT_TERMS if lower.startswith(term)), None)
+        if lower in QUALIFIER_TERMS:
+            terms.add(lower)
+        elif incident is not None:
+            terms.add(incident)
+        elif lower in INTENT_TERMS:
+            terms.add(f"asks:{INTENT_TERMS[lower]}")
+        elif word[0].isupper() and lower not in place_words and lower not in STOPWORDS:
+            terms.add(lower)
+    return frozenset(terms)
+
+SEMANTIC_CACHE_LOOKUPS = REGISTRY.counter(
+    "semantic_cache_lookups_total", "Semantic (near-duplicate question) cache lookups.", ["namespace", "result"]
+)
+
+class SemanticCache:
+    """
+    Answers to past questions, looked up by cosine similarity of question embeddings.
+    Vectors live in a preallocated (max_entries, dim) float32 matrix, so a lookup is one
+    matrix-vector product. A similar question is only a hit if it also has the same
+    key terms (numbers, dates, qualifiers, incident types, what it asks for, places,
+    names). Entries are tied to a version string (corpus version plus agent
+    fingerprint); a new version empties the cache. When full, the least recently used
+    row is overwritten.
+    """
+    def __init__(self, namespace="rag_agent", max_entries=SEMANTIC_CACHE_MAX_ENTRIES,
+                 threshold=SEMANTIC_CACHE_THRESHOLD, ttl=SEMANTIC_CACHE_TTL, dim=EMBEDDING_DIM, embed=embed_text):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ttl
+        self.embed = embed
+        self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        self._expires = np.zeros(max_entries, dtype=np.float64)    # 0 = empty row
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._answers = [None] * max_entries
+        self._keys = [None] * max_entries
+        self._version = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _check_version(self, version):
+        if version != self._version:
+            self._expires[:] = 0
+            self._answers = [None] * self.max_entries
+            self._keys = [None] * self.max_entries
+            self._version = version
+
+    def lookup(self, question, version):
+        """
+        Returns (answer, similarity) for the closest cached question above the threshold
+        with the same key terms, else None.
+        """
+        query = self.embed(question)
+        keys = key_terms(question)
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(version)
+            live = self._expires > now
+            if live.any():
+                scores = self._vectors @ query
+                scores[~live] = -1.0
+                candidates = np.flatnonzero(scores >= self.threshold)
+                for row in candidates[np.argsort(-scores[candidates])]:
+                    if self._keys[row] != keys:
+                        continue
+                    self._last_used[row] = now
+                    self._stats["hits"] += 1
+                    SEMANTIC_CACHE_LOOKUPS.inc(self.namespace, "hit")
+                    return self._answers[row], float(scores[row])
+            self._stats["misses"] += 1
+        SEMANTIC_CACHE_LOOKUPS.inc(self.namespace, "miss")
+        return None
+
+    def store(self, question, version, answer):
+        vector = self.embed(question)
+        keys = key_terms(question)
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(version)
+            free = np.flatnonzero(self._expires <= now)
+            if len(free):
+                row = int(free[0])
+            else:
+                row = int(np.argmin(self._last_used))
+                self._stats["evictions"] += 1
+            self._vectors[row] = vector
+            self._answers[row] = answer
+            self._keys[row] = keys
+            self._expires[row] = now + self.ttl
+            self._last_used[row] = now
+
+    def clear(self):
+        with self._lock:
+            self._version = None
+            self._check_version(None)
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats, entries=int((self._expires > time.monotonic()).sum()))
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_rate"] = round(snapshot["hits"] / lookups, 3) if lookups else 0.0
+        return snapshot
+
+# Shared caches by namespace (agent name), created lazily on first use
+_semantic_caches = {}
+_semantic_caches_lock = threading.Lock()
+
+def get_semantic_cache(namespace="rag_agent"):
+    cache = _semantic_caches.get(namespace)
+    if cache is None:
+        with _semantic_caches_lock:
+            cache = _semantic_caches.setdefault(namespace, SemanticCache(namespace))
+    return cache
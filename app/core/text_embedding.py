@@ -0,0 +1,45 @@
+import re
+import zlib
+import numpy as np
+
+# --- Configuration ---
+EMBEDDING_DIM = 1024
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by did do does for from had has have how i in is it its me of on or "
+    "our that the their there these they this those to was were what when where which who whom "
+    "why will with you your please list show tell give any all".split()
+)
+CHAR_NGRAM = 4
+CHAR_NGRAM_WEIGHT = 0.5
+
+def _features(text):
+    words = [w for w in TOKEN_RE.findall(str(text).lower()) if w not in STOPWORDS]
+    for word in words:
+        yield word, 1.0
+        # Character n-grams let inflections match ("flooded" / "flood", "victims" / "victim")
+        padded = f"<{word}>"
+        for i in range(max(1, len(padded) - CHAR_NGRAM + 1)):
+            yield padded[i:i + CHAR_NGRAM], CHAR_NGRAM_WEIGHT
+
+def embed_text(text, dim=EMBEDDING_DIM):
+    """
+    Hashing-vectorizer embedding: word and character n-gram features hashed (crc32,
+    stable across processes) into `dim` signed buckets, L2-normalized float32.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature, weight in _features(text):
+        h = zlib.crc32(feature.encode("utf-8"))
+        vector[h % dim] += weight if h & 0x80000000 else -weight
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    return vector
+
+def embed_texts(texts, dim=EMBEDDING_DIM):
+    """Embeds a batch into an (n, dim) float32 matrix."""
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        matrix[row] = embed_text(text, dim)
+    return matrix
@@ -0,0 +1,118 @@
+import threading
+import numpy as np
+from app.tools.resident_store import get_resident_store
+from app.tools.zone_index import get_zone_index, locate_record
+
+# The rules from INVESTIGATION_INSTRUCTION: each decision requires all of its conditions
+ELIGIBILITY_RULES = {
+    "rebate_eligible": ("found", "in_disaster_zone", "tax_rebate_eligible"),
+    "relief_eligible": ("found", "in_disaster_zone", "disaster_affected"),
+}
+RECORD_FLAGS = ("tax_rebate_eligible", "disaster_affected")
+
+def _truthy(value):
+    return value is True or str(value).strip().lower() in ("true", "yes", "1")
+
+class EligibilityRules:
+    """
+    Eligibility rules compiled for one set of disaster zones. A batch of resident
+    records is turned into boolean condition columns, and each decision is a logical
+    AND over its columns, so thousands of residents are decided in a handful of NumPy
+    operations. With a zone_index, residents that can be located (coordinates or a
+    geocodable address) are classified against the zone polygons in one vectorized
+    pass; the rest fall back to a case-insensitive match of zone names in the address.
+    """
+    def __init__(self, zones, rules=ELIGIBILITY_RULES, zone_index=None):
+        self.zones = [str(zone) for zone in zones if zone]
+        self._zone_keys = [zone.casefold() for zone in self.zones]
+        self.rules = dict(rules)
+        self.zone_index = zone_index
+        self.version = None  # Zone index version the rules were compiled for
+
+    def columns(self, records):
+        """Condition columns for a list of resident records (non-dicts mean "not found"), plus the matched zone index."""
+        count = len(records)
+        found = np.fromiter((isinstance(r, dict) for r in records), dtype=bool, count=count)
+        addresses = np.array([str(r.get("address", "")).casefold() if isinstance(r, dict) else "" for r in records],
+                             dtype=str).reshape(count)
+        if self._zone_keys and count:
+            zone_hits = np.stack([np.char.find(addresses, zone) >= 0 for zone in self._zone_keys], axis=1)
+        else:
+            zone_hits = np.zeros((count, len(self._zone_keys)), dtype=bool)
+        if self.zone_index is not None and count:
+            points = [locate_record(r) for r in records]
+            located = np.fromiter((p is not None for p in points), dtype=bool, count=count)
+            lats = np.array([p[0] if p else np.nan for p in points], dtype=np.float64)
+            lngs = np.array([p[1] if p else np.nan for p in points], dtype=np.float64)
+            geo_hits = self.zone_index.classify_points(lats, lngs, self.zones)
+            zone_hits = np.where(located[:, None], geo_hits, zone_hits)
+        in_zone = zone_hits.any(axis=1) & found
+        zone_index = np.where(in_zone, zone_hits.argmax(axis=1) if self._zone_keys else -1, -1)
+        columns = {"found": found, "in_disaster_zone": in_zone}
+        for flag in RECORD_FLAGS:
+            columns[flag] = np.fromiter((isinstance(r, dict) and _truthy(r.get(flag)) for r in records),
+                                        dtype=bool, count=count)
+        return columns, zone_index
+
+    def evaluate(self, records):
+        """Returns ({decision name: bool array}, condition columns, matched zone index array)."""
+        columns, zone_index = self.columns(records)
+        decisions = {
+            name: np.logical_and.reduce([columns[condition] for condition in conditions])
+            if len(records) else np.zeros(0, dtype=bool)
+            for name, conditions in self.rules.items()
+        }
+        return decisions, columns, zone_index
+
+    def decide(self, names, records):
+        """One decision dict per resident, with a templated justification."""
+        decisions, columns, zone_index = self.evaluate(records)
+        results = []
+        for i, name in enumerate(names):
+            record = records[i] if isinstance(records[i], dict) else {}
+            result = {
+                "resident_name": name,
+                "found": bool(columns["found"][i]),
+                "address": record.get("address"),
+                "disaster_zone": self.zones[zone_index[i]] if zone_index[i] >= 0 else None,
+                **{decision: bool(values[i]) for decision, values in decisions.items()},
+            }
+            result["justification"] = justify(result)
+            results.append(result)
+        return results
+
+def justify(result):
+    name = result["resident_name"]
+    if not result["found"]:
+        return f"No record found for resident: {name}. Eligibility cannot be confirmed."
+    if not result["disaster_zone"]:
+        return (f"{name} ({result['address']}) is not in a designated disaster zone, "
+                "so is not eligible for a tax rebate or relief funds.")
+    rebate = "Eligible for a tax rebate" if result["rebate_eligible"] else \
+        "Not eligible for a tax rebate (not marked tax_rebate_eligible)"
+    relief = "eligible for relief funds" if result["relief_eligible"] else \
+        "not eligible for relief funds (not marked disaster_affected)"
+    return f"{name} ({result['address']}) is in the {result['disaster_zone']} disaster zone. {rebate}; {relief}."
+
+# Rules compiled for the shared zone index; recompiled when the zones change
+_compiled = None
+_compiled_lock = threading.Lock()
+
+def get_eligibility_rules(zones=None):
+    """Rules for the shared zone index, or matching the given zone names only."""
+    global _compiled
+    if zones is not None:
+        return EligibilityRules(zones)
+    index = get_zone_index()
+    with _compiled_lock:
+        if _compiled is None or _compiled.version != index.version:
+            version, names = index.snapshot()
+            _compiled = EligibilityRules(names, zone_index=index)
+            _compiled.version = version
+        return _compiled
+
+def evaluate_eligibility(resident_names, lookup=None, zones=None):
+    """Decides eligibility for every resident in one batch, without the LLM."""
+    lookup = get_resident_store() if lookup is None else lookup
+    records = [lookup.get(name) for name in resident_names]
+    return get_eligibility_rules(zones).decide(list(resident_names), records)
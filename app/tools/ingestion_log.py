@@ -0,0 +1,170 @@
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; fall back to the in-process lock only
+    fcntl = None
+
+OUTPUT_DIR = "output"
+LOG_FILENAME = "ingestion_log.jsonl"
+LEGACY_SUMMARY_FILENAME = "ingestion_summary.json"
+COMPACT_EVERY_APPENDS = int(os.environ.get("INGESTION_LOG_COMPACT_EVERY", "1000"))
+
+@contextmanager
+def file_lock(lock_path):
+    """Exclusive lock on lock_path (created if missing), held across processes."""
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    lock_fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        if fcntl:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        if fcntl:
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+        os.close(lock_fd)
+
+class IngestionLog:
+    """
+    Append-only JSONL log of ingested documents (one {"document_id", "path", "ingested_at"}
+    object per line). Appends are single O_APPEND writes under a file lock, so concurrent
+    writers never interleave or lose entries. Re-ingesting a document appends a new line;
+    readers de-duplicate by document_id and compaction periodically rewrites the file
+    with one line per document.
+    """
+    def __init__(self, output_dir=OUTPUT_DIR, compact_every=COMPACT_EVERY_APPENDS):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, LOG_FILENAME)
+        self.lock_path = os.path.join(output_dir, ".ingestion_log.lock")
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._appends_since_compact = 0
+
+    @contextmanager
+    def _locked(self):
+        """Serializes writers across threads and processes."""
+        with self._lock, file_lock(self.lock_path):
+            yield
+
+    def append(self, document_id, path):
+        """Records one ingested document."""
+        entry = {"document_id": document_id, "path": path, "ingested_at": time.time()}
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        with self._locked():
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            self._appends_since_compact += 1
+            should_compact = self.compact_every and self._appends_since_compact >= self.compact_every
+        if should_compact:
+            self.compact()
+        return entry
+
+    def iter_entries(self):
+        """Streams every raw log entry in append order, skipping torn or corrupt lines."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict) and entry.get("document_id") is not None:
+                    yield entry
+
+    def iter_documents(self):
+        """
+        One entry per document_id: its latest, in order of latest ingestion. This is
+        exactly what compaction keeps, so reads do not change when the log is compacted.
+        """
+        return iter(self._latest_entries().values())
+
+    def _latest_entries(self):
+        latest = {}
+        for entry in self.iter_entries():
+            latest.pop(entry["document_id"], None)
+            latest[entry["document_id"]] = entry
+        return latest
+
+    def version(self):
+        """
+        Corpus version: changes with every append or compaction, including writes by
+        other processes. Answers derived from the records are cached under it.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return "empty"
+        return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+    def compact(self):
+        """Rewrites the log with one entry per document (the latest) via write-then-rename."""
+        with self._locked():
+            latest = self._latest_entries()
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                for entry in latest.values():
+                    f.write(json.dumps(entry) + "\n")
+            os.replace(tmp_path, self.path)
+            self._appends_since_compact = 0
+
+    def migrate_legacy(self):
+        """
+        One-time import when no log exists yet: entries from the old
+        ingestion_summary.json plus any record files already in the output directory.
+        """
+        if os.path.exists(self.path) or not os.path.isdir(self.output_dir):
+            return
+        entries = []
+        legacy_path = os.path.join(self.output_dir, LEGACY_SUMMARY_FILENAME)
+        if os.path.exists(legacy_path):
+            try:
+                with open(legacy_path, "r") as f:
+                    entries.extend(e for e in json.load(f) if isinstance(e, dict) and e.get("path"))
+            except Exception as e:
+                print(f"Ingestion log: could not read legacy summary: {e}", file=sys.stderr)
+        known_paths = {e["path"] for e in entries}
+        for filename in sorted(os.listdir(self.output_dir)):
+            if not filename.endswith(".json") or filename == LEGACY_SUMMARY_FILENAME or filename.startswith("."):
+                continue
+            path = f"{self.output_dir}/{filename}"
+            if path not in known_paths:
+                entries.append({"document_id": os.path.splitext(filename)[0], "path": path})
+        if not entries:
+            return
+        with self._locked():
+            if os.path.exists(self.path):
+                return
+            with open(self.path, "w") as f:
+                for entry in entries:
+                    f.write(json.dumps({"document_id": entry["document_id"], "path": entry["path"],
+                                        "ingested_at": entry.get("ingested_at", 0)}) + "\n")
+        self.compact()
+
+# Shared log, created lazily on first use
+_ingestion_log = None
+_ingestion_log_lock = threading.Lock()
+
+def get_ingestion_log():
+    global _ingestion_log
+    if _ingestion_log is None:
+        with _ingestion_log_lock:
+            if _ingestion_log is None:
+                log = IngestionLog()
+                log.migrate_legacy()
+                _ingestion_log = log
+    return _ingestion_log
+
+def get_corpus_version():
+    return get_ingestion_log().version()
@@ -1,51 +1,195 @@
 from fastmcp import FastMCP
 import os
-import json
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from app.tools.search_index import get_document_index
+from app.tools.vector_index import VECTOR_INDEX_ENABLED, get_vector_index, hybrid_search
+from app.tools.metadata_index import get_metadata_index
+from app.tools.resident_store import get_resident_store
+from app.tools.zone_index import geocode_address, get_zone_index
+from app.tools.record_store import get_record_store
 
 mcp = FastMCP("SLED Disaster Response")
 
 OUTPUT_DIR = "output"
 
-@mcp.tool()
-def search_digitized_documents(query: str):
-    """
-    Searches through the digitized document results in the output directory.
-    Returns a list of documents that match the query (simple keyword search for now).
-    """
+# --- Deployment (python -m app.tools.mcp_server) ---
+# stdio (default) or http (streamable HTTP, served by uvicorn)
+MCP_TRANSPORT = os.environ.get("MCP_TRANSPORT", "stdio")
+MCP_HOST = os.environ.get("MCP_HOST", "127.0.0.1")
+MCP_PORT = int(os.environ.get("MCP_PORT", "8765"))
+MCP_PATH = os.environ.get("MCP_PATH", "/mcp")
+# Server processes for the HTTP transport
+MCP_WORKERS = int(os.environ.get("MCP_WORKERS", "1"))
+# Threads per process for tools that block on disk or SQLite
+MCP_TOOL_THREADS = int(os.environ.get("MCP_TOOL_THREADS", "8"))
+
+_tool_executor = ThreadPoolExecutor(max_workers=MCP_TOOL_THREADS, thread_name_prefix="mcp-tool")
+
+async def run_blocking(func, *args, **kwargs):
+    """Runs blocking tool work on the tool thread pool, keeping the event loop free."""
+    return await asyncio.get_running_loop().run_in_executor(_tool_executor, functools.partial(func, *args, **kwargs))
+
+def _search_documents(query, limit):
     results = []
     if not os.path.exists(OUTPUT_DIR):
         return "No digitized documents found. Run ingestion pipeline first."
-    
-    for filename in os.listdir(OUTPUT_DIR):
-        if filename.endswith(".json") and filename != "ingestion_summary.json":
-            with open(os.path.join(OUTPUT_DIR, filename), "r") as f:
-                data = json.load(f)
-                # Simple keyword match in summary or location_context
-                if query.lower() in str(data).lower():
-                    results.append(data)
-    
+
+    index = get_document_index()
+    vectors = get_vector_index() if VECTOR_INDEX_ENABLED else None
+    # Records saved by other processes (the app, batch ingestion) are only in the ingestion log
+    index.refresh()
+    if vectors is not None:
+        vectors.refresh()
+    store = get_record_store()
+    for doc_id, score in hybrid_search(query, limit=limit, keyword_index=index, vector_index=vectors):
+        path = index.get_path(doc_id) or (vectors and vectors.get_path(doc_id))
+        try:
+            results.append(store.read(path))
+        except (OSError, TypeError, ValueError):
+            # Record removed or rewritten outside the ingestion path
+            index.remove_document(doc_id)
+            if vectors is not None:
+                vectors.remove_document(doc_id)
+
     return results if results else f"No documents found matching query: {query}"
 
 @mcp.tool()
-def lookup_resident_record(resident_name: str):
+async def search_digitized_documents(query: str, limit: int = 10):
+    """
+    Searches through the digitized document results in the output directory.
+    Ranks records by keyword index and vector similarity over the record fields
+    (hybrid scoring) and returns up to `limit` documents, best matches first.
+    """
+    return await run_blocking(_search_documents, query, limit)
+
+@mcp.tool()
+async def query_records(incident_type: str = "", location: str = "", severity: str = "",
+                        date_from: str = "", date_to: str = "", limit: int = 50):
+    """
+    Returns digitized records matching all of the given filters, most recent incident first.
+    Text filters are case-insensitive prefixes (location "Richmond" matches "Richmond, VA");
+    dates are YYYY-MM-DD and inclusive. Empty filters are ignored.
+    """
+    records = await run_blocking(
+        get_metadata_index().query, incident_type=incident_type, location=location, severity=severity,
+        date_from=date_from, date_to=date_to, limit=limit,
+    )
+    return records if records else "No records match the given filters."
+
+@mcp.tool()
+async def count_records(group_by: str = "incident_type,location_context", incident_type: str = "", location: str = "",
+                        severity: str = "", date_from: str = "", date_to: str = ""):
+    """
+    Counts digitized records matching the filters (same as query_records), grouped by a
+    comma-separated list of fields: incident_type, location_context, severity, resident_name,
+    or the date buckets year, month, day. Also returns the total and the incident date range.
+    """
+    fields = [field.strip() for field in group_by.split(",") if field.strip()]
+    try:
+        return await run_blocking(
+            get_metadata_index().aggregate, group_by=fields, incident_type=incident_type, location=location, severity=severity,
+            date_from=date_from, date_to=date_to,
+        )
+    except ValueError as e:
+        return str(e)
+
+@mcp.tool()
+async def lookup_resident_record(resident_name: str):
     """
     Simulates a lookup of a resident's record to check for disaster relief eligibility.
     """
-    # Mock database
-    resident_db = {
-        "John Doe": {"address": "123 Maple St, Virginia", "tax_rebate_eligible": True, "disaster_affected": False},
-        "Jane Smith": {"address": "456 Oak Ave, Virginia", "tax_rebate_eligible": False, "disaster_affected": True},
-        "Ryan Sessions": {"address": "789 Pine Rd, Virginia", "tax_rebate_eligible": True, "disaster_affected": True}
-    }
-    
-    return resident_db.get(resident_name, f"No record found for resident: {resident_name}")
+    try:
+        record = get_resident_store().get(resident_name)
+    except ValueError as e:
+        return str(e)
+    return record if record is not None else f"No record found for resident: {resident_name}"
 
 @mcp.tool()
-def get_disaster_zones():
+async def lookup_residents(names: list[str], match: str = "exact", limit: int = 5):
+    """
+    Looks up many residents in one call. Returns {name: [matching records]}.
+    match="exact" ignores case and punctuation, "fuzzy" falls back to the closest
+    names when there is no exact match, "prefix" returns every name starting with the text.
+    """
+    try:
+        store = get_resident_store()
+    except ValueError as e:
+        return str(e)
+    return {name: store.lookup(name, match=match, limit=limit) for name in names}
+
+@mcp.tool()
+async def find_residents_by_address(address: str, limit: int = 50):
+    """
+    Returns residents whose address contains every word of `address` (e.g. "Oak Ave" or
+    "Richmond"), so a whole street or neighborhood can be investigated in one call.
+    """
+    try:
+        residents = get_resident_store().find_by_address(address, limit=limit)
+    except ValueError as e:
+        return str(e)
+    return residents if residents else f"No residents found at address: {address}"
+
+@mcp.tool()
+async def get_disaster_zones():
     """
     Returns a list of areas currently designated as disaster zones.
     """
-    return ["Virginia", "Richmond", "Palisades"]
+    return get_zone_index().names()
+
+@mcp.tool()
+async def check_point_in_zones(lat: float, lng: float):
+    """
+    Returns the disaster zones (polygons) containing the point at latitude `lat`, longitude `lng`.
+    """
+    zones = get_zone_index().zones_at(lat, lng)
+    return {"lat": lat, "lng": lng, "zones": zones, "in_disaster_zone": bool(zones)}
+
+@mcp.tool()
+async def check_address_in_zones(address: str):
+    """
+    Geocodes an address (by the town, city or state it names) and returns the disaster zones containing it.
+    """
+    geocoded = geocode_address(address)
+    if geocoded is None:
+        return f"Could not geocode address: {address}"
+    lat, lng, place = geocoded
+    zones = get_zone_index().zones_at(lat, lng)
+    return {"address": address, "geocoded_to": place, "lat": lat, "lng": lng, "zones": zones,
+            "in_disaster_zone": bool(zones)}
+
+@mcp.tool()
+async def set_disaster_zone(name: str, polygon: list[list[float]]):
+    """
+    Adds or replaces a disaster zone. `polygon` is a ring of [lng, lat] points.
+    """
+    try:
+        get_zone_index().set_zone(name, polygon)
+    except (TypeError, ValueError) as e:
+        return f"Invalid zone polygon: {e}"
+    return f"Disaster zone {name} updated ({len(polygon)} points)."
+
+@mcp.tool()
+async def remove_disaster_zone(name: str):
+    """
+    Removes a disaster zone designation.
+    """
+    if get_zone_index().remove_zone(name):
+        return f"Disaster zone {name} removed."
+    return f"No disaster zone named: {name}"
+
+def create_http_app():
+    """ASGI app for the streamable HTTP transport (a uvicorn factory, built once per worker process)."""
+    get_resident_store()  # A RESIDENTS_PATH that cannot be loaded stops the worker here, not on the first lookup
+    # MCP sessions live in process memory; with several workers any worker may get any request
+    return mcp.http_app(path=MCP_PATH, stateless_http=MCP_WORKERS > 1)
 
 if __name__ == "__main__":
-    mcp.run()
+    get_resident_store()
+    if MCP_TRANSPORT == "stdio":
+        mcp.run()
+    else:
+        import uvicorn
+        uvicorn.run("app.tools.mcp_server:create_http_app", factory=True, host=MCP_HOST, port=MCP_PORT,
+                    workers=MCP_WORKERS)
@@ -0,0 +1,160 @@
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from app.tools.ingestion_log import get_ingestion_log
+from app.tools.synced_index import OUTPUT_DIR, SyncedIndex, doc_id_for
+
+DB_FILENAME = ".metadata_index.sqlite3"
+
+# Structured OCR fields (see OCR_INSTRUCTION) that get their own indexed column
+INDEXED_FIELDS = ("incident_type", "location_context", "severity", "date_of_incident")
+GROUPABLE_FIELDS = ("incident_type", "location_context", "severity", "resident_name")
+# Pseudo-fields for grouping by time bucket
+DATE_BUCKETS = {"year": 4, "month": 7, "day": 10}
+
+DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y", "%m/%d/%y", "%m-%d-%Y", "%B %d, %Y", "%b %d, %Y",
+                "%d %B %Y", "%d %b %Y", "%B %d %Y", "%Y-%m-%dT%H:%M:%S", "%Y-%m")
+
+def normalize_date(value):
+    """ISO date (YYYY-MM-DD) for the common OCR date formats, else None."""
+    if not value:
+        return None
+    text = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+def _clean(value):
+    return str(value).strip() if value not in (None, "") else None
+
+def _like_prefix(value):
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+class MetadataIndex(SyncedIndex):
+    """
+    SQLite table of the structured fields of every digitized record, with an index
+    per field, for exact filtering and aggregation without reading the JSON files.
+    Text filters are case-insensitive prefix matches ("Richmond" matches "Richmond, VA"),
+    which SQLite serves from the NOCASE indexes.
+    """
+    name = "Metadata index"
+
+    def __init__(self, output_dir=OUTPUT_DIR, ingestion_log=None):
+        super().__init__(output_dir, ingestion_log)
+        self.db_path = os.path.join(self.output_dir, DB_FILENAME)
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA case_sensitive_like=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            "doc_id TEXT PRIMARY KEY, document_id TEXT, resident_name TEXT COLLATE NOCASE, "
+            "incident_type TEXT COLLATE NOCASE, location_context TEXT COLLATE NOCASE, "
+            "severity TEXT COLLATE NOCASE, date_of_incident TEXT, path TEXT, mtime_ns INTEGER, data TEXT)"
+        )
+        for field in (*INDEXED_FIELDS, "resident_name"):
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS records_{field} ON records ({field})")
+        self._lock = threading.Lock()
+
+    # --- Maintenance ---
+    def add_document(self, path, data, mtime_ns=None):
+        """Inserts or replaces the row for the record stored at path."""
+        doc_id = doc_id_for(path)
+        if mtime_ns is None:
+            mtime_ns = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+        data = data if isinstance(data, dict) else {}
+        row = (
+            doc_id, _clean(data.get("document_id")), _clean(data.get("resident_name")),
+            _clean(data.get("incident_type")), _clean(data.get("location_context")),
+            _clean(data.get("severity")), normalize_date(data.get("date_of_incident")),
+            path, mtime_ns, json.dumps(data),
+        )
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+
+    def remove_document(self, doc_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM records WHERE doc_id = ?", (doc_id,))
+
+    def indexed(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT doc_id, path, mtime_ns FROM records").fetchall()
+        return {doc_id: (path, mtime_ns) for doc_id, path, mtime_ns in rows}
+
+    # --- Queries ---
+    def _where(self, incident_type=None, location=None, severity=None, date_from=None, date_to=None,
+               resident_name=None):
+        clauses, params = [], []
+        for column, value in (("incident_type", incident_type), ("location_context", location),
+                              ("severity", severity), ("resident_name", resident_name)):
+            if value:
+                clauses.append(f"{column} LIKE ? ESCAPE '\\'")
+                params.append(_like_prefix(value))
+        if date_from:
+            clauses.append("date_of_incident >= ?")
+            params.append(normalize_date(date_from) or date_from)
+        if date_to:
+            clauses.append("date_of_incident <= ?")
+            params.append(normalize_date(date_to) or date_to)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, limit=50, **filters):
+        """Records matching every given filter, most recent incident first."""
+        where, params = self._where(**filters)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM records{where} ORDER BY date_of_incident DESC, doc_id LIMIT ?",
+                [*params, int(limit)],
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def aggregate(self, group_by=("incident_type", "location_context"), **filters):
+        """
+        Record counts grouped by the given fields (any of GROUPABLE_FIELDS, or a
+        date bucket: year, month, day) plus the total and date range of the matches.
+        """
+        columns = []
+        for field in group_by:
+            if field in DATE_BUCKETS:
+                columns.append((field, f"substr(date_of_incident, 1, {DATE_BUCKETS[field]})"))
+            elif field in GROUPABLE_FIELDS:
+                columns.append((field, field))
+            else:
+                raise ValueError(f"Cannot group by '{field}'. Use {list(GROUPABLE_FIELDS) + list(DATE_BUCKETS)}.")
+        where, params = self._where(**filters)
+        with self._lock:
+            total, first, last = self._conn.execute(
+                f"SELECT COUNT(*), MIN(date_of_incident), MAX(date_of_incident) FROM records{where}", params
+            ).fetchone()
+            groups = []
+            if columns:
+                select = ", ".join(expr for _, expr in columns)
+                rows = self._conn.execute(
+                    f"SELECT {select}, COUNT(*) AS n FROM records{where} GROUP BY {select} ORDER BY n DESC", params
+                ).fetchall()
+                groups = [{**dict(zip((name for name, _ in columns), row[:-1])), "count": row[-1]} for row in rows]
+        return {"total": total, "date_range": {"first": first, "last": last}, "groups": groups}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# Shared index, opened lazily on first use
+_metadata_index = None
+_metadata_index_lock = threading.Lock()
+
+def get_metadata_index():
+    global _metadata_index
+    if _metadata_index is None:
+        with _metadata_index_lock:
+            if _metadata_index is None:
+                index = MetadataIndex(ingestion_log=get_ingestion_log())
+                index.sync()
+                _metadata_index = index
+    return _metadata_index
@@ -0,0 +1,150 @@
+import os
+import json
+import asyncio
+import tempfile
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# --- Configuration ---
+OUTPUT_DIR = "output"
+# Parsed records kept in memory (least recently read are evicted first)
+RECORD_CACHE_MAX_ENTRIES = int(os.environ.get("RECORD_CACHE_MAX_ENTRIES", "1024"))
+# Threads for record file I/O from async callers
+RECORD_IO_THREADS = int(os.environ.get("RECORD_IO_THREADS", "8"))
+
+def loads(raw):
+    """Parses JSON text or bytes, with orjson when it is installed."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def dumps(data):
+    """Record JSON as bytes, indented like the files written so far (orjson when installed)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass  # e.g. non-string keys, which json coerces
+    return json.dumps(data, indent=2).encode("utf-8")
+
+def read_record(path):
+    """Reads and parses one record file, bypassing the cache."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+class RecordStore:
+    """
+    Digitized records stored as one JSON file each in the output directory. Writes go
+    to a temporary file in the same directory and are renamed into place, so readers
+    never see a partial record. Parsed records are cached in memory (LRU) and reused
+    while the file's mtime and size are unchanged, so a hot record costs a stat
+    instead of a read and parse. The *_async methods run the blocking work on a
+    dedicated thread pool, keeping the event loop free.
+    """
+    def __init__(self, output_dir=OUTPUT_DIR, max_entries=RECORD_CACHE_MAX_ENTRIES, io_threads=RECORD_IO_THREADS):
+        self.output_dir = output_dir
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()  # path -> (mtime_ns, size, record)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, io_threads), thread_name_prefix="record-io")
+
+    def path_for(self, doc_id):
+        return os.path.join(self.output_dir, f"{doc_id}.json")
+
+    def _remember(self, path, stat, data):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._cache[path] = (stat.st_mtime_ns, stat.st_size, data)
+            self._cache.move_to_end(path)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    # --- Blocking API ---
+    def read(self, path):
+        """
+        The record at path (a shallow copy; treat nested values as read-only).
+        Raises OSError if the file is missing and ValueError if it is not valid JSON.
+        """
+        stat = os.stat(path)
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                self._cache.move_to_end(path)
+                self.hits += 1
+                data = cached[2]
+                return dict(data) if isinstance(data, dict) else data
+            self.misses += 1
+        data = read_record(path)
+        self._remember(path, stat, data)
+        return dict(data) if isinstance(data, dict) else data
+
+    def read_many(self, paths):
+        """Records for a list of paths, in order; None for missing or unreadable files."""
+        records = []
+        for path in paths:
+            try:
+                records.append(self.read(path))
+            except (OSError, TypeError, ValueError):
+                records.append(None)
+        return records
+
+    def write(self, doc_id, data):
+        """Atomically writes the record for doc_id (write to a temporary file, then rename). Returns its path."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = self.path_for(doc_id)
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, prefix=f".{doc_id}.", suffix=".tmp")
+        try:
+            os.fchmod(fd, 0o644)  # mkstemp creates files as 0600; records are shared like any other output
+            with os.fdopen(fd, "wb") as f:
+                f.write(dumps(data))
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._remember(path, os.stat(path), data)
+        return path
+
+    def invalidate(self, path=None):
+        """Drops one cached record, or the whole cache if no path is given."""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(path, None)
+
+    # --- Async API ---
+    async def run(self, func, *args, **kwargs):
+        """Runs blocking work on the record I/O thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def read_async(self, path):
+        return await self.run(self.read, path)
+
+    async def read_many_async(self, paths):
+        return await self.run(self.read_many, paths)
+
+    async def write_async(self, doc_id, data):
+        return await self.run(self.write, doc_id, data)
+
+# Shared store, created on first use
+_record_store = None
+_record_store_lock = threading.Lock()
+
+def get_record_store():
+    global _record_store
+    if _record_store is None:
+        with _record_store_lock:
+            if _record_store is None:
+                _record_store = RecordStore()
+    return _record_store
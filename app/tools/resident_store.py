@@ -0,0 +1,179 @@
+import os
+import re
+import json
+import bisect
+import sqlite3
+import difflib
+import threading
+from collections import Counter
+
+# --- Configuration ---
+# JSON ({name: record} or [records with resident_name]) or SQLite (table `residents`) file;
+# unset uses the built-in mock records. A set path that cannot be loaded is an error, never
+# a fallback to the mocks
+RESIDENTS_PATH = os.environ.get("RESIDENTS_PATH", "")
+FUZZY_CUTOFF = float(os.environ.get("RESIDENT_FUZZY_CUTOFF", "0.8"))
+# Fuzzy candidates are gathered from the query's rarest trigrams until this many postings are read
+FUZZY_MAX_POSTINGS = 20000
+
+# Mock database
+DEFAULT_RESIDENTS = {
+    "John Doe": {"address": "123 Maple St, Virginia", "tax_rebate_eligible": True, "disaster_affected": False},
+    "Jane Smith": {"address": "456 Oak Ave, Virginia", "tax_rebate_eligible": False, "disaster_affected": True},
+    "Ryan Sessions": {"address": "789 Pine Rd, Virginia", "tax_rebate_eligible": True, "disaster_affected": True}
+}
+
+ADDRESS_ABBREVIATIONS = {
+    "street": "st", "avenue": "ave", "road": "rd", "drive": "dr", "lane": "ln", "boulevard": "blvd",
+    "court": "ct", "place": "pl", "north": "n", "south": "s", "east": "e", "west": "w",
+}
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+def normalize_name(name):
+    return " ".join(WORD_RE.findall(str(name).lower()))
+
+def normalize_address(address):
+    return " ".join(ADDRESS_ABBREVIATIONS.get(word, word) for word in WORD_RE.findall(str(address).lower()))
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def load_residents(path):
+    """{resident name: record} from a JSON file or a SQLite database with a `residents` table."""
+    if path.endswith((".sqlite", ".sqlite3", ".db")):
+        conn = sqlite3.connect(path)
+        try:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute("SELECT * FROM residents").fetchall()
+        finally:
+            conn.close()
+        residents = {}
+        for row in rows:
+            record = dict(row)
+            name = record.pop("resident_name")
+            for flag in ("tax_rebate_eligible", "disaster_affected"):
+                if flag in record and record[flag] is not None:
+                    record[flag] = bool(record[flag])
+            residents[name] = record
+        return residents
+    with open(path, "r") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return {record["resident_name"]: {k: v for k, v in record.items() if k != "resident_name"} for record in data}
+    return data
+
+class ResidentStore:
+    """
+    Resident records held in memory with lookup indexes built once at load:
+    normalized name -> name (exact, case/punctuation-insensitive), a sorted list of
+    normalized names (prefix search by bisection), name trigrams (fuzzy candidates,
+    ranked by similarity ratio) and normalized address words -> names (street or
+    neighbourhood search).
+    """
+    def __init__(self, residents=None):
+        self.records = dict(residents if residents is not None else DEFAULT_RESIDENTS)
+        self._by_name = {}        # normalized name -> name
+        self._sorted_names = []   # sorted normalized names
+        self._trigrams = {}       # trigram -> {normalized name}
+        self._address_words = {}  # normalized address word -> {name}
+        for name, record in self.records.items():
+            key = normalize_name(name)
+            self._by_name[key] = name
+            for gram in _trigrams(key):
+                self._trigrams.setdefault(gram, set()).add(key)
+            address = record.get("address", "") if isinstance(record, dict) else ""
+            for word in normalize_address(address).split():
+                self._address_words.setdefault(word, set()).add(name)
+        self._sorted_names = sorted(self._by_name)
+
+    def __len__(self):
+        return len(self.records)
+
+    def _result(self, name, **extra):
+        return {"resident_name": name, **self.records[name], **extra}
+
+    def get(self, name, default=None):
+        """Record for an exact (normalized) name, else default."""
+        match = self._by_name.get(normalize_name(name))
+        return self.records[match] if match is not None else default
+
+    def prefix(self, text, limit=50):
+        key = normalize_name(text)
+        if not key:
+            return []
+        start = bisect.bisect_left(self._sorted_names, key)
+        matches = []
+        for i in range(start, min(start + limit, len(self._sorted_names))):
+            normalized = self._sorted_names[i]
+            if not normalized.startswith(key):
+                break
+            matches.append(self._result(self._by_name[normalized]))
+        return matches
+
+    def fuzzy(self, text, limit=5, cutoff=FUZZY_CUTOFF):
+        """
+        Closest names by similarity ratio. Candidates come from the query's rarest
+        trigrams (common ones like "son" are skipped once enough postings are read),
+        so the cost stays bounded as the store grows.
+        """
+        key = normalize_name(text)
+        if not key:
+            return []
+        postings = sorted((self._trigrams[gram] for gram in _trigrams(key) if gram in self._trigrams), key=len)
+        shared, read = Counter(), 0
+        for names in postings:
+            if read and read + len(names) > FUZZY_MAX_POSTINGS:
+                break
+            shared.update(names)
+            read += len(names)
+        candidates = [normalized for normalized, _ in shared.most_common(limit * 20)]
+        scored = []
+        for normalized in candidates:
+            score = difflib.SequenceMatcher(None, key, normalized).ratio()
+            if score >= cutoff:
+                scored.append((score, normalized))
+        scored.sort(reverse=True)
+        return [self._result(self._by_name[normalized], score=round(score, 3)) for score, normalized in scored[:limit]]
+
+    def lookup(self, name, match="exact", limit=5):
+        """Matching records for one name: exact, then (for match="fuzzy") the closest names, or all names with the prefix."""
+        if match == "prefix":
+            return self.prefix(name, limit=limit)
+        exact = self._by_name.get(normalize_name(name))
+        if exact is not None:
+            return [self._result(exact)]
+        if match == "fuzzy":
+            return self.fuzzy(name, limit=limit)
+        return []
+
+    def find_by_address(self, address, limit=50):
+        """Residents whose address contains every word of the query (e.g. a street name)."""
+        words = normalize_address(address).split()
+        if not words:
+            return []
+        postings = sorted((self._address_words.get(word, set()) for word in words), key=len)
+        names = set.intersection(*postings) if postings else set()
+        return [self._result(name) for name in sorted(names)[:limit]]
+
+# Shared store, loaded once on first use
+_resident_store = None
+_resident_store_lock = threading.Lock()
+
+def get_resident_store():
+    """
+    The shared store. Raises ValueError if RESIDENTS_PATH is set but cannot be loaded;
+    nothing is cached then, so the next call tries again.
+    """
+    global _resident_store
+    if _resident_store is None:
+        with _resident_store_lock:
+            if _resident_store is None:
+                residents = None
+                if RESIDENTS_PATH:
+                    try:
+                        residents = load_residents(RESIDENTS_PATH)
+                    except Exception as e:
+                        raise ValueError(f"Could not load resident records from {RESIDENTS_PATH}: {e}") from e
+                _resident_store = ResidentStore(residents)
+    return _resident_store
@@ -0,0 +1,158 @@
+import os
+import re
+import json
+import math
+import atexit
+import threading
+from app.tools.ingestion_log import get_ingestion_log
+from app.tools.synced_index import PersistedIndex, doc_id_for
+
+INDEX_FILENAME = ".search_index.json"
+
+# Matches in these fields count for more than matches elsewhere in the record
+FIELD_WEIGHTS = {
+    "resident_name": 3.0,
+    "location_context": 2.0,
+    "incident_type": 2.0,
+    "summary": 1.5,
+}
+DEFAULT_FIELD_WEIGHT = 1.0
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+def tokenize(text):
+    return TOKEN_RE.findall(str(text).lower())
+
+def field_texts(data):
+    """Yields (field, text) for every top-level field of a record, flattening nested values."""
+    if not isinstance(data, dict):
+        yield "_value", str(data)
+        return
+    for field, value in data.items():
+        if value is None:
+            continue
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value)
+        yield field, str(value)
+
+class DocumentIndex(PersistedIndex):
+    """
+    In-process inverted index over the digitized JSON records.
+    Keeps per-field postings (field -> token -> {doc_id: term frequency}) and a
+    doc_id -> path map. The index is persisted next to the records and, on load,
+    only files whose mtime changed since the last save are re-read.
+    """
+    name = "Search index"
+    state_filename = INDEX_FILENAME
+
+    def _reset(self):
+        super()._reset()
+        self.postings = {}    # field -> token -> {doc_id: tf}
+        self.doc_terms = {}   # doc_id -> field -> {token: tf}, used for removal and persistence
+
+    # --- Maintenance ---
+    def add_document(self, path, data, mtime_ns=None):
+        """Indexes (or re-indexes) the record stored at path."""
+        doc_id = doc_id_for(path)
+        terms = {}
+        for field, text in field_texts(data):
+            counts = {}
+            for token in tokenize(text):
+                counts[token] = counts.get(token, 0) + 1
+            if counts:
+                terms[field] = counts
+        if mtime_ns is None:
+            mtime_ns = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+
+        with self._lock:
+            self._remove(doc_id)
+            self._insert(doc_id, terms)
+            self.doc_paths[doc_id] = path
+            self.doc_mtimes[doc_id] = mtime_ns
+            self._dirty = True
+        self.maybe_persist()
+
+    def remove_document(self, doc_id):
+        with self._lock:
+            self._remove(doc_id)
+            self.doc_paths.pop(doc_id, None)
+            self.doc_mtimes.pop(doc_id, None)
+            self._dirty = True
+
+    def _insert(self, doc_id, terms):
+        self.doc_terms[doc_id] = terms
+        for field, counts in terms.items():
+            field_postings = self.postings.setdefault(field, {})
+            for token, tf in counts.items():
+                field_postings.setdefault(token, {})[doc_id] = tf
+
+    def _remove(self, doc_id):
+        terms = self.doc_terms.pop(doc_id, None)
+        if not terms:
+            return
+        for field, counts in terms.items():
+            field_postings = self.postings.get(field, {})
+            for token in counts:
+                docs = field_postings.get(token)
+                if docs is not None:
+                    docs.pop(doc_id, None)
+                    if not docs:
+                        del field_postings[token]
+
+    # --- Persistence ---
+    def _state(self):
+        return {
+            "doc_paths": dict(self.doc_paths),
+            "doc_mtimes": dict(self.doc_mtimes),
+            "doc_terms": dict(self.doc_terms),  # Per-document terms are replaced, never mutated
+        }
+
+    def _restore(self, state):
+        self.postings = {}
+        self.doc_terms = {}
+        self.doc_paths = state.get("doc_paths", {})
+        self.doc_mtimes = state.get("doc_mtimes", {})
+        for doc_id, terms in state.get("doc_terms", {}).items():
+            self._insert(doc_id, terms)
+
+    # --- Queries ---
+    def search(self, query, limit=10):
+        """
+        Returns [(doc_id, score)] ranked by field-weighted TF-IDF.
+        Query tokens with no exact match fall back to prefix matches.
+        """
+        tokens = set(tokenize(query))
+        if not tokens:
+            return []
+        with self._lock:
+            total_docs = max(len(self.doc_paths), 1)
+            scores = {}
+            for field, field_postings in self.postings.items():
+                weight = FIELD_WEIGHTS.get(field, DEFAULT_FIELD_WEIGHT)
+                for token in tokens:
+                    matches = [token] if token in field_postings else [
+                        t for t in field_postings if t.startswith(token)
+                    ]
+                    for match in matches:
+                        docs = field_postings[match]
+                        idf = math.log(1 + total_docs / len(docs))
+                        for doc_id, tf in docs.items():
+                            scores[doc_id] = scores.get(doc_id, 0.0) + weight * (1 + math.log(tf)) * idf
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit] if limit else ranked
+
+# Shared index, loaded lazily on first use
+_document_index = None
+_document_index_lock = threading.Lock()
+
+def get_document_index():
+    global _document_index
+    if _document_index is None:
+        with _document_index_lock:
+            if _document_index is None:
+                index = DocumentIndex(ingestion_log=get_ingestion_log())
+                index.load()
+                index.sync()
+                atexit.register(index.persist)
+                _document_index = index
+    return _document_index
@@ -0,0 +1,218 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+from contextlib import contextmanager
+from app.tools.ingestion_log import IngestionLog
+from app.tools.record_store import read_record
+
+OUTPUT_DIR = "output"
+PERSIST_INTERVAL_SECONDS = 5.0
+
+def _to_json(value):
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+@contextmanager
+def atomic_file(path, mode="wb"):
+    """
+    Opens a temporary file next to path and renames it over path when the block ends.
+    The temporary name is unique, so concurrent writers in other processes never share it.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        os.fchmod(fd, 0o644)
+        with os.fdopen(fd, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def doc_id_for(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+class SyncedIndex:
+    """
+    Base for structures derived from the digitized records and kept in line with the
+    ingestion log. Subclasses implement add_document / remove_document and say which
+    records they already hold via indexed(); sync() then re-reads only records that
+    are new or whose file changed, and drops records no longer in the log.
+    """
+    name = "Index"
+
+    def __init__(self, output_dir=OUTPUT_DIR, ingestion_log=None):
+        # Absolute, so saves at exit or from a background thread land here even if the cwd changes
+        self.output_dir = os.path.abspath(output_dir)
+        self.ingestion_log = ingestion_log or IngestionLog(self.output_dir)
+        self._sync_lock = threading.Lock()
+        self._synced_version = None  # Ingestion log version at the start of the last sync
+
+    def indexed(self):
+        """doc_id -> (path, mtime_ns) of every record currently held."""
+        raise NotImplementedError
+
+    def add_document(self, path, data, mtime_ns=None):
+        raise NotImplementedError
+
+    def remove_document(self, doc_id):
+        raise NotImplementedError
+
+    def persist(self):
+        """Writes the index to disk, for subclasses that keep it in memory."""
+
+    def refresh(self):
+        """
+        Syncs if the ingestion log changed since the last sync, i.e. another process
+        saved records. One stat call when nothing changed.
+        """
+        if self.ingestion_log.version() == self._synced_version:
+            return
+        with self._sync_lock:
+            if self.ingestion_log.version() != self._synced_version:
+                self._sync()
+
+    def sync(self):
+        """Brings the index in line with the ingestion log using only stat calls for unchanged records."""
+        with self._sync_lock:
+            self._sync()
+
+    def _sync(self):
+        self._synced_version = self.ingestion_log.version()
+        known = self.indexed()
+        seen = set()
+        for entry in self.ingestion_log.iter_documents():
+            path = entry["path"]
+            doc_id = doc_id_for(path)
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            seen.add(doc_id)
+            if known.get(doc_id) == (path, mtime_ns):
+                continue
+            try:
+                data = read_record(path)
+            except Exception as e:
+                print(f"{self.name}: skipping unreadable record {path}: {e}", file=sys.stderr)
+                continue
+            self.add_document(path, data, mtime_ns=mtime_ns)
+        for doc_id in set(known) - seen:
+            self.remove_document(doc_id)
+        self.persist()
+
+class PersistedIndex(SyncedIndex):
+    """
+    A SyncedIndex held in memory and saved as JSON next to the records, so a restart
+    only re-reads the records that changed since the last save. Subclasses keep
+    doc_paths / doc_mtimes up to date, set _dirty on every change, and convert their
+    state with _state() / _restore(); both run under the index lock. Saves during
+    ingestion happen on a background thread.
+    """
+    state_filename = None
+
+    def __init__(self, output_dir=OUTPUT_DIR, ingestion_log=None):
+        super().__init__(output_dir, ingestion_log)
+        self.state_path = os.path.join(self.output_dir, self.state_filename)
+        self._lock = threading.RLock()
+        self._persist_lock = threading.Lock()  # One writer at a time; taken before _lock, never inside it
+        self._persisting = False
+        self._last_persist = 0.0
+        self._reset()
+
+    def _reset(self):
+        self.doc_paths = {}   # doc_id -> path
+        self.doc_mtimes = {}  # doc_id -> mtime_ns of the indexed file
+        self._dirty = False
+
+    def _state(self):
+        """
+        Snapshot of the index to save, or None if there is nothing to save yet. It is
+        encoded after the lock is released, so it must not share anything that is
+        later mutated in place. NumPy arrays are saved as lists.
+        """
+        raise NotImplementedError
+
+    def _restore(self, state):
+        """Rebuilds the index from a saved state. Returns False if the state cannot be used."""
+        raise NotImplementedError
+
+    def indexed(self):
+        with self._lock:
+            return {doc_id: (path, self.doc_mtimes.get(doc_id)) for doc_id, path in self.doc_paths.items()}
+
+    def get_path(self, doc_id):
+        return self.doc_paths.get(doc_id)
+
+    def load(self):
+        """Loads a previously persisted index. Returns False if none is available."""
+        if not os.path.exists(self.state_path):
+            return False
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+            with self._lock:
+                if self._restore(state) is False:
+                    self._reset()
+                    return False
+        except Exception as e:
+            print(f"{self.name}: ignoring corrupt index file: {e}", file=sys.stderr)
+            with self._lock:
+                self._reset()
+            return False
+        return True
+
+    def persist(self):
+        """
+        Saves a snapshot of the index. Only taking the snapshot holds the index lock;
+        encoding and writing it do not, so searches and saves carry on meanwhile.
+        """
+        with self._persist_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                state = self._state()
+                if state is None:
+                    return
+                self._dirty = False
+            try:
+                self._write(state)
+            except Exception:
+                with self._lock:
+                    self._dirty = True
+                raise
+            self._last_persist = time.monotonic()
+
+    def _write(self, state):
+        with atomic_file(self.state_path, "w") as f:
+            json.dump(state, f, default=_to_json)
+
+    def maybe_persist(self):
+        """
+        Starts a background save at most once per PERSIST_INTERVAL_SECONDS, so the
+        record-save path never waits on it; the rest is flushed at exit.
+        """
+        if self._persisting or time.monotonic() - self._last_persist < PERSIST_INTERVAL_SECONDS:
+            return
+        with self._lock:
+            if self._persisting:
+                return
+            self._persisting = True
+            self._last_persist = time.monotonic()
+        threading.Thread(target=self._persist_in_background, name=f"{self.name} persist", daemon=True).start()
+
+    def _persist_in_background(self):
+        try:
+            self.persist()
+        except Exception as e:
+            print(f"{self.name}: could not save index: {e}", file=sys.stderr)
+        finally:
+            self._persisting = False
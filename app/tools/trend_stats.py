@@ -0,0 +1,152 @@
+import os
+import atexit
+import threading
+from collections import Counter
+from app.tools.ingestion_log import get_ingestion_log
+from app.tools.metadata_index import normalize_date
+from app.tools.synced_index import PersistedIndex, doc_id_for
+
+STATS_FILENAME = ".trend_stats.json"
+
+UNKNOWN = "Unknown"
+# Caps on the summary size, so the report prompt stays fixed as the corpus grows
+MAX_TOP = 20
+MAX_MONTHS = 36
+
+def record_key(data):
+    """(incident_type, location, severity, month) bucket a record is counted under."""
+    data = data if isinstance(data, dict) else {}
+    def label(field):
+        value = data.get(field)
+        return str(value).strip() if value not in (None, "") else UNKNOWN
+    date = normalize_date(data.get("date_of_incident"))
+    return (label("incident_type"), label("location_context"), label("severity"), date[:7] if date else UNKNOWN)
+
+def _top(counter, top):
+    ranked = counter.most_common()
+    summary = dict(ranked[:top])
+    rest = sum(count for _, count in ranked[top:])
+    if rest:
+        summary["(other)"] = rest
+    return summary
+
+class TrendStats(PersistedIndex):
+    """
+    Running record counts by incident type, location, severity and month, updated as
+    records are ingested. Counts are kept per (incident, location, severity, month)
+    bucket, so a summary (or a drill-down into one incident type or location) costs
+    time proportional to the number of distinct buckets, not the number of records.
+    Persisted next to the records and synced against the ingestion log like the
+    search index.
+    """
+    name = "Trend stats"
+    state_filename = STATS_FILENAME
+
+    def _reset(self):
+        super()._reset()
+        self.counts = Counter()  # (incident, location, severity, month) -> records
+        self.doc_keys = {}       # doc_id -> bucket key, used to move a record when it is re-saved
+
+    # --- Maintenance ---
+    def add_document(self, path, data, mtime_ns=None):
+        """Counts (or re-counts) the record stored at path."""
+        doc_id = doc_id_for(path)
+        key = record_key(data)
+        if mtime_ns is None:
+            mtime_ns = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+        with self._lock:
+            self._uncount(doc_id)
+            self.counts[key] += 1
+            self.doc_keys[doc_id] = key
+            self.doc_paths[doc_id] = path
+            self.doc_mtimes[doc_id] = mtime_ns
+            self._dirty = True
+        self.maybe_persist()
+
+    def remove_document(self, doc_id):
+        with self._lock:
+            self._uncount(doc_id)
+            self.doc_paths.pop(doc_id, None)
+            self.doc_mtimes.pop(doc_id, None)
+            self._dirty = True
+
+    def _uncount(self, doc_id):
+        key = self.doc_keys.pop(doc_id, None)
+        if key is not None:
+            self.counts[key] -= 1
+            if self.counts[key] <= 0:
+                del self.counts[key]
+
+    # --- Persistence ---
+    def _state(self):
+        return {
+            "doc_paths": dict(self.doc_paths),
+            "doc_mtimes": dict(self.doc_mtimes),
+            "doc_keys": dict(self.doc_keys),
+        }
+
+    def _restore(self, state):
+        self.doc_paths = state.get("doc_paths", {})
+        self.doc_mtimes = state.get("doc_mtimes", {})
+        self.doc_keys = {doc_id: tuple(key) for doc_id, key in state.get("doc_keys", {}).items()}
+        self.counts = Counter(self.doc_keys.values())
+
+    # --- Queries ---
+    def summary(self, incident_type=None, location=None, top=5, months=12):
+        """
+        Fixed-size trend summary: totals, the `top` incident types, locations, severities and
+        (incident type, location) pairs, and counts for the latest `months` months.
+        incident_type / location drill down to matching records (case-insensitive prefix).
+        """
+        top = max(1, min(int(top), MAX_TOP))
+        months = max(1, min(int(months), MAX_MONTHS))
+        incident_prefix = (incident_type or "").strip().casefold()
+        location_prefix = (location or "").strip().casefold()
+        by_incident, by_location, by_severity, by_pair, by_month = Counter(), Counter(), Counter(), Counter(), Counter()
+        with self._lock:
+            buckets = list(self.counts.items())
+        for (incident, place, severity, month), count in buckets:
+            if not incident.casefold().startswith(incident_prefix) or not place.casefold().startswith(location_prefix):
+                continue
+            by_incident[incident] += count
+            by_location[place] += count
+            by_severity[severity] += count
+            by_pair[(incident, place)] += count
+            by_month[month] += count
+
+        undated = by_month.pop(UNKNOWN, 0)
+        latest = sorted(by_month)[-months:]
+        summary = {
+            "total_records": sum(by_incident.values()),
+            "by_incident_type": _top(by_incident, top),
+            "by_location": _top(by_location, top),
+            "by_severity": _top(by_severity, top),
+            "top_incident_locations": [
+                {"incident_type": incident, "location": place, "count": count}
+                for (incident, place), count in by_pair.most_common(top)
+            ],
+            "monthly": {month: by_month[month] for month in latest},
+            "undated_records": undated,
+        }
+        if incident_type or location:
+            summary["filters"] = {"incident_type": incident_type or None, "location": location or None}
+        return summary
+
+    def __len__(self):
+        return len(self.doc_keys)
+
+# Shared stats, loaded lazily on first use
+_trend_stats = None
+_trend_stats_lock = threading.Lock()
+
+def get_trend_stats():
+    global _trend_stats
+    if _trend_stats is None:
+        with _trend_stats_lock:
+            if _trend_stats is None:
+                stats = TrendStats(ingestion_log=get_ingestion_log())
+                stats.load()
+                stats.sync()
+                atexit.register(stats.persist)
+                _trend_stats = stats
+    return _trend_stats
@@ -0,0 +1,302 @@
+import os
+import sys
+import glob
+import math
+import atexit
+import tempfile
+import threading
+import numpy as np
+from app.core.text_embedding import embed_text
+from app.tools.ingestion_log import file_lock, get_ingestion_log
+from app.tools.synced_index import OUTPUT_DIR, PersistedIndex, doc_id_for
+
+# Each save writes the matrix to a new .vector_index.<random>.f32 file named in the JSON row map
+MATRIX_PREFIX = ".vector_index."
+MATRIX_SUFFIX = ".f32"
+LEGACY_MATRIX_FILENAME = ".vector_index.f32"  # Shared, written in place by every process; removed on save
+META_FILENAME = ".vector_index.json"
+
+# --- Configuration ---
+VECTOR_INDEX_ENABLED = os.environ.get("VECTOR_INDEX_ENABLED", "1") == "1"
+# 256 float32 dims = 1 KiB per record, ~100 MiB of mapped vectors at 100k records
+VECTOR_INDEX_DIM = int(os.environ.get("VECTOR_INDEX_DIM", "256"))
+# Above this many records the index is partitioned (IVF) and only the nearest lists are scanned
+VECTOR_INDEX_IVF_MIN_DOCS = int(os.environ.get("VECTOR_INDEX_IVF_MIN_DOCS", "20000"))
+VECTOR_INDEX_NPROBE = int(os.environ.get("VECTOR_INDEX_NPROBE", "8"))
+# Share of the hybrid score that comes from vector similarity (the rest is keyword TF-IDF)
+HYBRID_VECTOR_WEIGHT = float(os.environ.get("HYBRID_VECTOR_WEIGHT", "0.5"))
+# Vector-only matches below this cosine similarity are treated as noise (hash collisions)
+HYBRID_MIN_SIMILARITY = float(os.environ.get("HYBRID_MIN_SIMILARITY", "0.3"))
+
+# OCR fields that describe the incident; weights mirror the keyword index
+VECTOR_FIELDS = {
+    "summary": 1.5,
+    "location_context": 2.0,
+    "incident_type": 2.0,
+    "resident_name": 1.0,
+}
+INITIAL_CAPACITY = 1024
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLE = 20000
+
+def embed_record(data, dim=VECTOR_INDEX_DIM):
+    """Weighted sum of the field embeddings, L2-normalized (zero vector for empty records)."""
+    vector = np.zeros(dim, dtype=np.float32)
+    if isinstance(data, dict):
+        for field, weight in VECTOR_FIELDS.items():
+            if data.get(field):
+                vector += weight * embed_text(data[field], dim)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+class VectorIndex(PersistedIndex):
+    """
+    Embeddings of the digitized records in a float32 matrix (one row per record) saved
+    next to the records, plus a small JSON file mapping rows to document ids and naming
+    the matrix file. A loaded matrix is memory-mapped copy-on-write: rows updated on
+    ingest stay private to this process (several processes keep their own index over
+    the same files), and a save writes a new matrix file and then switches the JSON
+    file to it, under a file lock. Removed records leave a free row for reuse.
+    Past VECTOR_INDEX_IVF_MIN_DOCS records the rows are clustered (spherical k-means)
+    and a query only scans the VECTOR_INDEX_NPROBE closest clusters.
+    """
+    name = "Vector index"
+    state_filename = META_FILENAME
+
+    def __init__(self, output_dir=OUTPUT_DIR, ingestion_log=None, dim=VECTOR_INDEX_DIM,
+                 ivf_min_docs=VECTOR_INDEX_IVF_MIN_DOCS, nprobe=VECTOR_INDEX_NPROBE):
+        self.dim = dim
+        self.ivf_min_docs = ivf_min_docs
+        self.nprobe = nprobe
+        super().__init__(output_dir, ingestion_log)
+        self.lock_path = f"{self.state_path}.lock"
+
+    def _reset(self):
+        super()._reset()
+        self._matrix = None       # (capacity, dim): copy-on-write np.memmap of the loaded file, or in memory
+        self._row_ids = []        # row -> doc_id (None for free rows); len == rows in use
+        self._rows = {}           # doc_id -> row
+        self._free = []           # reusable rows
+        self._centroids = None    # (lists, dim) when partitioned
+        self._assign = None       # row -> list id
+        self._trained_at = 0      # live records when the partitioning was last trained
+
+    # --- Storage ---
+    def _capacity(self):
+        return 0 if self._matrix is None else self._matrix.shape[0]
+
+    def _grow(self, rows_needed):
+        capacity = max(INITIAL_CAPACITY, self._capacity())
+        while capacity < rows_needed:
+            capacity *= 2
+        if self._matrix is not None and capacity == self._capacity():
+            return
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        if self._matrix is not None:
+            grown[:len(self._matrix)] = self._matrix
+        self._matrix = grown
+        if self._assign is not None:
+            self._assign = np.concatenate([self._assign, np.full(capacity - len(self._assign), -1, dtype=np.int32)])
+
+    # --- Maintenance ---
+    def add_document(self, path, data, mtime_ns=None):
+        """Embeds (or re-embeds) the record stored at path."""
+        doc_id = doc_id_for(path)
+        vector = embed_record(data, self.dim)
+        if mtime_ns is None:
+            mtime_ns = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+
+        with self._lock:
+            row = self._rows.get(doc_id)
+            if row is None:
+                if self._free:
+                    row = self._free.pop()
+                else:
+                    row = len(self._row_ids)
+                    self._row_ids.append(None)
+                    self._grow(len(self._row_ids))
+                self._row_ids[row] = doc_id
+                self._rows[doc_id] = row
+            self._matrix[row] = vector
+            if self._centroids is not None:
+                self._assign[row] = int(np.argmax(self._centroids @ vector))
+            self.doc_paths[doc_id] = path
+            self.doc_mtimes[doc_id] = mtime_ns
+            self._dirty = True
+            self._maybe_train()
+        self.maybe_persist()
+
+    def remove_document(self, doc_id):
+        with self._lock:
+            row = self._rows.pop(doc_id, None)
+            if row is not None:
+                self._matrix[row] = 0
+                self._row_ids[row] = None
+                self._free.append(row)
+                if self._assign is not None:
+                    self._assign[row] = -1
+            self.doc_paths.pop(doc_id, None)
+            self.doc_mtimes.pop(doc_id, None)
+            self._dirty = True
+
+    # --- Partitioning (IVF) ---
+    def _maybe_train(self):
+        live = len(self._rows)
+        if live >= self.ivf_min_docs and live >= 2 * self._trained_at:
+            self.train()
+
+    def train(self, lists=None, seed=0):
+        """Clusters the live rows with spherical k-means; queries then scan only the closest lists."""
+        with self._lock:
+            live_rows = np.array(sorted(self._rows.values()), dtype=np.int64)
+            if len(live_rows) == 0:
+                return
+            lists = lists or max(1, min(1024, int(math.sqrt(len(live_rows)))))
+            rng = np.random.default_rng(seed)
+            sample = self._matrix[rng.choice(live_rows, size=min(len(live_rows), KMEANS_SAMPLE), replace=False)]
+            centroids = sample[rng.choice(len(sample), size=min(lists, len(sample)), replace=False)].copy()
+            for _ in range(KMEANS_ITERATIONS):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                for k in range(len(centroids)):
+                    members = sample[labels == k]
+                    if len(members):
+                        centroid = members.sum(axis=0)
+                        norm = np.linalg.norm(centroid)
+                        centroids[k] = centroid / norm if norm else centroid
+            assign = np.full(self._capacity(), -1, dtype=np.int32)
+            for start in range(0, len(live_rows), 8192):
+                chunk = live_rows[start:start + 8192]
+                assign[chunk] = np.argmax(self._matrix[chunk] @ centroids.T, axis=1)
+            self._centroids = centroids
+            self._assign = assign
+            self._trained_at = len(live_rows)
+            self._dirty = True
+
+    # --- Persistence ---
+    def _state(self):
+        if self._matrix is None:
+            return None
+        state = {
+            "dim": self.dim,
+            "matrix": self._matrix[:len(self._row_ids)].copy(),  # Written to its own file by _write
+            "row_ids": list(self._row_ids),
+            "doc_paths": dict(self.doc_paths),
+            "doc_mtimes": dict(self.doc_mtimes),
+        }
+        if self._centroids is not None:
+            state["centroids"] = self._centroids  # Replaced on retraining, never mutated
+            state["assign"] = self._assign[:len(self._row_ids)].copy()
+            state["trained_at"] = self._trained_at
+        return state
+
+    def _write(self, state):
+        matrix = state.pop("matrix")
+        with file_lock(self.lock_path):
+            fd, matrix_path = tempfile.mkstemp(dir=self.output_dir, prefix=MATRIX_PREFIX, suffix=MATRIX_SUFFIX)
+            try:
+                os.fchmod(fd, 0o644)
+                with os.fdopen(fd, "wb") as f:
+                    matrix.tofile(f)
+                state["matrix_file"] = os.path.basename(matrix_path)
+                super()._write(state)
+            except BaseException:
+                os.remove(matrix_path)
+                raise
+            # Processes that still map an older matrix keep reading it; only the name goes away
+            stale = glob.glob(os.path.join(glob.escape(self.output_dir), f"{MATRIX_PREFIX}*{MATRIX_SUFFIX}"))
+            stale.append(os.path.join(self.output_dir, LEGACY_MATRIX_FILENAME))
+            for path in stale:
+                if path != matrix_path and os.path.exists(path):
+                    os.remove(path)
+
+    def load(self):
+        # Under the lock, so a concurrent save cannot remove the matrix file the row map names
+        with file_lock(self.lock_path):
+            return super().load()
+
+    def _restore(self, state):
+        if state.get("dim") != self.dim:
+            print("Vector index: embedding size changed, rebuilding.", file=sys.stderr)
+            return False
+        matrix_file = state.get("matrix_file")
+        matrix_path = os.path.join(self.output_dir, matrix_file or "")
+        if not matrix_file or not os.path.isfile(matrix_path):
+            return False
+        self._row_ids = state["row_ids"]
+        if self._row_ids:
+            self._matrix = np.memmap(matrix_path, dtype=np.float32, mode="c", shape=(len(self._row_ids), self.dim))
+        self._rows = {doc_id: row for row, doc_id in enumerate(self._row_ids) if doc_id is not None}
+        self._free = [row for row, doc_id in enumerate(self._row_ids) if doc_id is None]
+        self.doc_paths = state["doc_paths"]
+        self.doc_mtimes = state["doc_mtimes"]
+        if state.get("centroids"):
+            self._centroids = np.array(state["centroids"], dtype=np.float32)
+            self._assign = np.full(self._capacity(), -1, dtype=np.int32)
+            self._assign[:len(state["assign"])] = state["assign"]
+            self._trained_at = state.get("trained_at", 0)
+
+    # --- Queries ---
+    def search(self, query, limit=10):
+        """Returns [(doc_id, cosine similarity)] for the closest records, best first."""
+        vector = embed_text(query, self.dim)
+        if not vector.any():
+            return []
+        with self._lock:
+            used = len(self._row_ids)
+            if not self._rows:
+                return []
+            if self._centroids is not None:
+                probe = np.argsort(self._centroids @ vector)[-self.nprobe:]
+                rows = np.flatnonzero(np.isin(self._assign[:used], probe))
+            else:
+                rows = np.arange(used)
+            if len(rows) == 0:
+                return []
+            scores = self._matrix[rows] @ vector if len(rows) < used else self._matrix[:used] @ vector
+            k = min(limit or len(rows), len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            results = []
+            for i in top:
+                doc_id = self._row_ids[int(rows[i])]
+                if doc_id is not None and scores[i] > 0:
+                    results.append((doc_id, float(scores[i])))
+        return results
+
+    def __len__(self):
+        return len(self._rows)
+
+def hybrid_search(query, limit=10, keyword_index=None, vector_index=None, vector_weight=HYBRID_VECTOR_WEIGHT,
+                  min_similarity=HYBRID_MIN_SIMILARITY):
+    """
+    Ranks records by a blend of keyword TF-IDF (normalized to the best keyword hit) and
+    vector cosine similarity. Candidates are the top few keyword matches plus the top
+    vector matches with at least min_similarity. Returns [(doc_id, score)].
+    """
+    pool = max(limit * 4, 20) if limit else None
+    keyword = dict(keyword_index.search(query, limit=pool)) if keyword_index is not None else {}
+    vector = dict(vector_index.search(query, limit=pool)) if vector_index is not None else {}
+    vector = {doc_id: score for doc_id, score in vector.items() if score >= min_similarity or doc_id in keyword}
+    best_keyword = max(keyword.values(), default=0.0) or 1.0
+    scores = {
+        doc_id: (1 - vector_weight) * keyword.get(doc_id, 0.0) / best_keyword + vector_weight * vector.get(doc_id, 0.0)
+        for doc_id in keyword.keys() | vector.keys()
+    }
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return ranked[:limit] if limit else ranked
+
+# Shared index, loaded lazily on first use
+_vector_index = None
+_vector_index_lock = threading.Lock()
+
+def get_vector_index():
+    global _vector_index
+    if _vector_index is None:
+        with _vector_index_lock:
+            if _vector_index is None:
+                index = VectorIndex(ingestion_log=get_ingestion_log())
+                index.load()
+                index.sync()
+                atexit.register(index.persist)
+                _vector_index = index
+    return _vector_index
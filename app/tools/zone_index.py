@@ -0,0 +1,297 @@
+import os
+import re
+import sys
+import json
+import math
+import threading
+import functools
+from contextlib import contextmanager
+import numpy as np
+from app.tools.ingestion_log import file_lock
+
+# --- Configuration ---
+# GeoJSON FeatureCollection of zone polygons (feature property "name"); unset uses DEFAULT_ZONES
+ZONES_PATH = os.environ.get("ZONES_PATH", "")
+# Zones set or removed at runtime are saved here and picked up by every process (MCP workers, the app)
+ZONES_STATE_PATH = os.environ.get("ZONES_STATE_PATH", "output/.disaster_zones.json")
+# Side of a spatial grid cell, in degrees
+ZONE_GRID_CELL_DEGREES = float(os.environ.get("ZONE_GRID_CELL_DEGREES", "0.5"))
+
+# Approximate outlines of the designated disaster zones, as [lng, lat] rings
+DEFAULT_ZONES = {
+    "Virginia": [
+        [-83.68, 36.60], [-75.87, 36.55], [-75.24, 38.03], [-76.99, 38.24], [-77.12, 38.93], [-77.72, 39.32],
+        [-78.35, 39.46], [-78.88, 38.76], [-79.65, 38.57], [-80.30, 37.52], [-81.97, 37.54], [-82.70, 37.16],
+    ],
+    "Richmond": [[-77.60, 37.45], [-77.38, 37.45], [-77.38, 37.60], [-77.60, 37.60]],
+    "Palisades": [[-118.58, 34.03], [-118.50, 34.03], [-118.50, 34.10], [-118.58, 34.10]],
+}
+
+# Offline gazetteer used to geocode addresses: place name -> (lat, lng)
+GAZETTEER = {
+    "virginia": (37.43, -78.66),
+    "richmond": (37.54, -77.44),
+    "virginia beach": (36.85, -75.98),
+    "norfolk": (36.85, -76.29),
+    "arlington": (38.88, -77.10),
+    "roanoke": (37.27, -79.94),
+    "palisades": (34.05, -118.53),
+    "pacific palisades": (34.05, -118.53),
+    "malibu": (34.03, -118.78),
+    "los angeles": (34.05, -118.24),
+}
+# Longest names first, so "Virginia Beach" wins over "Virginia"
+_PLACE_RE = re.compile(r"\b(" + "|".join(re.escape(place) for place in sorted(GAZETTEER, key=len, reverse=True)) + r")\b")
+
+@functools.lru_cache(maxsize=4096)
+def geocode_address(address):
+    """(lat, lng, place) for the most specific known place named in the address, else None."""
+    match = _PLACE_RE.search(str(address).lower())
+    if match is None:
+        return None
+    lat, lng = GAZETTEER[match.group(1)]
+    return lat, lng, match.group(1)
+
+def locate_record(record):
+    """(lat, lng) from a record's coordinates, or by geocoding its address / location; None if unknown."""
+    if not isinstance(record, dict):
+        return None
+    lat = record.get("lat", record.get("latitude"))
+    lng = record.get("lng", record.get("lon", record.get("longitude")))
+    if lat is not None and lng is not None:
+        try:
+            return float(lat), float(lng)
+        except (TypeError, ValueError):
+            pass
+    for field in ("address", "location_context"):
+        if record.get(field):
+            geocoded = geocode_address(record[field])
+            if geocoded is not None:
+                return geocoded[:2]
+    return None
+
+def _ring(name, polygon):
+    """[(lng, lat)] from a ring of [lng, lat] pairs (closing point optional)."""
+    ring = [(float(lng), float(lat)) for lng, lat in polygon]
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        ring.pop()
+    if len(ring) < 3:
+        raise ValueError(f"Zone '{name}' needs at least 3 distinct points.")
+    return ring
+
+def _point_in_ring(x, y, ring):
+    inside = False
+    x1, y1 = ring[-1]
+    for x2, y2 in ring:
+        if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+            inside = not inside
+        x1, y1 = x2, y2
+    return inside
+
+def _points_in_ring(xs, ys, ring):
+    """Vectorized even-odd ray casting: one pass over the ring's edges, all points at once."""
+    inside = np.zeros(len(xs), dtype=bool)
+    x1, y1 = ring[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for x2, y2 in ring:
+            crosses = (y1 > ys) != (y2 > ys)
+            inside ^= crosses & (xs < (x2 - x1) * (ys - y1) / (y2 - y1) + x1)
+            x1, y1 = x2, y2
+    return inside
+
+class ZoneIndex:
+    """
+    Disaster zones as polygons in a uniform grid over their bounding boxes
+    (cell -> zones). A point lookup checks only the zones registered in its cell,
+    first by bounding box, then by ray casting. Zones can be added, replaced or
+    removed at runtime; `version` changes with every update.
+    With a state_path, runtime changes are written to that file under a file lock,
+    and refresh() reloads it when another process has changed it.
+    """
+    def __init__(self, zones=None, cell_size=ZONE_GRID_CELL_DEGREES, state_path=None):
+        self.cell_size = cell_size
+        self.state_path = state_path
+        self.version = 0
+        self._zones = {}  # name -> (ring as [(lng, lat)], bbox (min_lng, min_lat, max_lng, max_lat))
+        self._grid = {}   # (cell x, cell y) -> {zone name}
+        self._lock = threading.RLock()
+        self._state_stamp = None  # (inode, size, mtime_ns) of the state file last loaded or written
+        for name, polygon in (DEFAULT_ZONES if zones is None else zones).items():
+            self._set(name, _ring(name, polygon))
+        self.refresh()
+
+    def _cells(self, bbox):
+        min_x, min_y, max_x, max_y = (math.floor(v / self.cell_size) for v in bbox)
+        return [(cx, cy) for cx in range(min_x, max_x + 1) for cy in range(min_y, max_y + 1)]
+
+    def set_zone(self, name, polygon):
+        """Adds or replaces a zone. polygon is a ring of [lng, lat] pairs (closing point optional)."""
+        ring = _ring(name, polygon)
+        with self._shared():
+            self._set(name, ring)
+
+    def remove_zone(self, name):
+        with self._shared():
+            if name not in self._zones:
+                return False
+            self._unregister(name)
+            self.version += 1
+            return True
+
+    def _set(self, name, ring):
+        xs, ys = zip(*ring)
+        bbox = (min(xs), min(ys), max(xs), max(ys))
+        with self._lock:
+            self._unregister(name)
+            self._zones[name] = (ring, bbox)
+            for cell in self._cells(bbox):
+                self._grid.setdefault(cell, set()).add(name)
+            self.version += 1
+
+    # --- Shared state ---
+    def _stat_state(self):
+        try:
+            stat = os.stat(self.state_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns  # Every save is a new file (a new inode)
+
+    def refresh(self):
+        """Reloads the zones from the state file if another process changed it. One stat call otherwise."""
+        if not self.state_path:
+            return
+        stamp = self._stat_state()
+        if stamp is None or stamp == self._state_stamp:
+            return
+        with self._lock:
+            if stamp == self._state_stamp:
+                return
+            try:
+                with open(self.state_path, "r") as f:
+                    zones = json.load(f)
+                rings = {name: _ring(name, polygon) for name, polygon in zones.items()}
+            except Exception as e:
+                print(f"Zone index: ignoring unreadable {self.state_path}: {e}", file=sys.stderr)
+                self._state_stamp = stamp
+                return
+            for name in list(self._zones):
+                self._unregister(name)
+            for name, ring in rings.items():
+                self._set(name, ring)
+            self._state_stamp = stamp
+
+    @contextmanager
+    def _shared(self):
+        """Applies a change on top of the latest shared zones, then saves them for the other processes."""
+        if not self.state_path:
+            with self._lock:
+                yield
+            return
+        with self._lock, file_lock(f"{self.state_path}.lock"):
+            self.refresh()
+            version = self.version
+            yield
+            if self.version == version:
+                return
+            zones = {name: [list(point) for point in ring] for name, (ring, _) in self._zones.items()}
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(zones, f)
+            os.replace(tmp_path, self.state_path)
+            self._state_stamp = self._stat_state()
+
+    def _unregister(self, name):
+        zone = self._zones.pop(name, None)
+        if zone is None:
+            return
+        for cell in self._cells(zone[1]):
+            names = self._grid.get(cell)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._grid[cell]
+
+    def names(self):
+        with self._lock:
+            return list(self._zones)
+
+    def snapshot(self):
+        """(version, zone names) read together."""
+        with self._lock:
+            return self.version, list(self._zones)
+
+    def zones_at(self, lat, lng):
+        """Names of the zones containing the point, in zone order."""
+        cell = (math.floor(lng / self.cell_size), math.floor(lat / self.cell_size))
+        with self._lock:
+            candidates = self._grid.get(cell, ())
+            hits = set()
+            for name in candidates:
+                ring, (min_x, min_y, max_x, max_y) = self._zones[name]
+                if min_x <= lng <= max_x and min_y <= lat <= max_y and _point_in_ring(lng, lat, ring):
+                    hits.add(name)
+            return [name for name in self._zones if name in hits]
+
+    def classify_points(self, lats, lngs, names=None):
+        """
+        Boolean matrix (points x zones) for arrays of coordinates; NaN coordinates
+        match nothing. Columns follow `names` (default: every zone, in zone order).
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        with self._lock:
+            names = list(self._zones) if names is None else list(names)
+            hits = np.zeros((len(lats), len(names)), dtype=bool)
+            for column, name in enumerate(names):
+                zone = self._zones.get(name)
+                if zone is None:
+                    continue
+                ring, (min_x, min_y, max_x, max_y) = zone
+                candidates = np.flatnonzero((lngs >= min_x) & (lngs <= max_x) & (lats >= min_y) & (lats <= max_y))
+                if len(candidates):
+                    hits[candidates, column] = _points_in_ring(lngs[candidates], lats[candidates], ring)
+        return hits
+
+    def classify_records(self, records):
+        """Zone names for every record (located by coordinates or geocoded address), in one vectorized pass."""
+        points = [locate_record(record) for record in records]
+        lats = np.array([p[0] if p else np.nan for p in points], dtype=np.float64)
+        lngs = np.array([p[1] if p else np.nan for p in points], dtype=np.float64)
+        names = self.names()
+        hits = self.classify_points(lats, lngs, names)
+        return [[names[column] for column in np.flatnonzero(row)] for row in hits]
+
+def load_zones(path):
+    """{name: ring} from a GeoJSON FeatureCollection of Polygon / MultiPolygon features (outer rings only)."""
+    with open(path, "r") as f:
+        collection = json.load(f)
+    zones = {}
+    for i, feature in enumerate(collection.get("features", [])):
+        geometry = feature.get("geometry") or {}
+        name = (feature.get("properties") or {}).get("name") or f"zone_{i}"
+        if geometry.get("type") == "Polygon":
+            zones[name] = geometry["coordinates"][0]
+        elif geometry.get("type") == "MultiPolygon":
+            for j, polygon in enumerate(geometry["coordinates"]):
+                zones[name if j == 0 else f"{name} ({j + 1})"] = polygon[0]
+    return zones
+
+# Shared index, built once on first use and kept in step with the shared state file
+_zone_index = None
+_zone_index_lock = threading.Lock()
+
+def get_zone_index():
+    global _zone_index
+    if _zone_index is None:
+        with _zone_index_lock:
+            if _zone_index is None:
+                zones = None
+                if ZONES_PATH:
+                    try:
+                        zones = load_zones(ZONES_PATH)
+                    except Exception as e:
+                        print(f"Zone index: could not load {ZONES_PATH}, using built-in zones: {e}", file=sys.stderr)
+                _zone_index = ZoneIndex(zones, state_path=ZONES_STATE_PATH)
+    # Picks up zones changed by other processes (one stat call when nothing changed)
+    _zone_index.refresh()
+    return _zone_index
@@ -25,6 +25,30 @@ document.addEventListener('DOMContentLoaded', () => {
         activityFeed.prepend(item);
     }
 
+    // Opens a Server-Sent Events stream of agent activity; resolves with the final output
+    function streamEvents(url, handlers) {
+        return new Promise((resolve, reject) => {
+            const source = new EventSource(url);
+            ['agent_start', 'agent_end', 'tool_start', 'tool_end', 'text'].forEach(type => {
+                source.addEventListener(type, event => handlers[type] && handlers[type](JSON.parse(event.data)));
+            });
+            source.addEventListener('result', event => {
+                source.close();
+                resolve(JSON.parse(event.data).output);
+            });
+            source.addEventListener('error', event => {
+                const data = event.data ? JSON.parse(event.data) : null;
+                if (data && data.agent) {
+                    // A sub-agent failed; the workflow carries on without it
+                    log(`Error in ${data.agent}: ${data.message}`, 'error');
+                    return;
+                }
+                source.close();
+                reject(new Error(data ? data.message : 'Stream interrupted.'));
+            });
+        });
+    }
+
     runBtn.addEventListener('click', async () => {
         const imagePath = imageInput.value;
         if (!imagePath) return alert('Please provide an image path.');
@@ -33,23 +57,40 @@ document.addEventListener('DOMContentLoaded', () => {
         runBtn.disabled = true;
         runBtn.innerText = 'Orchestrating...';
 
+        // One console line per running agent, filled in as tokens arrive
+        const agentLines = {};
         try {
-            const response = await fetch('/api/run_workflow', {
+            // Submit as a job (queued behind the worker cap), then stream its agent activity
+            const response = await fetch('/api/jobs', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({ image_path: imagePath })
             });
-            const data = await response.json();
+            const submitted = await response.json();
+            if (!response.ok) throw new Error(submitted.message || `Request failed (${response.status}).`);
+            log(`Queued as job ${submitted.job.job_id}.`, 'system');
 
-            if (data.status === 'success') {
-                log('Orchestration complete.', 'system');
-                log(data.output, 'agent');
-                addActivity(`Workflow complete for ${imagePath}`);
-            } else {
-                log(`Error: ${data.message}`, 'error');
-            }
+            const output = await streamEvents(`/api/jobs/${submitted.job.job_id}/events`, {
+                agent_start: ({ agent }) => addActivity(`${agent} started`),
+                tool_start: ({ agent, tool }) => addActivity(`${agent} called ${tool}`),
+                agent_end: ({ agent }) => {
+                    addActivity(`${agent} finished`);
+                    delete agentLines[agent];
+                },
+                text: ({ agent, text }) => {
+                    if (!agentLines[agent]) {
+                        log(`${agent}: `, 'agent');
+                        agentLines[agent] = console.lastElementChild;
+                    }
+                    agentLines[agent].innerText += text;
+                    console.scrollTop = console.scrollHeight;
+                }
+            });
+            log('Orchestration complete.', 'system');
+            log(typeof output === 'string' ? output : JSON.stringify(output, null, 2), 'agent');
+            addActivity(`Workflow complete for ${imagePath}`);
         } catch (err) {
-            log(`Network Error: ${err.message}`, 'error');
+            log(`Error: ${err.message}`, 'error');
         } finally {
             runBtn.disabled = false;
             runBtn.innerText = 'Start Full Workflow';
@@ -61,15 +102,16 @@ document.addEventListener('DOMContentLoaded', () => {
         if (!query) return;
 
         ragResponse.innerText = 'Searching records...';
+        log(`RAG Query: ${query}`, 'system');
+        let answer = '';
         try {
-            const response = await fetch('/api/rag_query', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ query: query })
+            const output = await streamEvents(`/api/stream/rag_query?query=${encodeURIComponent(query)}`, {
+                text: ({ text }) => {
+                    answer += text;
+                    ragResponse.innerText = answer;
+                }
             });
-            const data = await response.json();
-            ragResponse.innerText = data.response;
-            log(`RAG Query: ${query}`, 'system');
+            ragResponse.innerText = output;
         } catch (err) {
             ragResponse.innerText = 'Error processing query.';
         }
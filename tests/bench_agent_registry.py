@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Agent construction does not hit the network once the key is known, so the offline
+# env backend with a placeholder is enough to measure setup overhead.
+os.environ.setdefault("SECRETS_BACKEND", "env")
+os.environ.setdefault("SECRET_GEMINI_VALUE", os.environ.get("GOOGLE_API_KEY", "bench-placeholder-key"))
+
+from app.core.agent_registry import get_agent, reset_agents
+from app.core.runner_pool import get_runner_pool
+from app.agents.ocr_agent_adk import OCRAgentADK
+from app.agents.investigation_agent_adk import InvestigationAgentADK
+from app.agents.mitigation_agent_adk import MitigationAgentADK
+from app.agents.rag_agent_adk import RAGAgentADK
+
+AGENT_CLASSES = [OCRAgentADK, InvestigationAgentADK, MitigationAgentADK, RAGAgentADK]
+ITERATIONS = int(os.environ.get("BENCH_ITERATIONS", "200"))
+
+def per_call_setup_fresh(agent_cls):
+    """What every tool call used to do: build a new agent (and therefore a new runner)."""
+    agent = agent_cls()
+    get_runner_pool().get_runner(agent.agent)
+
+def per_call_setup_cached(agent_cls):
+    """What tool calls do now: fetch the shared agent and its pooled runner."""
+    agent = get_agent(agent_cls)
+    get_runner_pool().get_runner(agent.agent)
+
+def bench(setup, agent_cls):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        setup(agent_cls)
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+def run_benchmark():
+    reset_agents()
+
+    print(f"Per-tool-call agent setup overhead ({ITERATIONS} iterations)")
+    print(f"{'agent':<24}{'fresh (us)':>14}{'cached (us)':>14}{'speedup':>10}")
+    for agent_cls in AGENT_CLASSES:
+        fresh = bench(per_call_setup_fresh, agent_cls)
+        cached = bench(per_call_setup_cached, agent_cls)
+        print(f"{agent_cls.__name__:<24}{fresh:>14.1f}{cached:>14.1f}{fresh / cached:>9.1f}x")
+    print(f"Runner pool: {get_runner_pool().stats()}")
+
+if __name__ == "__main__":
+    run_benchmark()
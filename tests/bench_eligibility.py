@@ -0,0 +1,74 @@
+"""
+Eligibility latency per resident: the LLM tool-calling loop (agent), rules engine plus
+LLM justification (explain) and rules engine only (rules), against the offline fake model:
+
+    python3 tests/bench_eligibility.py
+    python3 tests/bench_eligibility.py --batch-sizes 1000 100000 --llm-residents 30
+"""
+import os
+import sys
+import time
+import json
+import asyncio
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Must be set before the agent modules are imported
+os.environ["ADK_MODEL_BACKEND"] = "fake"
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.05")
+
+from app.core.agent_registry import get_agent
+from app.agents.investigation_agent_adk import InvestigationAgentADK
+from app.agents.ocr_batch import summarize_latencies
+from app.tools.eligibility_rules import evaluate_eligibility
+
+ZONES = ["Virginia", "Richmond", "Palisades"]
+RESIDENTS = ["John Doe", "Jane Smith", "Ryan Sessions"]
+
+def synthetic_residents(count):
+    places = [*ZONES, "Ohio"]
+    return {f"Resident {i}": {"address": f"{i} Elm St, {places[i % len(places)]}",
+                              "tax_rebate_eligible": i % 2 == 0, "disaster_affected": i % 3 != 0}
+            for i in range(count)}
+
+async def bench_llm_mode(mode, residents):
+    agent = get_agent(InvestigationAgentADK)
+    samples = []
+    for i in range(residents):
+        start = time.perf_counter()
+        await agent.verify_eligibility_async(RESIDENTS[i % len(RESIDENTS)], mode=mode)
+        samples.append(time.perf_counter() - start)
+    return summarize_latencies(samples)
+
+def bench_rules_batch(size):
+    lookup = synthetic_residents(size)
+    names = list(lookup)
+    start = time.perf_counter()
+    results = evaluate_eligibility(names, lookup=lookup, zones=ZONES)
+    elapsed = time.perf_counter() - start
+    return {
+        "residents": size,
+        "seconds": round(elapsed, 4),
+        "residents_per_second": round(size / elapsed, 1),
+        "relief_eligible": sum(r["relief_eligible"] for r in results),
+    }
+
+async def run_suite(args):
+    return {
+        "agent_mode_latency": await bench_llm_mode("agent", args.llm_residents),
+        "explain_mode_latency": await bench_llm_mode("explain", args.llm_residents),
+        "rules_mode_latency": await bench_llm_mode("rules", args.llm_residents),
+        "rules_batch": [bench_rules_batch(size) for size in args.batch_sizes],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Eligibility rules engine vs LLM benchmark.")
+    parser.add_argument("--llm-residents", type=int, default=20)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+    print(f"Fake LLM latency: {os.environ['FAKE_LLM_LATENCY']}s per model call")
+    print(json.dumps(asyncio.run(run_suite(args)), indent=2))
+
+if __name__ == "__main__":
+    main()
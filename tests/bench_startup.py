@@ -0,0 +1,108 @@
+"""
+Cold-start benchmark for app.py.
+Measures the import cost of app.py with `python -X importtime`, lists the slowest
+imports, checks that the heavy agent stacks are not loaded at import time, and
+times how long a fresh uvicorn server takes to answer /healthz:
+
+    python3 tests/bench_startup.py
+    python3 tests/bench_startup.py --runs 5 --top 15
+"""
+import os
+import sys
+import time
+import json
+import socket
+import argparse
+import subprocess
+import statistics
+import urllib.request
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Loaded on first use of the agents, never while app.py is imported
+DEFERRED_MODULES = ["google.adk.agents", "google.genai.types", "fastmcp", "app.agents.agent_coordinator_adk"]
+
+# app.py cannot be imported by name (the app/ package shadows it), so execute it by path
+LOAD_APP = (
+    "import runpy, sys, json; runpy.run_path('app.py'); "
+    f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))"
+)
+
+def parse_importtime(stderr):
+    """Returns [(cumulative_us, module, depth)] from `-X importtime` output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        imports.append((int(cumulative), module.strip(), depth))
+    return imports
+
+def measure_import(top):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", LOAD_APP], cwd=REPO_ROOT,
+                            capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    imports = parse_importtime(result.stderr)
+    # Cumulative times of the top-level imports add up to the total
+    top_level = [(us, module) for us, module, depth in imports if depth == 0]
+    return {
+        "process_wall_seconds": round(wall, 3),
+        "import_seconds": round(sum(us for us, _ in top_level) / 1e6, 3),
+        "slowest_imports": [{"module": m, "ms": round(us / 1000, 1)}
+                            for us, m in sorted(top_level, reverse=True)[:top]],
+        "deferred_modules_loaded": json.loads(result.stdout.strip().splitlines()[-1]),
+    }
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def measure_healthz(timeout=30.0):
+    """Seconds from process start until /healthz answers 200."""
+    port = free_port()
+    env = dict(os.environ, AGENT_WARMUP="0")
+    # `uvicorn app:asgi_app` would resolve "app" to the package, so start it from app.py by path
+    command = [sys.executable, "-c",
+               "import runpy, sys, uvicorn; module = runpy.run_path('app.py'); "
+               f"uvicorn.run(module['asgi_app'], host='127.0.0.1', port={port}, log_level='warning')"]
+    start = time.perf_counter()
+    server = subprocess.Popen(command, cwd=REPO_ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/healthz", timeout=1) as response:
+                    if response.status == 200:
+                        return round(time.perf_counter() - start, 3)
+            except OSError:
+                time.sleep(0.02)
+        raise TimeoutError(f"/healthz did not respond within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="app.py cold-start benchmark.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    imports = [measure_import(args.top) for _ in range(args.runs)]
+    healthz = [measure_healthz() for _ in range(args.runs)]
+    report = {
+        "import_seconds_median": round(statistics.median(r["import_seconds"] for r in imports), 3),
+        "process_wall_seconds_median": round(statistics.median(r["process_wall_seconds"] for r in imports), 3),
+        "first_healthz_seconds_median": round(statistics.median(healthz), 3),
+        "slowest_imports": imports[-1]["slowest_imports"],
+        "deferred_modules_loaded": imports[-1]["deferred_modules_loaded"],
+    }
+    print(json.dumps(report, indent=2))
+    if report["deferred_modules_loaded"]:
+        print(f"WARNING: app.py eagerly imports {report['deferred_modules_loaded']}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Retrieval latency of the vector index as the corpus grows:
+
+    python3 tests/bench_vector_index.py
+    python3 tests/bench_vector_index.py --sizes 1000 20000 100000 --queries 200
+"""
+import os
+import sys
+import time
+import json
+import argparse
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.tools.vector_index import VectorIndex, VECTOR_INDEX_IVF_MIN_DOCS
+from app.agents.ocr_batch import summarize_latencies
+
+INCIDENTS = ["Flood", "Fire", "Storm", "Tornado", "Earthquake"]
+LOCATIONS = ["Richmond", "Palisades", "Virginia Beach", "Norfolk", "Roanoke", "Arlington"]
+QUERIES = ["flood damage in Richmond", "fires near Palisades", "storm victims Norfolk", "tornado Roanoke houses"]
+
+def synthetic_record(i):
+    return {
+        "document_id": f"doc_{i}",
+        "resident_name": f"Resident {i}",
+        "incident_type": INCIDENTS[i % len(INCIDENTS)],
+        "location_context": f"{LOCATIONS[i % len(LOCATIONS)]} district {i % 97}",
+        "summary": f"{INCIDENTS[i % len(INCIDENTS)]} damage reported at house {i} near {LOCATIONS[(i * 7) % len(LOCATIONS)]}.",
+    }
+
+def bench_size(size, queries):
+    with tempfile.TemporaryDirectory() as output_dir:
+        index = VectorIndex(output_dir)
+        start = time.perf_counter()
+        for i in range(size):
+            index.add_document(os.path.join(output_dir, f"doc_{i}.json"), synthetic_record(i), mtime_ns=1)
+        ingest = time.perf_counter() - start
+        samples = []
+        for i in range(queries):
+            start = time.perf_counter()
+            index.search(QUERIES[i % len(QUERIES)], limit=10)
+            samples.append(time.perf_counter() - start)
+        return {
+            "records": size,
+            "partitioned": index._centroids is not None,
+            "ingest_records_per_second": round(size / ingest, 1),
+            "query_latency": summarize_latencies(samples),
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Vector index retrieval benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+    print(f"IVF partitioning from {VECTOR_INDEX_IVF_MIN_DOCS} records")
+    print(json.dumps([bench_size(size, args.queries) for size in args.sizes], indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Offline benchmark suite for the agent workflow.
+Runs every agent against the scripted fake model (ADK_MODEL_BACKEND=fake) inside a
+scratch workspace and writes the results as JSON so runs can be compared across commits:
+
+    python3 tests/bench_workflow.py
+    python3 tests/bench_workflow.py --compare bench_results/<previous>.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(REPO_ROOT)
+
+# Must be set before the agent modules are imported
+os.environ["ADK_MODEL_BACKEND"] = "fake"
+os.environ.setdefault("OCR_CACHE_ENABLED", "0")
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "0")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.05")
+
+from PIL import Image
+from conftest import isolated_output
+from app.core.agent_registry import get_agent
+from app.agents.agent_coordinator_adk import AgentCoordinatorADK
+from app.agents.investigation_agent_adk import InvestigationAgentADK
+from app.agents.ocr_agent_adk import OCRAgentADK
+from app.agents.rag_agent_adk import RAGAgentADK
+from app.agents.ocr_batch import summarize_latencies
+
+RAG_QUESTIONS = [
+    "Which residents were affected by flooding?",
+    "What incidents happened in Richmond?",
+    "List high severity incidents.",
+    "Were there any fires in Palisades?",
+]
+
+def make_scans(directory, count):
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"form_{i}.png")
+        Image.new("RGB", (1200, 1600), (255, 255 - i % 50, 255)).save(path)
+        paths.append(path)
+    return paths
+
+async def timed(coro):
+    start = time.perf_counter()
+    await coro
+    return time.perf_counter() - start
+
+async def bench_single_agent(iterations):
+    agent = get_agent(InvestigationAgentADK)
+    samples = [await timed(agent.verify_eligibility_async("Ryan Sessions", mode="agent")) for _ in range(iterations)]
+    return summarize_latencies(samples)
+
+async def bench_full_workflow(image_path, iterations, parallel):
+    coordinator = get_agent(AgentCoordinatorADK)
+    run = coordinator.run_parallel_workflow_async if parallel else coordinator.run_full_workflow_async
+    samples = [await timed(run(image_path)) for _ in range(iterations)]
+    return summarize_latencies(samples)
+
+async def bench_rag_throughput(queries, concurrency):
+    agent = get_agent(RAGAgentADK)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def ask(question):
+        async with semaphore:
+            return await timed(agent.answer_question_async(question))
+
+    start = time.perf_counter()
+    samples = await asyncio.gather(*(ask(RAG_QUESTIONS[i % len(RAG_QUESTIONS)]) for i in range(queries)))
+    elapsed = time.perf_counter() - start
+    return {"queries": queries, "concurrency": concurrency,
+            "queries_per_second": round(queries / elapsed, 2), "latency": summarize_latencies(samples)}
+
+async def bench_batch_ingestion(scan_dir, concurrency):
+    report = await get_agent(OCRAgentADK).digitize_batch_async(
+        scan_dir, concurrency=concurrency, rate_per_second=0, resume=False
+    )
+    return report["stats"]
+
+async def run_suite(args):
+    scans = make_scans("test_docs", args.batch_size)
+    return {
+        "single_agent_latency": await bench_single_agent(args.iterations),
+        "full_workflow_latency": await bench_full_workflow(scans[0], args.workflow_iterations, parallel=False),
+        "parallel_workflow_latency": await bench_full_workflow(scans[0], args.workflow_iterations, parallel=True),
+        "rag_throughput": await bench_rag_throughput(args.rag_queries, args.concurrency),
+        "batch_ingestion_throughput": await bench_batch_ingestion("test_docs", args.concurrency),
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+def flatten(results, prefix=""):
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from flatten(value, f"{name}.")
+        elif isinstance(value, (int, float)):
+            yield name, value
+
+def compare(current, previous_path):
+    with open(previous_path, "r") as f:
+        previous = dict(flatten(json.load(f)["results"]))
+    print(f"\nComparison against {previous_path}:")
+    for name, value in flatten(current):
+        old = previous.get(name)
+        if old:
+            print(f"  {name:<60}{old:>10} -> {value:<10}({(value - old) / old * 100:+.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline agent workflow benchmarks.")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--workflow-iterations", type=int, default=5)
+    parser.add_argument("--rag-queries", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--output", help="Result file (default: bench_results/<timestamp>-<commit>.json)")
+    parser.add_argument("--compare", help="Previous result file to diff against")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    output_path = args.output or os.path.join(
+        REPO_ROOT, "bench_results", f"{time.strftime('%Y%m%d-%H%M%S')}-{commit}.json"
+    )
+    if args.compare:
+        args.compare = os.path.abspath(args.compare)
+
+    workspace = tempfile.mkdtemp(prefix="bench_workflow_")
+    try:
+        # Fresh shared indexes in the workspace, none of them saved into the checkout's output/
+        with isolated_output(workspace):
+            results = asyncio.run(run_suite(args))
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "fake_llm_latency": float(os.environ["FAKE_LLM_LATENCY"]),
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"\nSaved benchmark results to {output_path}")
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import os
+import sys
+import json
+import atexit
+import pytest
+from contextlib import contextmanager
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.tools import (eligibility_rules, ingestion_log, metadata_index, record_store, search_index, trend_stats,
+                       vector_index, zone_index)
+from app.tools.ingestion_log import IngestionLog
+
+# Module-level singletons that hold on to the output directory they were created in
+SHARED_STATE = [
+    (ingestion_log, "_ingestion_log"),
+    (record_store, "_record_store"),
+    (search_index, "_document_index"),
+    (vector_index, "_vector_index"),
+    (metadata_index, "_metadata_index"),
+    (trend_stats, "_trend_stats"),
+    (zone_index, "_zone_index"),
+    (eligibility_rules, "_compiled"),
+]
+
+# Record i is a (INCIDENTS[i % 3], LOCATIONS[i % 3]) pair dated DATES[i % 3]; odd records are high severity
+INCIDENTS = ["Flood", "Fire", "Storm"]
+LOCATIONS = ["Richmond, VA", "Palisades", "Virginia Beach"]
+DATES = ["2024-01-15", "02/03/2024", "March 9, 2024"]
+
+def _make_record(i):
+    return {"document_id": f"doc_{i}", "resident_name": f"Resident {i}", "incident_type": INCIDENTS[i % 3],
+            "location_context": LOCATIONS[i % 3], "severity": "High" if i % 2 else "Low",
+            "date_of_incident": DATES[i % 3], "summary": f"{INCIDENTS[i % 3]} damage to house {i}."}
+
+@pytest.fixture
+def make_record():
+    """Builds the synthetic OCR record number i."""
+    return _make_record
+
+@pytest.fixture
+def write_records():
+    """Writes records doc_0 .. doc_{count - 1} into output_dir and appends them to its ingestion log."""
+    def write(output_dir, count):
+        log = IngestionLog(str(output_dir))
+        for i in range(count):
+            path = os.path.join(str(output_dir), f"doc_{i}.json")
+            with open(path, "w") as f:
+                json.dump(_make_record(i), f)
+            log.append(f"doc_{i}", path)
+    return write
+
+@contextmanager
+def isolated_output(directory):
+    """
+    Runs with `directory` as the working directory (so output/ is created there) and
+    fresh shared indexes, log and record store, so nothing is read from or saved to
+    the checkout's output/, not even at exit. The previous singletons are restored after.
+    """
+    cwd = os.getcwd()
+    saved = [(module, name, getattr(module, name)) for module, name in SHARED_STATE]
+    for module, name, _ in saved:
+        setattr(module, name, None)
+    os.chdir(directory)
+    try:
+        yield directory
+    finally:
+        os.chdir(cwd)
+        for module, name, previous in saved:
+            created = getattr(module, name)
+            if created is not None and created is not previous:
+                if hasattr(created, "persist"):
+                    atexit.unregister(created.persist)
+                if isinstance(created, metadata_index.MetadataIndex):
+                    created.close()
+            setattr(module, name, previous)
+
+@pytest.fixture
+def isolated_output_dir(tmp_path):
+    """tmp_path as the working directory, with its own output/ and shared indexes (see isolated_output)."""
+    with isolated_output(tmp_path):
+        yield tmp_path
@@ -0,0 +1,91 @@
+import os
+import sys
+import runpy
+import asyncio
+import pytest
+from starlette.testclient import TestClient
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(REPO_ROOT)
+
+from google.adk import Agent
+from app.core.genai_adk_base import run_adk_agent_async, run_sync
+from app.core.fake_llm import get_fake_model
+
+def fake_agent(name, script):
+    return Agent(name=name, model=get_fake_model(name, script=script, latency=0), instruction="test")
+
+def test_run_adk_agent_async_and_run_sync():
+    agent = fake_agent("api_test_agent", ["done"])
+    assert asyncio.run(run_adk_agent_async(agent, "hi")) == "done"
+    # Outside a running loop, and from sync code called inside one (runs on a helper thread)
+    assert run_sync(run_adk_agent_async(agent, "hi")) == "done"
+
+    async def inside_loop():
+        return run_sync(run_adk_agent_async(agent, "hi"))
+    assert asyncio.run(inside_loop()) == "done"
+
+@pytest.fixture
+def app_module(monkeypatch, isolated_output_dir):
+    monkeypatch.setenv("ADK_MODEL_BACKEND", "fake")
+    monkeypatch.setenv("FAKE_LLM_LATENCY", "0")
+    monkeypatch.setenv("SECRETS_BACKEND", "env")
+    monkeypatch.setenv("AGENT_WARMUP", "0")
+    return runpy.run_path(os.path.join(REPO_ROOT, "app.py"))
+
+@pytest.fixture
+def client(app_module):
+    with TestClient(app_module["asgi_app"]) as test_client:
+        yield test_client
+
+def test_non_object_bodies_are_rejected(client):
+    for path in ("/api/run_workflow", "/api/jobs", "/api/rag_query", "/api/eligibility"):
+        for body in ([1, 2], "text", 3):
+            response = client.post(path, json=body)
+            assert response.status_code == 400, (path, body)
+            assert response.json()["status"] == "error"
+
+def test_routes_with_fake_backend(client):
+    assert client.get("/healthz").json()["status"] == "ok"
+
+    response = client.post("/api/eligibility", json={"residents": ["John Doe", "Nobody"]})
+    assert response.status_code == 200
+    assert response.json()["summary"] == {"residents": 2, "not_found": 1, "rebate_eligible": 1, "relief_eligible": 0}
+
+    response = client.post("/api/rag_query", json={"query": "How many floods were reported?"})
+    assert response.status_code == 200 and response.json()["status"] == "success"
+    assert response.json()["response"]
+
+    response = client.post("/api/run_workflow", json={"image_path": "missing.png"})
+    assert response.status_code == 400
+
+def test_max_concurrency_is_validated(client, tmp_path):
+    image = tmp_path / "form.png"
+    image.write_bytes(b"\x89PNG\r\n\x1a\n")
+    for value in ("abc", 0, -2, [1]):
+        response = client.post("/api/jobs", json={"image_path": str(image), "mode": "parallel", "max_concurrency": value})
+        assert response.status_code == 400, value
+        assert "max_concurrency" in response.json()["message"]
+
+def test_streamed_workflow_runs_as_a_job(client, tmp_path):
+    from PIL import Image
+    image = tmp_path / "form.png"
+    Image.new("RGB", (64, 64), "white").save(image)
+
+    with client.stream("GET", "/api/stream/workflow", params={"image_path": str(image)}) as response:
+        assert response.status_code == 200
+        types = [line.split(": ", 1)[1] for line in response.iter_lines() if line.startswith("event: ")]
+    assert types[0] == "job" and types[-1] == "result"
+    assert "agent_start" in types and "text" in types
+
+def test_streamed_workflow_is_refused_when_the_queue_is_full(app_module, client, tmp_path, monkeypatch):
+    from app.core.jobs import QueueFullError
+    image = tmp_path / "form.png"
+    image.write_bytes(b"\x89PNG\r\n\x1a\n")
+    manager = app_module["job_manager"]
+
+    def full(params):
+        raise QueueFullError("Job queue is full.")
+    monkeypatch.setattr(manager, "submit", full)
+    response = client.get("/api/stream/workflow", params={"image_path": str(image)})
+    assert response.status_code == 429
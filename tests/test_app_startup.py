@@ -0,0 +1,27 @@
+import os
+import sys
+import json
+import subprocess
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+CHECK_STARTUP = """
+import runpy, sys, json
+from starlette.testclient import TestClient
+module = runpy.run_path('app.py')
+with TestClient(module['asgi_app']) as client:
+    health = client.get('/healthz').json()
+deferred = ['google.adk.agents', 'google.genai.types', 'fastmcp', 'app.agents.agent_coordinator_adk']
+print(json.dumps({'health': health, 'loaded': [m for m in deferred if m in sys.modules]}))
+"""
+
+def test_healthz_answers_without_loading_agents():
+    result = subprocess.run([sys.executable, "-c", CHECK_STARTUP], cwd=REPO_ROOT, capture_output=True,
+                            text=True, check=True, env=dict(os.environ, AGENT_WARMUP="0"))
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report["health"] == {"status": "ok", "agents": "cold", "error": None}
+    assert report["loaded"] == []
+
+if __name__ == "__main__":
+    test_healthz_answers_without_loading_agents()
+    print("App startup tests passed.")
@@ -0,0 +1,30 @@
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.disk_cache import DiskLRUCache
+
+def test_lru_eviction_by_size():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = DiskLRUCache(cache_dir, max_bytes=250)
+        for key in ("a", "b", "c"):
+            cache.set(key, {"payload": key * 80})
+        assert cache.get("a") is None
+        assert cache.get("c") == {"payload": "c" * 80}
+        assert cache.stats()["evictions"] == 1
+
+def test_persists_across_instances():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        DiskLRUCache(cache_dir, max_bytes=1024).set("scan", {"document_id": "12345"})
+        cache = DiskLRUCache(cache_dir, max_bytes=1024)
+        assert cache.get("scan") == {"document_id": "12345"}
+        assert cache.delete("scan")
+        assert cache.get("scan") is None
+        assert cache.stats()["hit_rate"] == 0.5
+
+if __name__ == "__main__":
+    test_lru_eviction_by_size()
+    test_persists_across_instances()
+    print("Disk cache tests passed.")
@@ -0,0 +1,54 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.tools.eligibility_rules import EligibilityRules, evaluate_eligibility
+
+ZONES = ["Virginia", "Richmond", "Palisades"]
+
+def test_default_residents_match_the_instruction_rules():
+    results = {r["resident_name"]: r for r in evaluate_eligibility(["John Doe", "Jane Smith", "Ryan Sessions", "Nobody"])}
+    assert (results["John Doe"]["rebate_eligible"], results["John Doe"]["relief_eligible"]) == (True, False)
+    assert (results["Jane Smith"]["rebate_eligible"], results["Jane Smith"]["relief_eligible"]) == (False, True)
+    assert (results["Ryan Sessions"]["rebate_eligible"], results["Ryan Sessions"]["relief_eligible"]) == (True, True)
+    assert results["Ryan Sessions"]["disaster_zone"] == "Virginia"
+    assert not results["Nobody"]["found"] and not results["Nobody"]["relief_eligible"]
+    assert results["Nobody"]["justification"].startswith("No record found for resident: Nobody")
+
+def test_zone_is_required_and_matched_case_insensitively():
+    rules = EligibilityRules(ZONES)
+    records = [
+        {"address": "1 Main St, RICHMOND", "tax_rebate_eligible": True, "disaster_affected": True},
+        {"address": "2 Main St, Ohio", "tax_rebate_eligible": True, "disaster_affected": True},
+        {"address": "3 Main St, Palisades", "tax_rebate_eligible": "false", "disaster_affected": "True"},
+        None,
+    ]
+    results = rules.decide(["a", "b", "c", "d"], records)
+    assert [r["disaster_zone"] for r in results] == ["Richmond", None, "Palisades", None]
+    assert [r["rebate_eligible"] for r in results] == [True, False, False, False]
+    assert [r["relief_eligible"] for r in results] == [True, False, True, False]
+    assert "not in a designated disaster zone" in results[1]["justification"]
+
+def test_large_batch_and_empty_inputs():
+    lookup = {f"Resident {i}": {"address": f"{i} Elm St, {ZONES[i % 4] if i % 4 < 3 else 'Ohio'}",
+                                "tax_rebate_eligible": i % 2 == 0, "disaster_affected": True} for i in range(10000)}
+    results = evaluate_eligibility(list(lookup), lookup=lookup, zones=ZONES)
+    assert len(results) == 10000
+    assert sum(r["relief_eligible"] for r in results) == 7500
+    assert sum(r["rebate_eligible"] for r in results) == 5000
+    assert evaluate_eligibility([], zones=ZONES) == []
+    assert not EligibilityRules([]).decide(["a"], [{"address": "Richmond"}])[0]["relief_eligible"]
+
+def test_zone_polygons_take_precedence_over_address_names():
+    from app.tools.zone_index import ZoneIndex
+    index = ZoneIndex()
+    rules = EligibilityRules(index.names(), zone_index=index)
+    records = [
+        {"address": "9 Elm St, Richmond", "lat": 40.71, "lng": -74.00, "disaster_affected": True},
+        {"address": "3 Sunset Blvd", "lat": 34.06, "lng": -118.55, "disaster_affected": True},
+        {"address": "5 Hill Rd, Springfield Palisades", "disaster_affected": True},
+    ]
+    results = rules.decide(["a", "b", "c"], records)
+    assert [r["disaster_zone"] for r in results] == [None, "Palisades", "Palisades"]
+    assert [r["relief_eligible"] for r in results] == [False, True, True]
@@ -0,0 +1,47 @@
+import os
+import sys
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from google.adk import Agent
+from app.core.genai_adk_base import run_adk_agent_async, stream_adk_agent, stream_agent_events
+from app.core.fake_llm import get_fake_model
+
+def fake_agent(name, script, tools=None):
+    return Agent(name=name, model=get_fake_model(name, script=script, latency=0), instruction="test", tools=tools or [])
+
+def lookup(name: str):
+    """Looks up a resident."""
+    return {"name": name}
+
+async def collect(events):
+    return [event async for event in events]
+
+def test_stream_yields_tokens_tools_and_result():
+    agent = fake_agent("stream_test_agent", [[("lookup", {"name": "Jane"})], "Jane is eligible."], tools=[lookup])
+    events = asyncio.run(collect(stream_adk_agent(agent, "Check Jane")))
+    types = [event["type"] for event in events]
+    assert types[0] == "agent_start" and types[-2:] == ["agent_end", "result"]
+    assert {"type": "tool_start", "agent": "stream_test_agent", "tool": "lookup", "args": {"name": "Jane"}} in events
+    assert "".join(event["text"] for event in events if event["type"] == "text") == "Jane is eligible."
+    assert types.count("text") > 1  # Streamed in chunks
+    assert events[-1]["output"] == "Jane is eligible."
+
+def test_nested_agents_report_into_the_same_stream():
+    inner = fake_agent("stream_inner_agent", ["inner answer"])
+
+    async def ask_inner(question: str) -> str:
+        """Asks the inner agent."""
+        return await run_adk_agent_async(inner, question)
+
+    outer = fake_agent("stream_outer_agent", [[("ask_inner", {"question": "hi"})], "done"], tools=[ask_inner])
+    events = asyncio.run(collect(stream_agent_events(run_adk_agent_async(outer, "go"))))
+    started = [event["agent"] for event in events if event["type"] == "agent_start"]
+    assert started == ["stream_outer_agent", "stream_inner_agent"]
+    assert events[-1] == {"type": "result", "output": "done"}
+
+if __name__ == "__main__":
+    test_stream_yields_tokens_tools_and_result()
+    test_nested_agents_report_into_the_same_stream()
+    print("Event stream tests passed.")
@@ -0,0 +1,68 @@
+import os
+import sys
+import json
+import tempfile
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.tools.ingestion_log import IngestionLog
+
+def test_concurrent_appends_are_not_lost():
+    with tempfile.TemporaryDirectory() as output_dir:
+        log = IngestionLog(output_dir, compact_every=0)
+
+        def writer(worker):
+            for i in range(50):
+                log.append(f"doc_{worker}_{i}", f"{output_dir}/doc_{worker}_{i}.json")
+
+        threads = [threading.Thread(target=writer, args=(w,)) for w in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(list(log.iter_entries())) == 200
+
+def test_dedup_and_compaction():
+    with tempfile.TemporaryDirectory() as output_dir:
+        log = IngestionLog(output_dir, compact_every=10)
+        for _ in range(15):
+            log.append("12345", f"{output_dir}/12345.json")
+        log.append("67890", f"{output_dir}/67890.json")
+
+        assert [e["document_id"] for e in log.iter_documents()] == ["12345", "67890"]
+        log.compact()
+        assert len(list(log.iter_entries())) == 2
+
+def test_reingested_documents_read_their_latest_entry():
+    with tempfile.TemporaryDirectory() as output_dir:
+        log = IngestionLog(output_dir, compact_every=0)
+        log.append("a", f"{output_dir}/old/a.json")
+        log.append("b", f"{output_dir}/b.json")
+        log.append("a", f"{output_dir}/new/a.json")
+
+        before = [(e["document_id"], e["path"]) for e in log.iter_documents()]
+        assert before == [("b", f"{output_dir}/b.json"), ("a", f"{output_dir}/new/a.json")]
+        log.compact()
+        assert [(e["document_id"], e["path"]) for e in log.iter_documents()] == before
+
+def test_migrates_legacy_summary():
+    with tempfile.TemporaryDirectory() as output_dir:
+        summary = [{"document_id": "12345", "path": f"{output_dir}/12345.json"}] * 3
+        with open(os.path.join(output_dir, "ingestion_summary.json"), "w") as f:
+            json.dump(summary, f)
+        with open(os.path.join(output_dir, "12345.json"), "w") as f:
+            json.dump({"document_id": "12345"}, f)
+        with open(os.path.join(output_dir, "orphan.json"), "w") as f:
+            json.dump({"document_id": "orphan"}, f)
+
+        log = IngestionLog(output_dir)
+        log.migrate_legacy()
+        assert [e["document_id"] for e in log.iter_documents()] == ["12345", "orphan"]
+
+if __name__ == "__main__":
+    test_concurrent_appends_are_not_lost()
+    test_dedup_and_compaction()
+    test_reingested_documents_read_their_latest_entry()
+    test_migrates_legacy_summary()
+    print("Ingestion log tests passed.")
@@ -0,0 +1,113 @@
+import os
+import sys
+import asyncio
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.jobs import JobManager, InMemoryJobStore, SQLiteJobStore, QueueFullError, current_job_id
+
+async def slow_echo(params):
+    await asyncio.sleep(params.get("delay", 0))
+    if params.get("fail"):
+        raise RuntimeError("workflow failed")
+    return {"echo": params["value"]}
+
+async def wait_finished(manager, job_id, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        job = manager.get(job_id)
+        if job["status"] in ("succeeded", "failed", "cancelled"):
+            return job
+        await asyncio.sleep(0.01)
+    raise TimeoutError(job_id)
+
+def test_jobs_run_and_report_results():
+    async def scenario():
+        manager = JobManager(slow_echo, InMemoryJobStore(), workers=2, queue_size=4)
+        await manager.start()
+        ok = manager.submit({"value": 1})
+        bad = manager.submit({"value": 2, "fail": True})
+        assert (await wait_finished(manager, ok["job_id"]))["result"] == {"echo": 1}
+        failed = await wait_finished(manager, bad["job_id"])
+        assert failed["status"] == "failed" and failed["error"] == "workflow failed"
+        await manager.stop()
+    asyncio.run(scenario())
+
+def test_backpressure_and_cancellation():
+    async def scenario():
+        manager = JobManager(slow_echo, InMemoryJobStore(), workers=1, queue_size=2)
+        await manager.start()
+        running = manager.submit({"value": 1, "delay": 5})
+        await asyncio.sleep(0.05)  # Let the worker pick it up
+        queued = [manager.submit({"value": i}) for i in range(2)]
+        try:
+            manager.submit({"value": 99})
+            assert False, "expected QueueFullError"
+        except QueueFullError:
+            pass
+        assert manager.cancel(queued[0]["job_id"])["status"] == "cancelled"
+        assert manager.cancel(running["job_id"])["status"] == "cancelled"
+        assert (await wait_finished(manager, queued[1]["job_id"]))["status"] == "succeeded"
+        assert manager.get(running["job_id"])["status"] == "cancelled"
+        assert manager.get(queued[0]["job_id"])["result"] is None
+        await manager.stop()
+    asyncio.run(scenario())
+
+def test_job_events_are_replayed_and_streamed():
+    async def scenario():
+        manager = None
+
+        async def chatty(params):
+            job_id = current_job_id.get()
+            manager.publish(job_id, {"type": "text", "text": "a"})
+            await asyncio.sleep(0.05)
+            manager.publish(job_id, {"type": "text", "text": "b"})
+            return params["value"]
+
+        manager = JobManager(chatty, InMemoryJobStore(), workers=1, queue_size=4)
+        await manager.start()
+        job = manager.submit({"value": 7})
+        await asyncio.sleep(0.02)  # Subscribe after the first event was published
+        events = [event async for event in manager.events(job["job_id"])]
+        assert events == [{"type": "text", "text": "a"}, {"type": "text", "text": "b"}, {"type": "result", "output": 7}]
+        # A finished job streams only its final event
+        assert [event async for event in manager.events(job["job_id"])] == [{"type": "result", "output": 7}]
+
+        blocker = manager.submit({"value": 1})
+        queued = manager.submit({"value": 2})
+        stream = manager.events(queued["job_id"])
+        manager.cancel(queued["job_id"])
+        assert [event async for event in stream] == [{"type": "error", "message": "Job was cancelled."}]
+        await wait_finished(manager, blocker["job_id"])
+        await manager.stop()
+    asyncio.run(scenario())
+
+def test_sqlite_store_survives_restart():
+    with tempfile.TemporaryDirectory() as workspace:
+        path = os.path.join(workspace, "jobs.sqlite3")
+
+        async def first_process():
+            manager = JobManager(slow_echo, SQLiteJobStore(path), workers=1)
+            await manager.start()
+            done = manager.submit({"value": "kept"})
+            await wait_finished(manager, done["job_id"])
+            pending = manager.submit({"value": "lost", "delay": 5})
+            await asyncio.sleep(0.05)
+            return done["job_id"], pending["job_id"]
+
+        done_id, pending_id = asyncio.run(first_process())
+
+        async def second_process():
+            manager = JobManager(slow_echo, SQLiteJobStore(path), workers=1)
+            await manager.start()
+            assert manager.get(done_id)["result"] == {"echo": "kept"}
+            assert manager.get(pending_id)["status"] == "failed"
+            await manager.stop()
+        asyncio.run(second_process())
+
+if __name__ == "__main__":
+    test_jobs_run_and_report_results()
+    test_backpressure_and_cancellation()
+    test_job_events_are_replayed_and_streamed()
+    test_sqlite_store_survives_restart()
+    print("Job manager tests passed.")
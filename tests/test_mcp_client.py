@@ -0,0 +1,46 @@
+import os
+import sys
+import asyncio
+from types import SimpleNamespace
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.genai_adk_base import run_sync
+from app.core.mcp_client import MCPClientPool, call_mcp_tool, decode_tool_result, get_mcp_client_pool
+
+def _result(data=None, structured=None, text=""):
+    return SimpleNamespace(data=data, structured_content=structured, content=[SimpleNamespace(text=text)])
+
+def test_decode_tool_result():
+    assert decode_tool_result(_result(data=["a", "b"])) == ["a", "b"]
+    assert decode_tool_result(_result(structured={"result": 3})) == 3
+    assert decode_tool_result(_result(structured={"count": 3})) == {"count": 3}
+    assert decode_tool_result(_result(text='{"total": 2}')) == {"total": 2}
+    assert decode_tool_result(_result(text="No records found.")) == "No records found."
+
+def test_local_calls_await_async_tools():
+    async def async_tool(name):
+        return f"async {name}"
+
+    def sync_tool(name):
+        return f"sync {name}"
+
+    wrapped = SimpleNamespace(fn=async_tool, name="async_tool")
+
+    async def run():
+        return await call_mcp_tool(wrapped, name="x"), await call_mcp_tool(sync_tool, name="y")
+
+    assert asyncio.run(run()) == ("async x", "sync y")
+
+def test_run_sync_closes_the_pool_of_its_loop(monkeypatch):
+    closed = []
+
+    async def close(self):
+        closed.append(self)
+    monkeypatch.setattr(MCPClientPool, "close", close)
+
+    async def use_pool():
+        return get_mcp_client_pool("http://127.0.0.1:1/mcp")
+
+    pools = [run_sync(use_pool()) for _ in range(3)]
+    assert closed == pools and len(set(map(id, pools))) == 3
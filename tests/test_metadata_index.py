@@ -0,0 +1,69 @@
+import os
+import sys
+import json
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.tools.metadata_index import MetadataIndex, normalize_date
+
+def test_normalize_date():
+    assert normalize_date("2024-01-15") == "2024-01-15"
+    assert normalize_date("02/03/2024") == "2024-02-03"
+    assert normalize_date("March 9, 2024") == "2024-03-09"
+    assert normalize_date("sometime last spring") is None
+
+def test_query_filters(tmp_path, write_records):
+    output_dir = str(tmp_path)
+    write_records(output_dir, 12)
+    index = MetadataIndex(output_dir)
+    index.sync()
+    floods = index.query(incident_type="flood", location="richmond")
+    assert sorted(r["document_id"] for r in floods) == ["doc_0", "doc_3", "doc_6", "doc_9"]
+    high = index.query(incident_type="Flood", severity="high")
+    assert sorted(r["document_id"] for r in high) == ["doc_3", "doc_9"]
+    february = index.query(date_from="2024-02-01", date_to="2024-02-28")
+    assert {r["incident_type"] for r in february} == {"Fire"} and len(february) == 4
+    assert len(index.query(limit=5)) == 5
+    # LIKE wildcards in a filter are matched literally
+    assert index.query(location="%") == []
+    index.close()
+
+def test_aggregate_counts_and_date_range(tmp_path, write_records):
+    output_dir = str(tmp_path)
+    write_records(output_dir, 12)
+    index = MetadataIndex(output_dir)
+    index.sync()
+    summary = index.aggregate(group_by=["incident_type", "location_context"])
+    assert summary["total"] == 12
+    assert summary["date_range"] == {"first": "2024-01-15", "last": "2024-03-09"}
+    assert {(g["incident_type"], g["location_context"], g["count"]) for g in summary["groups"]} == {
+        ("Flood", "Richmond, VA", 4), ("Fire", "Palisades", 4), ("Storm", "Virginia Beach", 4)}
+    by_month = index.aggregate(group_by=["month"], severity="High")
+    assert by_month["total"] == 6 and {g["month"]: g["count"] for g in by_month["groups"]} == {
+        "2024-01": 2, "2024-02": 2, "2024-03": 2}
+    try:
+        index.aggregate(group_by=["data"])
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    index.close()
+
+def test_sync_picks_up_changes_and_removals(tmp_path, write_records, make_record):
+    output_dir = str(tmp_path)
+    write_records(output_dir, 3)
+    index = MetadataIndex(output_dir)
+    index.sync()
+    path = os.path.join(output_dir, "doc_0.json")
+    with open(path, "w") as f:
+        json.dump(dict(make_record(0), incident_type="Earthquake"), f)
+    os.utime(path, ns=(1, 1))
+    os.remove(os.path.join(output_dir, "doc_1.json"))
+    index.sync()
+    assert index.aggregate(group_by=[])["total"] == 2
+    assert [r["document_id"] for r in index.query(incident_type="earthquake")] == ["doc_0"]
+    index.close()
+
+    # Reopening the same database keeps the rows
+    reopened = MetadataIndex(output_dir)
+    assert reopened.aggregate(group_by=[])["total"] == 2
+    reopened.close()
@@ -0,0 +1,53 @@
+import os
+import sys
+import asyncio
+import inspect
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.metrics import MetricsRegistry, instrument_tool, TOOL_CALLS, TOOL_ERRORS, TOOL_CALL_SECONDS
+
+def test_prometheus_text_format():
+    registry = MetricsRegistry()
+    runs = registry.counter("test_runs_total", "Runs.", ["agent"])
+    latency = registry.histogram("test_seconds", "Latency.", ["agent"], buckets=(0.1, 1))
+    runs.inc("rag_agent")
+    runs.inc("rag_agent", amount=2)
+    latency.observe(0.05, "rag_agent")
+    latency.observe(0.5, "rag_agent")
+    text = registry.render()
+    assert '# TYPE test_runs_total counter' in text
+    assert 'test_runs_total{agent="rag_agent"} 3' in text
+    assert 'test_seconds_bucket{agent="rag_agent",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{agent="rag_agent",le="+Inf"} 2' in text
+    assert 'test_seconds_count{agent="rag_agent"} 2' in text
+
+def test_instrumented_tools_keep_their_interface():
+    async def ask(question: str) -> str:
+        """Asks a question."""
+        return question.upper()
+
+    def explode(reason: str):
+        """Always fails."""
+        raise RuntimeError(reason)
+
+    wrapped_ask = instrument_tool(ask, "metrics_test_agent")
+    wrapped_explode = instrument_tool(explode, "metrics_test_agent")
+    assert inspect.iscoroutinefunction(wrapped_ask)
+    assert wrapped_ask.__name__ == "ask" and wrapped_ask.__doc__ == "Asks a question."
+    assert list(inspect.signature(wrapped_ask).parameters) == ["question"]
+
+    assert asyncio.run(wrapped_ask("hi")) == "HI"
+    try:
+        wrapped_explode("boom")
+        assert False, "expected RuntimeError"
+    except RuntimeError:
+        pass
+    assert TOOL_CALLS.value("metrics_test_agent", "ask") == 1
+    assert TOOL_ERRORS.value("metrics_test_agent", "explode") == 1
+    assert TOOL_CALL_SECONDS.count("metrics_test_agent", "explode") == 1
+
+if __name__ == "__main__":
+    test_prometheus_text_format()
+    test_instrumented_tools_keep_their_interface()
+    print("Metrics tests passed.")
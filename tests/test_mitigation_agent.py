@@ -0,0 +1,16 @@
+import os
+import sys
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.agents.mitigation_agent_adk import read_disaster_summary
+
+def test_summary_includes_records_saved_by_another_process(isolated_output_dir, write_records):
+    os.makedirs("output")
+    assert asyncio.run(read_disaster_summary()) == "No digestion records found."
+    # Another process (e.g. the batch CLI) saves records: they only reach us through the ingestion log
+    write_records(isolated_output_dir / "output", 6)
+    summary = asyncio.run(read_disaster_summary())
+    assert summary["total_records"] == 6
+    assert asyncio.run(read_disaster_summary(incident_type="flood"))["total_records"] == 2
@@ -0,0 +1,106 @@
+import os
+import sys
+import time
+import asyncio
+from PIL import Image
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import app.agents.ocr_batch as ocr_batch
+from app.agents.ocr_batch import BatchIngestionPipeline, RateLimiter
+from app.agents.ocr_agent_adk import OCRAgentADK
+
+class ScriptedOCR:
+    """Stands in for OCRAgentADK: each call pops the next outcome for the file (an exception or a result)."""
+    def __init__(self, outcomes=None):
+        self.outcomes = outcomes or {}
+        self.calls = []
+
+    async def digitize_document_async(self, image_path, raise_errors=False):
+        self.calls.append(image_path)
+        queue = self.outcomes.get(os.path.basename(image_path), [])
+        outcome = queue.pop(0) if queue else None
+        if isinstance(outcome, Exception):
+            raise outcome
+        if outcome is not None:
+            return outcome
+        name = os.path.splitext(os.path.basename(image_path))[0]
+        return {"response": "saved", "document_id": name,
+                "record": {"document_id": name, "location_context": "Richmond"}}
+
+def make_scans(directory, count):
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"scan_{i}.png")
+        Image.new("RGB", (32, 32), (i, i, i)).save(path)  # Distinct scans (no OCR cache hits)
+        paths.append(path)
+    return paths
+
+def test_rate_limiter_paces_calls():
+    async def run():
+        limiter = RateLimiter(rate=20, burst=1)
+        start = time.perf_counter()
+        for _ in range(5):
+            await limiter.acquire()
+        return time.perf_counter() - start
+    # One token up front, then one every 50ms
+    assert asyncio.run(run()) >= 0.18
+
+def test_transient_errors_are_retried_with_backoff(monkeypatch, tmp_path):
+    monkeypatch.setattr(ocr_batch, "RETRY_BASE_DELAY_SECONDS", 0.01)
+    paths = make_scans(tmp_path, 3)
+    no_record = {"response": "done", "document_id": "Extracted from image"}
+    ocr = ScriptedOCR({
+        "scan_0.png": [ConnectionError("reset"), TimeoutError("slow")],
+        "scan_1.png": [ValueError("bad scan")],
+        "scan_2.png": [no_record] * 3,
+    })
+    pipeline = BatchIngestionPipeline(ocr, rate_per_second=0, max_retries=2,
+                                      checkpoint_path=str(tmp_path / "checkpoint.jsonl"))
+    report = asyncio.run(pipeline.run(paths))
+
+    statuses = {os.path.basename(r["path"]): r["status"] for r in report["results"]}
+    assert statuses == {"scan_0.png": "completed", "scan_1.png": "failed", "scan_2.png": "failed"}
+    assert ocr.calls.count(paths[0]) == 3  # Two retries, then success
+    assert ocr.calls.count(paths[1]) == 1  # Not transient: no retry
+    assert ocr.calls.count(paths[2]) == 3  # No record saved: retried, then failed
+
+def test_checkpoint_resumes_only_unfinished_files(monkeypatch, tmp_path):
+    monkeypatch.setattr(ocr_batch, "RETRY_BASE_DELAY_SECONDS", 0.01)
+    paths = make_scans(tmp_path, 4)
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+    first = BatchIngestionPipeline(ScriptedOCR({"scan_3.png": [ValueError("bad scan")]}), rate_per_second=0,
+                                   checkpoint_path=checkpoint)
+    assert asyncio.run(first.run(str(tmp_path)))["stats"]["completed"] == 3
+
+    ocr = ScriptedOCR()
+    report = asyncio.run(BatchIngestionPipeline(ocr, rate_per_second=0, checkpoint_path=checkpoint).run(str(tmp_path)))
+    assert ocr.calls == [paths[3]]
+    assert report["stats"]["skipped"] == 3 and report["stats"]["completed"] == 1
+
+def test_end_to_end_batch_with_fake_backend(monkeypatch, isolated_output_dir):
+    tmp_path = isolated_output_dir
+    monkeypatch.setenv("ADK_MODEL_BACKEND", "fake")
+    paths = make_scans(tmp_path, 3)
+    pipeline = BatchIngestionPipeline(OCRAgentADK(), concurrency=2, rate_per_second=0,
+                                      checkpoint_path=str(tmp_path / "checkpoint.jsonl"))
+    report = asyncio.run(pipeline.run(paths))
+
+    assert report["stats"]["completed"] == 3 and report["stats"]["failed"] == 0
+    saved = [name for name in os.listdir("output") if name.endswith(".json") and name.startswith("fake-")]
+    assert len(saved) == 3
+    assert all("disaster_zones" in result for result in report["results"])
+
+def test_unreadable_scans_are_reported_as_errors(monkeypatch, isolated_output_dir):
+    monkeypatch.setenv("ADK_MODEL_BACKEND", "fake")
+    tmp_path = isolated_output_dir
+    Image.new("RGB", (3000, 3000), "white").save(tmp_path / "scan.png")
+    data = (tmp_path / "scan.png").read_bytes()
+    (tmp_path / "truncated.png").write_bytes(data[:len(data) // 2])
+    (tmp_path / "header_only.png").write_bytes(data[:40])
+    (tmp_path / "broken.pdf").write_bytes(b"%PDF-1.4\nnot a pdf")
+
+    agent = OCRAgentADK()
+    for name in ["truncated.png", "header_only.png", "broken.pdf"]:
+        result = asyncio.run(agent.digitize_document_async(str(tmp_path / name), use_cache=False))
+        assert "error" in result, name
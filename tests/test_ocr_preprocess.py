@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+from PIL import Image
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.agents.ocr_preprocess import sniff_mime_type, prepare_image_parts, OCR_MAX_DIMENSION
+
+def test_sniff_ignores_extension():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "form_1.jpg")
+        Image.new("RGB", (64, 64), "white").save(path, format="PNG")
+        with open(path, "rb") as f:
+            assert sniff_mime_type(f.read(16)) == "image/png"
+        assert sniff_mime_type(b"%PDF-1.7") == "application/pdf"
+        assert sniff_mime_type(b"plain text") is None
+
+def test_large_scan_is_downscaled():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scan.png")
+        Image.new("RGB", (OCR_MAX_DIMENSION * 2, OCR_MAX_DIMENSION), "white").save(path)
+        [(data, mime_type)] = prepare_image_parts(path)
+        assert mime_type == "image/jpeg"
+        with open(os.path.join(tmp, "out.jpg"), "wb") as f:
+            f.write(data)
+        with Image.open(os.path.join(tmp, "out.jpg")) as out:
+            assert max(out.size) == OCR_MAX_DIMENSION
+
+def test_large_jpeg_is_reencoded_after_draft():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scan.jpg")
+        # Drafts (1/4 scale) to exactly OCR_MAX_DIMENSION, so no resize is left to do
+        Image.new("RGB", (OCR_MAX_DIMENSION * 4, OCR_MAX_DIMENSION * 4), "white").save(path, format="JPEG")
+        [(data, mime_type)] = prepare_image_parts(path)
+        with open(path, "rb") as f:
+            assert data != f.read()
+        with open(os.path.join(tmp, "out.jpg"), "wb") as f:
+            f.write(data)
+        with Image.open(os.path.join(tmp, "out.jpg")) as out:
+            assert max(out.size) <= OCR_MAX_DIMENSION
+
+def test_multipage_tiff_is_split():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scan.tif")
+        pages = [Image.new("L", (200, 200), shade) for shade in (0, 128, 255)]
+        pages[0].save(path, save_all=True, append_images=pages[1:])
+        assert len(prepare_image_parts(path)) == 3
+
+if __name__ == "__main__":
+    test_sniff_ignores_extension()
+    test_large_scan_is_downscaled()
+    test_large_jpeg_is_reencoded_after_draft()
+    test_multipage_tiff_is_split()
+    print("OCR preprocessing tests passed.")
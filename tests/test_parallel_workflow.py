@@ -0,0 +1,39 @@
+import os
+import sys
+import asyncio
+from PIL import Image
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.agents.agent_coordinator_adk import AgentCoordinatorADK
+from app.agents.investigation_agent_adk import InvestigationAgentADK
+
+RESIDENTS = ["Ann", "Ben", "Cal", "Dee", "Eve"]
+
+def test_parallel_workflow_orders_results_and_overlaps_stages(monkeypatch, isolated_output_dir):
+    monkeypatch.setenv("ADK_MODEL_BACKEND", "fake")
+    monkeypatch.setenv("SECRETS_BACKEND", "env")
+    Image.new("RGB", (64, 64), "white").save("form.png")
+
+    # Later residents finish first, so results arrive out of order
+    delays = {name: 0.02 * (len(RESIDENTS) - i) for i, name in enumerate(RESIDENTS)}
+    in_flight = {"now": 0, "max": 0}
+
+    async def verify(self, resident_name, mode=None):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(delays[resident_name])
+        in_flight["now"] -= 1
+        return f"checked {resident_name}"
+
+    monkeypatch.setattr(InvestigationAgentADK, "verify_eligibility_async", verify)
+    result = asyncio.run(AgentCoordinatorADK().run_parallel_workflow_async(
+        "form.png", residents=RESIDENTS, question="Which locations were affected?", max_concurrency=2))
+
+    assert "error" not in result
+    assert list(result["eligibility"].items()) == [(name, f"checked {name}") for name in RESIDENTS]
+    assert in_flight["max"] == 2
+    timings = result["timings"]
+    # Investigations overlap each other and the RAG question
+    assert timings["fan_out"] < sum(timings["investigation"].values()) + timings["rag"]
+    assert result["rag"]["answer"] and result["mitigation"]
@@ -0,0 +1,46 @@
+import os
+import sys
+import json
+import asyncio
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.tools.record_store import RecordStore
+
+def test_atomic_write_and_cached_reads():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = RecordStore(tmp)
+        path = store.write("doc_1", {"document_id": "doc_1", "incident_type": "Flood"})
+        assert os.listdir(tmp) == ["doc_1.json"]  # No temporary files left behind
+        assert os.stat(path).st_mode & 0o777 == 0o644  # Not mkstemp's private 0600
+        with open(path) as f:
+            assert json.load(f)["incident_type"] == "Flood"
+
+        assert store.read(path)["incident_type"] == "Flood"
+        assert (store.hits, store.misses) == (1, 0)
+        # Callers get their own copy of the cached record
+        store.read(path)["incident_type"] = "Fire"
+        assert store.read(path)["incident_type"] == "Flood"
+
+def test_external_changes_invalidate_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = RecordStore(tmp)
+        path = store.write("doc_1", {"document_id": "doc_1", "severity": "Low"})
+        with open(path, "w") as f:
+            json.dump({"document_id": "doc_1", "severity": "High"}, f)
+        os.utime(path, ns=(1, 1))
+        assert store.read(path)["severity"] == "High"
+        os.remove(path)
+        assert store.read_many([path, os.path.join(tmp, "missing.json")]) == [None, None]
+
+def test_async_api_and_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = RecordStore(tmp, max_entries=2)
+
+        async def run():
+            paths = await asyncio.gather(*(store.write_async(f"doc_{i}", {"n": i}) for i in range(4)))
+            return await store.read_many_async(paths)
+
+        assert [record["n"] for record in asyncio.run(run())] == [0, 1, 2, 3]
+        assert len(store._cache) == 2
@@ -0,0 +1,76 @@
+import os
+import sys
+import json
+import asyncio
+import sqlite3
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.tools import mcp_server, resident_store
+from app.tools.resident_store import ResidentStore, get_resident_store, load_residents, normalize_address
+
+def make_store(count=2000):
+    streets = ["Maple Street", "Oak Ave", "Pine Road"]
+    residents = {f"Resident {i:04d}": {"address": f"{i} {streets[i % 3]}, Richmond", "tax_rebate_eligible": True,
+                                       "disaster_affected": i % 2 == 0} for i in range(count)}
+    residents["Jane Smith"] = {"address": "456 Oak Ave, Virginia", "tax_rebate_eligible": False, "disaster_affected": True}
+    return ResidentStore(residents)
+
+def test_exact_lookup_ignores_case_and_punctuation():
+    store = ResidentStore()
+    assert store.get("john doe")["address"] == "123 Maple St, Virginia"
+    assert store.get("  RYAN   Sessions. ") is not None
+    assert store.get("Nobody") is None
+    assert store.lookup("jane smith") == [{"resident_name": "Jane Smith", **store.records["Jane Smith"]}]
+
+def test_prefix_and_fuzzy_matching():
+    store = make_store()
+    assert [r["resident_name"] for r in store.lookup("resident 001", match="prefix", limit=20)] == \
+        [f"Resident {i:04d}" for i in range(10, 20)]
+    fuzzy = store.lookup("Jane Smyth", match="fuzzy")
+    assert fuzzy[0]["resident_name"] == "Jane Smith" and fuzzy[0]["score"] >= 0.8
+    assert store.lookup("Jane Smyth") == []
+    assert store.lookup("Zzzz Qqqq", match="fuzzy") == []
+
+def test_address_search_normalizes_abbreviations():
+    store = make_store(30)
+    assert normalize_address("12 Maple Street, N. Richmond") == "12 maple st n richmond"
+    on_maple = store.find_by_address("maple st")
+    assert len(on_maple) == 10 and all("Maple" in r["address"] for r in on_maple)
+    assert [r["resident_name"] for r in store.find_by_address("Oak Avenue Virginia")] == ["Jane Smith"]
+    assert store.find_by_address("Elm") == []
+
+def test_load_from_json_and_sqlite():
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "residents.json")
+        with open(json_path, "w") as f:
+            json.dump([{"resident_name": "Ann Lee", "address": "1 Elm St, Richmond", "disaster_affected": True}], f)
+        assert ResidentStore(load_residents(json_path)).get("ann lee")["address"] == "1 Elm St, Richmond"
+
+        db_path = os.path.join(directory, "residents.sqlite3")
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE residents (resident_name TEXT, address TEXT, tax_rebate_eligible INTEGER, "
+                     "disaster_affected INTEGER)")
+        conn.execute("INSERT INTO residents VALUES ('Bo Chen', '2 Elm St, Palisades', 1, 0)")
+        conn.commit()
+        conn.close()
+        record = ResidentStore(load_residents(db_path)).get("Bo Chen")
+        assert record == {"address": "2 Elm St, Palisades", "tax_rebate_eligible": True, "disaster_affected": False}
+
+def test_unloadable_residents_path_is_an_error_not_the_mock_records(monkeypatch, tmp_path):
+    path = tmp_path / "residents.json"
+    path.write_text("{not json")
+    monkeypatch.setattr(resident_store, "RESIDENTS_PATH", str(path))
+    monkeypatch.setattr(resident_store, "_resident_store", None)
+    try:
+        get_resident_store()
+        assert False, "expected ValueError"
+    except ValueError as e:
+        assert str(path) in str(e)
+    assert "Could not load resident records" in asyncio.run(mcp_server.lookup_resident_record("John Doe"))
+
+    # Nothing was cached, so the fixed file is picked up
+    path.write_text(json.dumps({"Ann Lee": {"address": "1 Elm St, Richmond"}}))
+    assert get_resident_store().get("John Doe") is None
+    assert get_resident_store().get("Ann Lee")["address"] == "1 Elm St, Richmond"
@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+import tempfile
+from types import SimpleNamespace
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.response_cache import ResponseCache, response_cache_key
+from app.tools.ingestion_log import IngestionLog
+
+AGENT = SimpleNamespace(name="rag_agent", model="gemini-2.5-flash", instruction="Answer from the records.")
+
+def test_key_normalizes_prompt_and_tracks_corpus_version():
+    key = response_cache_key(AGENT, "Who was  flooded in Richmond?", "v1")
+    assert key == response_cache_key(AGENT, "who was flooded in richmond? ", "v1")
+    assert key != response_cache_key(AGENT, "Who was flooded in Richmond?", "v2")
+    changed = SimpleNamespace(name="rag_agent", model="gemini-2.5-flash", instruction="Be brief.")
+    assert key != response_cache_key(changed, "Who was flooded in Richmond?", "v1")
+
+def test_corpus_version_changes_on_append():
+    with tempfile.TemporaryDirectory() as output_dir:
+        log = IngestionLog(output_dir, compact_every=0)
+        empty = log.version()
+        log.append("12345", f"{output_dir}/12345.json")
+        first = log.version()
+        log.append("67890", f"{output_dir}/67890.json")
+        assert len({empty, first, log.version()}) == 3
+
+def test_lru_and_ttl_eviction():
+    cache = ResponseCache(max_entries=2, ttl=0.05)
+    cache.set("a", "answer a")
+    cache.set("b", "answer b")
+    assert cache.get("a") == "answer a"
+    cache.set("c", "answer c")  # Evicts b, the least recently used
+    assert cache.get("b") is None
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["expirations"] == 1 and stats["hits"] == 1
+
+if __name__ == "__main__":
+    test_key_normalizes_prompt_and_tracks_corpus_version()
+    test_corpus_version_changes_on_append()
+    test_lru_and_ttl_eviction()
+    print("Response cache tests passed.")
@@ -0,0 +1,45 @@
+import os
+import sys
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from google.adk import Agent
+import app.core.genai_adk_base as genai_adk_base
+from app.core.runner_pool import RunnerPool
+from app.core.fake_llm import get_fake_model
+
+def test_sessions_in_use_are_not_evicted(monkeypatch):
+    pool = RunnerPool(max_sessions=2)
+    monkeypatch.setattr(genai_adk_base, "get_runner_pool", lambda: pool)
+    agent = Agent(name="pool_test_agent", model=get_fake_model("pool_test_agent", script=["ok"], latency=0.05),
+                  instruction="test")
+
+    async def run():
+        kept = [genai_adk_base.run_adk_agent_async(agent, "hi", session_id=f"s{i}", raise_errors=True)
+                for i in range(4)]
+        ephemeral = [genai_adk_base.run_adk_agent_async(agent, "hi", raise_errors=True) for _ in range(4)]
+        return await asyncio.gather(*kept, *ephemeral)
+
+    assert asyncio.run(run()) == ["ok"] * 8
+    stats = pool.stats()
+    assert stats["sessions"] == 2 and stats["sessions_in_use"] == 0
+    assert stats["sessions_evicted"] == 2
+
+def test_acquire_release_under_small_cap():
+    pool = RunnerPool(max_sessions=1)
+
+    async def run():
+        assert not await pool.acquire_session("u", "a", keep=True)
+        assert not await pool.acquire_session("u", "b", keep=True)
+        # Both in use: over the cap, but nothing is evicted
+        assert pool.stats()["sessions"] == 2
+        assert await pool.acquire_session("u", "a", keep=True)
+        await pool.release_session("u", "a", keep=True)
+        await pool.release_session("u", "b", keep=True)
+        # b is idle now; a is still in use by its second run
+        assert pool.stats()["sessions"] == 1 and pool.stats()["sessions_evicted"] == 1
+        await pool.release_session("u", "a", keep=True)
+        assert await pool.acquire_session("u", "a", keep=True)
+
+    asyncio.run(run())
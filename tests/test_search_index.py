@@ -0,0 +1,32 @@
+import os
+import sys
+import json
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.tools.search_index import DocumentIndex
+
+def test_search_ranks_and_limits(tmp_path, write_records):
+    write_records(tmp_path, 3)
+    index = DocumentIndex(str(tmp_path))
+    index.sync()
+    assert [doc_id for doc_id, _ in index.search("richmond flood")] == ["doc_0"]
+    assert [doc_id for doc_id, _ in index.search("palis")] == ["doc_1"]
+    assert len(index.search("damage", limit=1)) == 1
+
+def test_incremental_update_and_reload(tmp_path, write_records, make_record):
+    write_records(tmp_path, 3)
+    index = DocumentIndex(str(tmp_path))
+    index.sync()
+
+    updated = dict(make_record(1), location_context="Richmond")
+    path = os.path.join(str(tmp_path), "doc_1.json")
+    with open(path, "w") as f:
+        json.dump(updated, f)
+    index.add_document(path, updated)
+    index.persist()
+
+    reloaded = DocumentIndex(str(tmp_path))
+    assert reloaded.load()
+    assert {doc_id for doc_id, _ in reloaded.search("richmond")} == {"doc_0", "doc_1"}
+    assert reloaded.search("palisades") == []
@@ -0,0 +1,77 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.secrets_provider import SecretsProvider, EnvBackend, FileBackend
+
+class CountingBackend:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, secret_id):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        time.sleep(self.delay)
+        return f"{secret_id}-v{call}"
+
+def test_concurrent_misses_share_one_fetch():
+    backend = CountingBackend(delay=0.1)
+    provider = SecretsProvider(backend, ttl=60, refresh_ahead=0)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(provider.get("SECRET_GEMINI"))) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert backend.calls == 1
+    assert results == ["SECRET_GEMINI-v1"] * 20
+
+def test_expired_entry_is_refetched():
+    backend = CountingBackend()
+    provider = SecretsProvider(backend, ttl=0.05, refresh_ahead=0)
+    assert provider.get("key") == "key-v1"
+    assert provider.get("key") == "key-v1"
+    time.sleep(0.1)
+    assert provider.get("key") == "key-v2"
+    assert backend.calls == 2
+
+def test_refresh_ahead_serves_cached_value():
+    backend = CountingBackend(delay=0.05)
+    provider = SecretsProvider(backend, ttl=1.0, refresh_ahead=0.5)
+    assert provider.get("key") == "key-v1"
+    time.sleep(0.6)
+    # Inside the refresh window: the old value is returned while the refresh runs
+    assert provider.get("key") == "key-v1"
+    time.sleep(0.15)
+    assert provider.get("key") == "key-v2"
+    assert backend.calls == 2
+
+def test_failed_fetch_returns_none():
+    provider = SecretsProvider(EnvBackend(), ttl=60)
+    os.environ.pop("MISSING_SECRET_VALUE", None)
+    assert provider.get("MISSING_SECRET") is None
+
+def test_offline_backends():
+    os.environ["TEST_SECRET_VALUE"] = "from-env"
+    assert EnvBackend().fetch("TEST_SECRET") == "from-env"
+    with tempfile.TemporaryDirectory() as workspace:
+        path = os.path.join(workspace, "secrets.json")
+        with open(path, "w") as f:
+            json.dump({"SECRET_GEMINI": "from-file"}, f)
+        assert FileBackend(path).fetch("SECRET_GEMINI") == "from-file"
+
+if __name__ == "__main__":
+    test_concurrent_misses_share_one_fetch()
+    test_expired_entry_is_refetched()
+    test_refresh_ahead_serves_cached_value()
+    test_failed_fetch_returns_none()
+    test_offline_backends()
+    print("Secrets provider tests passed.")
@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.semantic_cache import SemanticCache, key_terms
+
+def test_rewordings_hit_and_different_questions_miss():
+    cache = SemanticCache(max_entries=8, threshold=0.9)
+    cache.store("Were there any fires in Palisades?", "v1", "Two fires were reported.")
+    assert cache.lookup("fires in palisades", "v1")[0] == "Two fires were reported."
+    assert cache.lookup("Were there any floods in Palisades?", "v1") is None
+    # A new corpus version invalidates every cached answer
+    assert cache.lookup("fires in palisades", "v2") is None
+    assert cache.stats()["hit_rate"] == round(1 / 3, 3)
+
+def test_similar_questions_with_different_key_terms_miss():
+    cache = SemanticCache(max_entries=8)
+    pairs = [
+        ("How many incidents were reported with high severity?", "How many incidents were reported with low severity?"),
+        ("Which records were filed after 2024-09-01?", "Which records were filed before 2024-09-01?"),
+        ("How many floods were reported in 2024?", "How many floods were reported in 2025?"),
+        ("Is John Doe affected by the flood?", "Is Jane Doe affected by the flood?"),
+        ("Flood damage reported in Richmond", "Flood damage reported in Norfolk"),
+    ]
+    for stored, asked in pairs:
+        cache.store(stored, "v1", stored)
+        assert cache.lookup(asked, "v1") is None, asked
+        assert cache.lookup(stored.replace("?", "") + ", please", "v1")[0] == stored
+
+def test_rewordings_with_different_words_hit_at_the_default_threshold():
+    cache = SemanticCache(max_entries=8)
+    cache.store("who was flooded in Richmond", "v1", "Resident 0")
+    assert cache.lookup("Richmond flood victims", "v1")[0] == "Resident 0"
+    # Same place and incident, but a different question
+    for asked in ["When was the flood in Richmond?", "How many floods were there in Richmond?",
+                  "What caused the flood in Richmond?"]:
+        assert cache.lookup(asked, "v1") is None, asked
+
+def test_key_terms():
+    assert key_terms("Which floods hit Virginia Beach after 2024-09-01?") == {
+        "flood", "place:virginia beach", "after", "2024-09-01"}
+    assert key_terms("were there fires in palisades") == key_terms("Were there any fires in Palisades?")
+    # A name that starts the question still counts
+    assert key_terms("John Doe eligibility") == {"john", "doe", "asks:eligibility"}
+    assert key_terms("Is John Doe eligible?") == key_terms("John Doe eligibility")
+
+def test_bounded_with_lru_replacement():
+    cache = SemanticCache(max_entries=2, threshold=0.9)
+    cache.store("flood damage in Richmond", "v1", "richmond")
+    cache.store("storm damage in Virginia", "v1", "virginia")
+    assert cache.lookup("flood damage in Richmond", "v1")[0] == "richmond"
+    cache.store("fire damage in Palisades", "v1", "palisades")  # Replaces the Virginia entry
+    assert cache.lookup("storm damage in Virginia", "v1") is None
+    assert cache.lookup("flood damage in Richmond", "v1")[0] == "richmond"
+    assert cache.stats()["entries"] == 2 and cache.stats()["evictions"] == 1
+
+def test_lookup_is_fast_when_full():
+    cache = SemanticCache(max_entries=1024, threshold=0.9)
+    for i in range(1024):
+        cache.store(f"question number {i} about incident {i * 7}", "v1", str(i))
+    start = time.perf_counter()
+    for _ in range(100):
+        cache.lookup("question about an unrelated incident", "v1")
+    assert (time.perf_counter() - start) / 100 < 0.01
+
+if __name__ == "__main__":
+    test_rewordings_hit_and_different_questions_miss()
+    test_similar_questions_with_different_key_terms_miss()
+    test_rewordings_with_different_words_hit_at_the_default_threshold()
+    test_key_terms()
+    test_bounded_with_lru_replacement()
+    test_lookup_is_fast_when_full()
+    print("Semantic cache tests passed.")
@@ -0,0 +1,106 @@
+import os
+import sys
+import json
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import app.tools.synced_index as synced_index
+from app.tools.ingestion_log import IngestionLog
+from app.tools.search_index import DocumentIndex
+from app.tools.trend_stats import TrendStats
+from app.tools.synced_index import atomic_file
+
+def test_background_save_does_not_block_searches(monkeypatch, tmp_path, make_record):
+    monkeypatch.setattr(synced_index, "PERSIST_INTERVAL_SECONDS", 0.0)
+    index = DocumentIndex(str(tmp_path))
+    writing, release = threading.Event(), threading.Event()
+    write = index._write
+
+    def slow_write(state):
+        writing.set()
+        release.wait(5)
+        write(state)
+    index._write = slow_write
+
+    index.add_document(str(tmp_path / "doc_0.json"), make_record(0), mtime_ns=1)
+    assert writing.wait(5)
+    # The save is stuck in the middle of writing; the index stays usable
+    index.add_document(str(tmp_path / "doc_1.json"), make_record(1), mtime_ns=1)
+    assert [doc_id for doc_id, _ in index.search("palisades")] == ["doc_1"]
+    release.set()
+    index.persist()  # Waits for the background save, then writes doc_1 too
+
+    reloaded = DocumentIndex(str(tmp_path))
+    assert reloaded.load() and set(reloaded.doc_paths) == {"doc_0", "doc_1"}
+
+def test_snapshot_is_unaffected_by_later_changes(tmp_path, make_record):
+    stats = TrendStats(str(tmp_path))
+    stats.add_document(str(tmp_path / "doc_0.json"), make_record(0), mtime_ns=1)
+    with stats._lock:
+        state = stats._state()
+    stats.remove_document("doc_0")
+    stats._write(state)
+
+    reloaded = TrendStats(str(tmp_path))
+    assert reloaded.load() and len(reloaded) == 1
+
+def test_failed_save_is_retried(monkeypatch, tmp_path, make_record):
+    monkeypatch.setattr(synced_index, "PERSIST_INTERVAL_SECONDS", float("inf"))  # No background saves
+    index = DocumentIndex(str(tmp_path))
+    index.add_document(str(tmp_path / "doc_0.json"), make_record(0), mtime_ns=1)
+    def failing_write(state):
+        raise OSError("disk full")
+    index._write = failing_write
+    try:
+        index.persist()
+        assert False, "expected OSError"
+    except OSError:
+        pass
+    del index._write
+    index.persist()
+    assert DocumentIndex(str(tmp_path)).load()
+
+def test_refresh_picks_up_records_saved_by_another_process(tmp_path, write_records, make_record):
+    write_records(tmp_path, 3)
+    index = DocumentIndex(str(tmp_path))
+    index.sync()
+    syncs = []
+    sync = index._sync
+    index._sync = lambda: syncs.append(1) or sync()
+
+    index.refresh()
+    assert syncs == []  # The log has not changed
+    # Another process saves a record: it only reaches this one through the ingestion log
+    path = str(tmp_path / "doc_9.json")
+    with open(path, "w") as f:
+        json.dump(dict(make_record(9), location_context="Zanzibar"), f)
+    IngestionLog(str(tmp_path)).append("doc_9", path)
+    index.refresh()
+    assert syncs == [1] and [doc_id for doc_id, _ in index.search("zanzibar")] == ["doc_9"]
+
+def test_atomic_file_uses_a_private_temporary_file(tmp_path):
+    path = str(tmp_path / "state.json")
+    with atomic_file(path, "w") as first, atomic_file(path, "w") as second:
+        assert first.name != second.name
+        first.write("first")
+        second.write("second")
+    assert open(path).read() == "first"  # The outer block finishes last
+    assert os.stat(path).st_mode & 0o777 == 0o644
+    try:
+        with atomic_file(path, "w") as f:
+            f.write("partial")
+            raise OSError("disk full")
+    except OSError:
+        pass
+    assert open(path).read() == "first" and os.listdir(tmp_path) == ["state.json"]
+
+def test_saves_follow_the_directory_the_index_was_opened_in(monkeypatch, tmp_path, make_record):
+    monkeypatch.chdir(tmp_path)
+    stats = TrendStats("output")
+    stats.add_document("output/doc_0.json", make_record(0), mtime_ns=1)
+    (tmp_path / "elsewhere").mkdir()
+    monkeypatch.chdir(tmp_path / "elsewhere")
+    stats.persist()
+    assert (tmp_path / "output" / ".trend_stats.json").exists()
+    assert not (tmp_path / "elsewhere" / "output").exists()
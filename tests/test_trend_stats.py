@@ -0,0 +1,48 @@
+import os
+import sys
+import json
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.tools.trend_stats import TrendStats
+
+def test_summary_counts_and_drill_down(tmp_path, write_records):
+    write_records(tmp_path, 24)
+    stats = TrendStats(str(tmp_path))
+    stats.sync()
+    summary = stats.summary(top=2, months=2)
+    assert summary["total_records"] == 24
+    assert summary["by_incident_type"] == {"Flood": 8, "Fire": 8, "(other)": 8}
+    assert summary["by_severity"] == {"Low": 12, "High": 12}
+    assert summary["monthly"] == {"2024-02": 8, "2024-03": 8}
+    assert len(summary["top_incident_locations"]) == 2
+
+    floods = stats.summary(incident_type="flood", location="rich")
+    assert floods["total_records"] == 8 and floods["by_location"] == {"Richmond, VA": 8}
+    assert floods["filters"] == {"incident_type": "flood", "location": "rich"}
+
+def test_summary_size_does_not_grow_with_records(tmp_path, make_record):
+    stats = TrendStats(str(tmp_path))
+    sizes = []
+    for count in (100, 5000):
+        for i in range(count):
+            stats.add_document(os.path.join(str(tmp_path), f"doc_{i}.json"), make_record(i), mtime_ns=1)
+        sizes.append(len(json.dumps(stats.summary())))
+    assert stats.summary()["total_records"] == 5000
+    assert abs(sizes[1] - sizes[0]) < 100  # Only the digits of the counts change
+
+def test_resave_moves_record_and_counts_survive_reload(tmp_path, write_records, make_record):
+    write_records(tmp_path, 3)
+    stats = TrendStats(str(tmp_path))
+    stats.sync()
+    path = os.path.join(str(tmp_path), "doc_0.json")
+    stats.add_document(path, dict(make_record(0), incident_type="Earthquake", date_of_incident=None))
+    stats.remove_document("doc_1")
+    summary = stats.summary()
+    assert summary["by_incident_type"] == {"Earthquake": 1, "Storm": 1}
+    assert summary["undated_records"] == 1
+    stats.persist()
+
+    reloaded = TrendStats(str(tmp_path))
+    assert reloaded.load() and len(reloaded) == 2
+    assert reloaded.summary()["by_incident_type"] == summary["by_incident_type"]
@@ -0,0 +1,60 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.tools.search_index import DocumentIndex
+from app.tools.vector_index import VectorIndex, hybrid_search
+
+def test_sync_search_and_reload(tmp_path, write_records):
+    write_records(tmp_path, 30)
+    index = VectorIndex(str(tmp_path), ivf_min_docs=10**9)
+    index.sync()
+    top = index.search("flooding in richmond", limit=5)
+    assert len(top) == 5 and all(int(doc_id.split("_")[1]) % 3 == 0 for doc_id, _ in top)
+
+    index.remove_document("doc_0")
+    index.persist()
+    reloaded = VectorIndex(str(tmp_path), ivf_min_docs=10**9)
+    assert reloaded.load() and len(reloaded) == 29
+    assert "doc_0" not in dict(reloaded.search("flooding in richmond", limit=30))
+
+def test_processes_sharing_the_files_do_not_overwrite_each_other(tmp_path, write_records, make_record):
+    write_records(tmp_path, 30)
+    first = VectorIndex(str(tmp_path), ivf_min_docs=10**9)
+    first.sync()
+    # A second process loads the same files, frees a row and reuses it for another record
+    second = VectorIndex(str(tmp_path), ivf_min_docs=10**9)
+    assert second.load()
+    second.remove_document("doc_0")
+    quake = dict(make_record(99), incident_type="Earthquake", location_context="Tokyo", summary="Earthquake.")
+    second.add_document(os.path.join(str(tmp_path), "doc_99.json"), quake, mtime_ns=1)
+    second.persist()
+
+    # The first process still ranks its own rows by its own vectors
+    assert "doc_0" not in dict(first.search("earthquake tokyo", limit=30))
+    assert dict(second.search("earthquake tokyo", limit=1)).keys() == {"doc_99"}
+    first.persist()
+    reloaded = VectorIndex(str(tmp_path), ivf_min_docs=10**9)
+    assert reloaded.load() and reloaded.search("flooding in richmond", limit=1)[0][0] == first.search(
+        "flooding in richmond", limit=1)[0][0]
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".f32")]) == 1
+
+def test_grows_past_initial_capacity_and_partitions(tmp_path, make_record):
+    index = VectorIndex(str(tmp_path), ivf_min_docs=1500, nprobe=4)
+    for i in range(2000):
+        index.add_document(os.path.join(str(tmp_path), f"doc_{i}.json"), make_record(i), mtime_ns=1)
+    assert len(index) == 2000 and index._centroids is not None
+    top = index.search("storm damage virginia beach", limit=10)
+    assert len(top) == 10 and all(int(doc_id.split("_")[1]) % 3 == 2 for doc_id, _ in top)
+
+def test_hybrid_search_combines_keyword_and_vector_scores(tmp_path, write_records):
+    write_records(tmp_path, 9)
+    keyword = DocumentIndex(str(tmp_path))
+    keyword.sync()
+    vectors = VectorIndex(str(tmp_path))
+    vectors.sync()
+    # "Resident 4" is an exact keyword hit; vectors alone would rank every fire record alike
+    top = hybrid_search("fire resident 4", limit=3, keyword_index=keyword, vector_index=vectors)
+    assert top[0][0] == "doc_4"
+    assert len(top) == 3
@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.tools.zone_index import ZoneIndex, geocode_address, load_zones
+
+def test_point_lookup_and_geocoding():
+    index = ZoneIndex()
+    assert index.zones_at(37.54, -77.44) == ["Virginia", "Richmond"]
+    assert index.zones_at(37.27, -79.94) == ["Virginia"]
+    assert index.zones_at(34.05, -118.53) == ["Palisades"]
+    assert index.zones_at(40.71, -74.00) == []
+    assert geocode_address("12 Ocean Dr, Virginia Beach")[2] == "virginia beach"
+    assert geocode_address("456 Oak Ave, Virginia")[2] == "virginia"
+    assert geocode_address("1 Main St, Springfield") is None
+
+def test_runtime_updates():
+    index = ZoneIndex()
+    version = index.version
+    index.set_zone("Norfolk", [[-76.35, 36.80], [-76.15, 36.80], [-76.15, 36.97], [-76.35, 36.97], [-76.35, 36.80]])
+    assert "Norfolk" in index.zones_at(36.85, -76.29) and index.version > version
+    # Replacing a zone moves it out of its old grid cells
+    index.set_zone("Palisades", [[-80.0, 40.0], [-79.9, 40.0], [-79.9, 40.1]])
+    assert index.zones_at(34.05, -118.53) == []
+    assert index.remove_zone("Richmond") and not index.remove_zone("Richmond")
+    assert index.zones_at(37.54, -77.44) == ["Virginia"]
+    try:
+        index.set_zone("Line", [[0, 0], [1, 1]])
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+def test_runtime_updates_are_shared_through_the_state_file(tmp_path):
+    state_path = str(tmp_path / "zones.json")
+    worker, app = ZoneIndex(state_path=state_path), ZoneIndex(state_path=state_path)
+    worker.set_zone("Norfolk", [[-76.35, 36.80], [-76.15, 36.80], [-76.15, 36.97], [-76.35, 36.97]])
+    version = app.version
+    app.refresh()
+    assert "Norfolk" in app.zones_at(36.85, -76.29) and app.version > version
+
+    # A change made elsewhere is applied on top of the latest shared zones, not a stale copy
+    app.remove_zone("Richmond")
+    worker.refresh()
+    assert worker.names() == ["Virginia", "Palisades", "Norfolk"]
+    assert ZoneIndex(state_path=state_path).names() == worker.names()
+    # Nothing to save when nothing changed
+    stamp = os.stat(state_path).st_mtime_ns
+    assert not worker.remove_zone("Richmond") and os.stat(state_path).st_mtime_ns == stamp
+
+def test_batch_classification_matches_point_lookups():
+    index = ZoneIndex()
+    rng = np.random.default_rng(0)
+    lats = np.concatenate([rng.uniform(33.5, 40.0, 5000), [np.nan]])
+    lngs = np.concatenate([rng.uniform(-119.0, -75.0, 5000), [-77.4]])
+    hits = index.classify_points(lats, lngs)
+    names = index.names()
+    for i in range(0, 5000, 50):
+        assert [names[c] for c in np.flatnonzero(hits[i])] == index.zones_at(lats[i], lngs[i])
+    assert not hits[-1].any()
+    records = [{"location_context": "Richmond"}, {"address": "1 Elm St, Ohio"}, {"lat": 34.06, "lng": -118.55}]
+    assert index.classify_records(records) == [["Virginia", "Richmond"], [], ["Palisades"]]
+
+def test_point_lookup_is_sub_millisecond():
+    index = ZoneIndex()
+    start = time.perf_counter()
+    for _ in range(1000):
+        index.zones_at(37.54, -77.44)
+    assert (time.perf_counter() - start) / 1000 < 0.001
+
+def test_load_geojson():
+    collection = {"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {"name": "Box"},
+         "geometry": {"type": "Polygon", "coordinates": [[[0, 0], [2, 0], [2, 2], [0, 2], [0, 0]]]}},
+    ]}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "zones.geojson")
+        with open(path, "w") as f:
+            json.dump(collection, f)
+        index = ZoneIndex(load_zones(path))
+    assert index.zones_at(1, 1) == ["Box"] and index.zones_at(3, 1) == []
@@ -1,18 +1,118 @@
-from mcp_server import search_digitized_documents, lookup_resident_record, get_disaster_zones
+"""
+Local load test for the MCP server over streamable HTTP. Starts the server
+(python -m app.tools.mcp_server with MCP_TRANSPORT=http) unless --url is given, then
+issues a mix of tool calls through the pooled client and reports p50/p99 per tool:
+
+    python3 tests/verify_mcp.py
+    python3 tests/verify_mcp.py --calls 5000 --concurrency 64 --workers 4
+    python3 tests/verify_mcp.py --url http://127.0.0.1:8765/mcp
+"""
+import os
+import sys
 import json
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(REPO_ROOT)
+
+from app.core.mcp_client import MCPClientPool
+
+CALL_MIX = [
+    ("get_disaster_zones", {}),
+    ("lookup_resident_record", {"resident_name": "Ryan Sessions"}),
+    ("lookup_residents", {"names": ["John Doe", "Jane Smith", "Ryan Sessions"]}),
+    ("check_point_in_zones", {"lat": 37.54, "lng": -77.44}),
+    ("check_address_in_zones", {"address": "456 Oak Ave, Richmond"}),
+    ("search_digitized_documents", {"query": "Virginia", "limit": 5}),
+    ("count_records", {"group_by": "incident_type,location_context"}),
+]
+
+def percentiles_ms(samples):
+    ordered = sorted(samples)
+
+    def percentile(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+
+    return {"count": len(ordered), "p50_ms": percentile(0.50), "p99_ms": percentile(0.99),
+            "max_ms": round(ordered[-1] * 1000, 2)}
+
+def start_server(port, workers):
+    env = dict(os.environ, MCP_TRANSPORT="http", MCP_PORT=str(port), MCP_WORKERS=str(workers))
+    server = subprocess.Popen([sys.executable, "-m", "app.tools.mcp_server"], cwd=REPO_ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("MCP server exited during startup.")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("MCP server did not start within 60s.")
+
+async def run_load(url, calls, concurrency, pool_size):
+    pool = MCPClientPool(url, size=pool_size)
+    latencies = {name: [] for name, _ in CALL_MIX}
+    errors = 0
+    next_call = iter(range(calls))
+
+    async def worker():
+        nonlocal errors
+        for i in next_call:
+            name, arguments = CALL_MIX[i % len(CALL_MIX)]
+            start = time.perf_counter()
+            try:
+                await pool.call_tool(name, arguments)
+            except Exception as e:
+                errors += 1
+                print(f"{name} failed: {e}", file=sys.stderr)
+                continue
+            latencies[name].append(time.perf_counter() - start)
+
+    # Warm the pool so session setup is not counted as call latency
+    await asyncio.gather(*(pool.call_tool("get_disaster_zones", {}) for _ in range(pool_size)))
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await pool.close()
+
+    all_samples = [sample for samples in latencies.values() for sample in samples]
+    return {
+        "calls": calls,
+        "concurrency": concurrency,
+        "pool_size": pool_size,
+        "errors": errors,
+        "calls_per_second": round(len(all_samples) / elapsed, 1),
+        "overall": percentiles_ms(all_samples),
+        "per_tool": {name: percentiles_ms(samples) for name, samples in latencies.items() if samples},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP streamable HTTP load test.")
+    parser.add_argument("--url", help="Existing server endpoint (default: start one locally)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="Server processes when starting a local server")
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--pool-size", type=int, default=8)
+    args = parser.parse_args()
 
-def test_mcp_tools():
-    print("Testing get_disaster_zones:")
-    zones = get_disaster_zones()
-    print(zones)
-    
-    print("\nTesting lookup_resident_record (Ryan Sessions):")
-    record = lookup_resident_record("Ryan Sessions")
-    print(json.dumps(record, indent=2) if isinstance(record, dict) else record)
-    
-    print("\nTesting search_digitized_documents (query='Virginia'):")
-    docs = search_digitized_documents("Virginia")
-    print(json.dumps(docs, indent=2) if isinstance(docs, list) else docs)
+    server = None if args.url else start_server(args.port, args.workers)
+    url = args.url or f"http://127.0.0.1:{args.port}/mcp"
+    try:
+        report = asyncio.run(run_load(url, args.calls, args.concurrency, args.pool_size))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+    report["server_workers"] = None if args.url else args.workers
+    print(json.dumps(report, indent=2))
 
 if __name__ == "__main__":
-    test_mcp_tools()
+    main()